@@ -9,15 +9,29 @@ from sqlalchemy import engine_from_config, pool
 from alembic import context
 
 # Importuj bazę modeli (Base) oraz modele
-from vetclinic_api.core.database import Base
+from vetclinic_api.core.config import DATABASE_URL
+from vetclinic_api.core.database import Base, engine_options
 from vetclinic_api.models.users import *
 from vetclinic_api.models.animals import *
 from vetclinic_api.models.appointments import *
+from vetclinic_api.models.invoice import *
 
 config = context.config
 
-# Interpretacja konfiguracji z pliku alembic.ini
-fileConfig(config.config_file_name)
+# URL bazy bierzemy z konfiguracji aplikacji (zmienna DATABASE_URL),
+# chyba że podano go jawnie: alembic -x db_url=postgresql://... upgrade head
+db_url = context.get_x_argument(as_dictionary=True).get("db_url", DATABASE_URL)
+config.set_main_option("sqlalchemy.url", db_url.replace("%", "%%"))
+# SQLite nie obsługuje ALTER COLUMN – tam migracje idą w trybie batch
+render_as_batch = db_url.startswith("sqlite")
+
+# Połączenie przekazane z kodu (vetclinic_api.core.schema.bootstrap_schema)
+external_connection = config.attributes.get("connection")
+
+# Interpretacja konfiguracji z pliku alembic.ini (tylko przy wywołaniu z CLI,
+# żeby nie nadpisywać logowania aplikacji)
+if external_connection is None:
+    fileConfig(config.config_file_name)
 
 target_metadata = Base.metadata
 
@@ -28,19 +42,37 @@ def run_migrations_offline():
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        render_as_batch=render_as_batch,
     )
     with context.begin_transaction():
         context.run_migrations()
 
 def run_migrations_online():
+    if external_connection is not None:
+        context.configure(
+            connection=external_connection,
+            target_metadata=target_metadata,
+            render_as_batch=external_connection.dialect.name == "sqlite",
+        )
+        with context.begin_transaction():
+            context.run_migrations()
+        return
+
+    options = engine_options(db_url)
+    options.pop("pool_size", None)
+    options.pop("max_overflow", None)
+    options.pop("pool_timeout", None)
     connectable = engine_from_config(
         config.get_section(config.config_ini_section),
         prefix="sqlalchemy.",
         poolclass=pool.NullPool,
+        **options,
     )
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection,
+            target_metadata=target_metadata,
+            render_as_batch=render_as_batch,
         )
         with context.begin_transaction():
             context.run_migrations()
@@ -0,0 +1,54 @@
+"""anchor queue
+
+Revision ID: 3e8a6d1f0c27
+Revises: 7b2f4c9e1a05
+Create Date: 2026-10-18 19:24:37.115302
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '3e8a6d1f0c27'
+down_revision = '7b2f4c9e1a05'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Upgrade schema: kolejka kotwiczenia on-chain i stan kotwiczenia rekordów."""
+    op.create_table(
+        'anchor_queue',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('kind', sa.String(length=20), nullable=False),
+        sa.Column('op', sa.String(length=10), nullable=False),
+        sa.Column('record_id', sa.Integer(), nullable=False),
+        sa.Column('data_hash', sa.String(), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('next_attempt_at', sa.DateTime(), nullable=False),
+        sa.Column('locked_by', sa.String(length=36), nullable=True),
+        sa.Column('tx_hash', sa.String(), nullable=True),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('anchored_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(
+        'ix_anchor_queue_status_next_attempt_at', 'anchor_queue', ['status', 'next_attempt_at']
+    )
+    op.create_index('ix_anchor_queue_kind_record_id', 'anchor_queue', ['kind', 'record_id'])
+    op.add_column('medical_records', sa.Column('data_hash', sa.String(length=64), nullable=True))
+    op.add_column('medical_records', sa.Column('blockchain_tx', sa.String(), nullable=True))
+    op.add_column('medical_records', sa.Column('anchor_status', sa.String(length=20), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema: usuwamy kolejkę i kolumny kotwiczenia."""
+    with op.batch_alter_table('medical_records') as batch_op:
+        batch_op.drop_column('anchor_status')
+        batch_op.drop_column('blockchain_tx')
+        batch_op.drop_column('data_hash')
+    op.drop_index('ix_anchor_queue_kind_record_id', table_name='anchor_queue')
+    op.drop_index('ix_anchor_queue_status_next_attempt_at', table_name='anchor_queue')
+    op.drop_table('anchor_queue')
@@ -0,0 +1,40 @@
+"""index pack for hot query filters
+
+Revision ID: 5c2e8d41a7b3
+Revises: a69c226e2577
+Create Date: 2026-10-18 10:12:41.503218
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '5c2e8d41a7b3'
+down_revision = 'a69c226e2577'
+branch_labels = None
+depends_on = None
+
+# (nazwa, tabela, kolumny) – muszą odpowiadać deklaracjom w modelach
+INDEXES = [
+    ('ix_appointments_owner_id', 'appointments', ['owner_id']),
+    ('ix_appointments_animal_id_visit_datetime', 'appointments', ['animal_id', 'visit_datetime']),
+    ('ix_medical_records_appointment_id', 'medical_records', ['appointment_id']),
+    ('ix_medical_records_animal_id', 'medical_records', ['animal_id']),
+    ('ix_weight_logs_animal_id_recorded_at', 'weight_logs', ['animal_id', 'recorded_at']),
+    ('ix_animals_owner_id', 'animals', ['owner_id']),
+    ('ix_invoices_client_id_status', 'invoices', ['client_id', 'status']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema: indeksy pod filtry z crud/*.py i serwisów GUI."""
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns)
+    # (client_id, status) obsługuje też zapytania po samym client_id
+    op.drop_index('ix_invoices_client_id', table_name='invoices')
+
+
+def downgrade() -> None:
+    """Downgrade schema: usuwamy indeksy, przywracamy ix_invoices_client_id."""
+    op.create_index('ix_invoices_client_id', 'invoices', ['client_id'])
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,26 @@
+"""appointments keyset pagination index
+
+Revision ID: 9e41f07c2d68
+Revises: 5c2e8d41a7b3
+Create Date: 2026-10-18 11:04:27.118930
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '9e41f07c2d68'
+down_revision = '5c2e8d41a7b3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Upgrade schema: indeks pod sortowanie (visit_datetime, id) listy wizyt."""
+    op.create_index(
+        'ix_appointments_visit_datetime_id', 'appointments', ['visit_datetime', 'id']
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema: usuwamy indeks paginacji wizyt."""
+    op.drop_index('ix_appointments_visit_datetime_id', table_name='appointments')
@@ -0,0 +1,53 @@
+"""merkle anchor batches
+
+Revision ID: c4f19b7e2d30
+Revises: 3e8a6d1f0c27
+Create Date: 2026-10-18 21:07:52.640118
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'c4f19b7e2d30'
+down_revision = '3e8a6d1f0c27'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Upgrade schema: partie Merkle i dowody przynależności w kolejce kotwiczenia."""
+    op.create_table(
+        'anchor_batches',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('root', sa.String(length=66), nullable=True),
+        sa.Column('leaf_count', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('next_attempt_at', sa.DateTime(), nullable=False),
+        sa.Column('locked_by', sa.String(length=36), nullable=True),
+        sa.Column('tx_hash', sa.String(), nullable=True),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('anchored_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('root'),
+    )
+    op.create_index(
+        'ix_anchor_batches_status_next_attempt_at', 'anchor_batches', ['status', 'next_attempt_at']
+    )
+    op.add_column('anchor_queue', sa.Column('batch_id', sa.Integer(), nullable=True))
+    op.add_column('anchor_queue', sa.Column('leaf_index', sa.Integer(), nullable=True))
+    op.add_column('anchor_queue', sa.Column('merkle_proof', sa.Text(), nullable=True))
+    op.create_index('ix_anchor_queue_batch_id', 'anchor_queue', ['batch_id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema: usuwamy partie i kolumny dowodów."""
+    op.drop_index('ix_anchor_queue_batch_id', table_name='anchor_queue')
+    with op.batch_alter_table('anchor_queue') as batch_op:
+        batch_op.drop_column('merkle_proof')
+        batch_op.drop_column('leaf_index')
+        batch_op.drop_column('batch_id')
+    op.drop_index('ix_anchor_batches_status_next_attempt_at', table_name='anchor_batches')
+    op.drop_table('anchor_batches')
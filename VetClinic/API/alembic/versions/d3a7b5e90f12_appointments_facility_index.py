@@ -0,0 +1,26 @@
+"""appointments facility filter index
+
+Revision ID: d3a7b5e90f12
+Revises: 9e41f07c2d68
+Create Date: 2026-10-18 12:21:53.640177
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'd3a7b5e90f12'
+down_revision = '9e41f07c2d68'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Upgrade schema: indeks pod filtr ?facility_id=&from=&to= listy wizyt."""
+    op.create_index(
+        'ix_appointments_facility_id_visit_datetime', 'appointments', ['facility_id', 'visit_datetime']
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema: usuwamy indeks filtra placówki."""
+    op.drop_index('ix_appointments_facility_id_visit_datetime', table_name='appointments')
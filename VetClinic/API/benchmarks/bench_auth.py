@@ -0,0 +1,81 @@
+"""
+Benchmark zależności get_current_user (core.auth).
+
+Mierzy średni koszt uwierzytelnienia jednego żądania:
+- bez pamięci podręcznej: weryfikacja podpisu JWT + odczyt użytkownika z bazy,
+- z pamięcią podręczną: skrót tokenu + dwa trafienia w LRU.
+
+Uruchomienie (z katalogu VetClinic/API):
+    python -m benchmarks.bench_auth --calls 5000
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+# Osobna baza tymczasowa – musi być ustawiona przed importem vetclinic_api
+os.environ["DATABASE_URL"] = (
+    f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='vetclinic-bench-'), 'bench.db')}"
+)
+
+from fastapi.security import HTTPAuthorizationCredentials  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from vetclinic_api.core import auth  # noqa: E402
+from vetclinic_api.core.database import Base, engine, get_async_sessionmaker  # noqa: E402
+from vetclinic_api.core.security import create_access_token  # noqa: E402
+from vetclinic_api.models.facility import Facility  # noqa: E402
+from vetclinic_api.models.users import Doctor  # noqa: E402
+
+
+def seed() -> int:
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    facility = Facility(name="F", address="ul. Benchmarkowa 1")
+    db.add(facility)
+    db.flush()
+    doctor = Doctor(first_name="L", last_name="L", email="l@lekarz.pl", backup_email="b@x.pl",
+                    password_hash="x", specialization="chirurg", permit_number="12345",
+                    facility_id=facility.id)
+    db.add(doctor)
+    db.commit()
+    doctor_id = doctor.id
+    db.close()
+    return doctor_id
+
+
+async def measure(credentials, calls: int, cached: bool) -> float:
+    start = time.perf_counter()
+    for _ in range(calls):
+        if not cached:
+            auth.tokens.clear()
+            auth.users.clear()
+        await auth.get_current_user(credentials)
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=5000)
+    args = parser.parse_args()
+
+    doctor_id = seed()
+    token = create_access_token({"user_id": doctor_id, "email": "l@lekarz.pl", "role": "lekarz"})
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+    async def run():
+        await auth.get_current_user(credentials)  # rozgrzewka
+        cold = await measure(credentials, args.calls, cached=False)
+        warm = await measure(credentials, args.calls, cached=True)
+        print(f"bez pamięci podręcznej: {cold:8.1f} µs/żądanie")
+        print(f" z pamięcią podręczną: {warm:8.1f} µs/żądanie")
+        # połączenia aiosqlite mają własne wątki – bez zamknięcia proces nie kończy pracy
+        await get_async_sessionmaker().kw["bind"].dispose()
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark usuwania wielu klientów: pętla delete_client vs delete_clients.
+
+Dawny DELETE /users/ wywoływał delete_client dla każdego ID – osobny odczyt,
+kilka DELETE i commit (fsync) na klienta. delete_clients usuwa cały zbiór
+(wizyty, dokumentację, zwierzęta, wagę, faktury, konta) w jednej transakcji.
+
+Uruchomienie (z katalogu VetClinic/API):
+    python -m benchmarks.bench_bulk_delete --clients 500
+"""
+
+import argparse
+import datetime
+import os
+import tempfile
+import time
+
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+from vetclinic_api.core.database import Base, build_engine
+from vetclinic_api.crud.users_crud import delete_client, delete_clients
+from vetclinic_api.models.animals import Animal
+from vetclinic_api.models.appointments import Appointment
+from vetclinic_api.models.facility import Facility
+from vetclinic_api.models.invoice import Invoice
+from vetclinic_api.models.medical_records import MedicalRecord
+from vetclinic_api.models.users import Client, Doctor
+from vetclinic_api.models.weight_logs import WeightLog
+
+VISIT = datetime.datetime(2025, 1, 1, 8, 0)
+
+
+def seed(engine, clients: int) -> None:
+    Base.metadata.create_all(bind=engine)
+    with sessionmaker(bind=engine)() as db:
+        db.add(Facility(id=1, name="F", address="ul. A 1"))
+        db.add(Doctor(id=1, first_name="L", last_name="L", email="l@x.pl", backup_email="b@x.pl",
+                      password_hash="x", specialization="chirurg", permit_number="12345", facility_id=1))
+        for c in range(1, clients + 1):
+            db.add(Client(id=c, first_name="K", last_name="K", email=f"k{c}@x.pl", password_hash="x",
+                          phone_number="+48123456789", address="ul. A 1",
+                          postal_code="00-001 Warszawa", wallet_address=f"0x{c:040x}"))
+            db.add(Animal(id=c, owner_id=c, name="Rex", species="pies"))
+            db.add(Appointment(id=c, doctor_id=1, animal_id=c, owner_id=c, facility_id=1,
+                               visit_datetime=VISIT + datetime.timedelta(minutes=15 * c)))
+            db.add(MedicalRecord(animal_id=c, appointment_id=c, description="opis"))
+            db.add(WeightLog(animal_id=c, weight=10.0))
+            db.add(Invoice(client_id=c, amount=100))
+        db.commit()
+
+
+def run(label, clients, delete):
+    url = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='vetclinic-bench-'), 'bench.db')}"
+    engine = build_engine(url)
+    seed(engine, clients)
+    commits = []
+    event.listen(engine, "commit", lambda conn: commits.append(1))
+    with sessionmaker(bind=engine)() as db:
+        start = time.perf_counter()
+        delete(db, list(range(1, clients + 1)))
+        elapsed = time.perf_counter() - start
+    engine.dispose()
+    print(f"{label:>15}: {elapsed * 1000:8.1f} ms, {len(commits):5d} commitów")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--clients", type=int, default=500)
+    args = parser.parse_args()
+
+    run("pętla", args.clients, lambda db, ids: [delete_client(db, i) for i in ids])
+    run("delete_clients", args.clients, delete_clients)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Benchmark wysyłki e-maili: SMTP w żądaniu rejestracji vs outbox.
+
+Lokalny serwer SMTP (aiosmtpd) z opóźnieniem --latency na każdą odpowiedź
+protokołu udaje zdalny serwer pocztowy. Mierzy:
+- czas rejestracji klienta (create_client): dawniej po commicie nowe
+  połączenie SMTP i wysyłka w tym samym żądaniu, teraz tylko wiersz outbox,
+- przepustowość nadawcy: połączenie na każdą wiadomość vs OutboxSender
+  (jedno połączenie na wiele partii).
+
+Wymaga aiosmtpd (VetClinic/requirements-dev.txt).
+Uruchomienie (z katalogu VetClinic/API):
+    python -m benchmarks.bench_email_outbox --users 50 --latency 0.02
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import tempfile
+import time
+
+from aiosmtpd.controller import Controller
+from sqlalchemy.orm import sessionmaker
+
+from vetclinic_api.core.database import Base, build_engine
+from vetclinic_api.crud import users_crud
+from vetclinic_api.models.email_outbox import EmailOutbox
+from vetclinic_api.schemas.users import ClientCreate
+from vetclinic_api.services.email_service import (
+    OutboxSender, SMTPConnection, TEMPORARY_PASSWORD_SUBJECT, build_message,
+)
+
+
+class SlowInbox:
+    """Handler aiosmtpd z opóźnieniem odpowiedzi (RTT do serwera pocztowego)."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.received = 0
+
+    async def handle_EHLO(self, server, session, envelope, hostname, responses):
+        await asyncio.sleep(self.latency)
+        session.host_name = hostname
+        return responses
+
+    async def handle_MAIL(self, server, session, envelope, address, mail_options):
+        await asyncio.sleep(self.latency)
+        envelope.mail_from = address
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        await asyncio.sleep(self.latency)
+        self.received += 1
+        return "250 OK"
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def client_in(i: int) -> ClientCreate:
+    return ClientCreate(
+        first_name="Jan", last_name="K", email=f"k{i}@x.pl", password="x", role="klient",
+        phone_number="+48123456789", address="ul. A 1", postal_code="00-001 Warszawa",
+        wallet_address=f"0x{i:040x}",
+    )
+
+
+def timed(fn, n):
+    times = []
+    for i in range(n):
+        start = time.perf_counter()
+        fn(i)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000, max(times) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.02, help="opóźnienie odpowiedzi SMTP [s]")
+    args = parser.parse_args()
+
+    inbox = SlowInbox(args.latency)
+    port = free_port()
+    controller = Controller(inbox, hostname="127.0.0.1", port=port)
+    controller.start()
+
+    def connection():
+        return SMTPConnection(host="127.0.0.1", port=port, security="none", user=None)
+
+    url = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='vetclinic-bench-'), 'bench.db')}"
+    engine = build_engine(url)
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    # haszowanie hasła tymczasowego jest takie samo w obu wariantach – pomijamy je
+    users_crud.get_password_hash = lambda p: "hash"
+
+    def register_inline(i):
+        with Session() as db:
+            client = users_crud.create_client(db, client_in(i))
+            # dawniej: wysyłka w żądaniu, po commicie, na nowym połączeniu
+            db.query(EmailOutbox).filter_by(to_address=client.email).delete()
+            db.commit()
+            conn = connection()
+            conn.send(build_message(client.email, TEMPORARY_PASSWORD_SUBJECT, "haslo"))
+            conn.close()
+
+    def register_outbox(i):
+        with Session() as db:
+            users_crud.create_client(db, client_in(args.users + i))
+
+    try:
+        med, worst = timed(register_inline, args.users)
+        print(f"rejestracja, SMTP w żądaniu: mediana {med:7.2f} ms, max {worst:7.2f} ms")
+        med, worst = timed(register_outbox, args.users)
+        print(f"rejestracja, outbox:         mediana {med:7.2f} ms, max {worst:7.2f} ms")
+
+        start = time.perf_counter()
+        for i in range(args.users):
+            conn = connection()
+            conn.send(build_message(f"k{i}@x.pl", TEMPORARY_PASSWORD_SUBJECT, "haslo"))
+            conn.close()
+        per_message = args.users / (time.perf_counter() - start)
+
+        sender = OutboxSender(Session, connection())
+        start = time.perf_counter()
+        sent = sender.drain()
+        pooled = sent / (time.perf_counter() - start)
+        sender.connection.close()
+        print(
+            f"nadawca: połączenie na wiadomość {per_message:7.1f} msg/s, "
+            f"OutboxSender {pooled:7.1f} msg/s ({sent} wiadomości, "
+            f"{sender.connection.connects} połączenie)"
+        )
+    finally:
+        controller.stop()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
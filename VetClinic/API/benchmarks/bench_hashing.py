@@ -0,0 +1,134 @@
+"""
+Benchmark burzy logowań: bcrypt w wątkach żądań vs ograniczona pula procesów.
+
+Kilkadziesiąt wątków jednocześnie wysyła POST /users/login z poprawnym
+hasłem (bcrypt przy każdym żądaniu), a w tym czasie osobny wątek mierzy
+opóźnienie niezwiązanego GET /facilities/. Wariant "w wątku" to dawne
+zachowanie (bez limitu, bcrypt w puli wątków FastAPI); wariant "pula"
+to core.hashing.PasswordHasher z PASSWORD_HASH_WORKERS/QUEUE – nadmiar
+logowań dostaje 503 + Retry-After zamiast kolejkować się w serwerze.
+
+Uruchomienie (z katalogu VetClinic/API):
+    python -m benchmarks.bench_hashing --logins 200 --threads 32
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import threading
+import time
+from collections import Counter
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+
+from vetclinic_api.core import hashing
+from vetclinic_api.core.database import Base, build_engine, get_db
+from vetclinic_api.core.hashing import PasswordHasher
+from vetclinic_api.main import app
+from vetclinic_api.models.facility import Facility
+from vetclinic_api.models.users import Client
+
+PASSWORD = "Sekret123!"
+
+
+def seed(engine, users: int) -> None:
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    db.add(Facility(name="F", address="ul. Benchmarkowa 1"))
+    hashed = hashing.pwd_context.hash(PASSWORD)
+    for i in range(users):
+        db.add(Client(first_name="K", last_name="K", email=f"k{i}@x.pl", password_hash=hashed,
+                      phone_number="+48123456789", address="ul. A 1", postal_code="00-001",
+                      wallet_address=f"0x{i:040x}"))
+    db.commit()
+    db.close()
+
+
+def burst(client: TestClient, users: int, logins: int, threads: int):
+    statuses = Counter()
+    latencies = []
+    done = threading.Event()
+    counter = iter(range(logins))
+    lock = threading.Lock()
+
+    def login_worker():
+        while True:
+            with lock:
+                i = next(counter, None)
+            if i is None:
+                return
+            r = client.post("/users/login", json={"email": f"k{i % users}@x.pl", "password": PASSWORD})
+            with lock:
+                statuses[r.status_code] += 1
+
+    def probe():
+        while not done.is_set():
+            t0 = time.perf_counter()
+            client.get("/facilities/")
+            latencies.append(time.perf_counter() - t0)
+            time.sleep(0.01)
+
+    prober = threading.Thread(target=probe)
+    workers = [threading.Thread(target=login_worker) for _ in range(threads)]
+    start = time.perf_counter()
+    prober.start()
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    elapsed = time.perf_counter() - start
+    done.set()
+    prober.join()
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1] if latencies else 0.0
+    return elapsed, statuses, statistics.median(latencies) if latencies else 0.0, p95
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=32)
+    args = parser.parse_args()
+
+    url = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='vetclinic-bench-'), 'bench.db')}"
+    engine = build_engine(url)
+    seed(engine, args.users)
+    Session = sessionmaker(bind=engine)
+
+    def override_get_db():
+        db = Session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    variants = {
+        # bez limitu: dawne zachowanie, bcrypt liczony w wątku żądania
+        "w wątku": PasswordHasher(workers=0, queue_limit=10**6),
+        "pula": PasswordHasher(),
+    }
+    app.dependency_overrides[get_db] = override_get_db
+    original = hashing.hasher
+    try:
+        with TestClient(app) as client:
+            for label, hasher in variants.items():
+                hashing.hasher = hasher
+                hasher.verify(PASSWORD, hashing.pwd_context.hash(PASSWORD))  # rozgrzewka procesów
+                elapsed, statuses, p50, p95 = burst(client, args.users, args.logins, args.threads)
+                codes = ", ".join(f"{code}: {n}" for code, n in sorted(statuses.items()))
+                print(
+                    f"{label:>8}: {elapsed:6.2f} s | /facilities/ p50 {p50 * 1000:7.1f} ms, "
+                    f"p95 {p95 * 1000:7.1f} ms | {codes}"
+                )
+                hasher.shutdown()
+    finally:
+        hashing.hasher = original
+        app.dependency_overrides.clear()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
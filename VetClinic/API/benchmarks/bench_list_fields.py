@@ -0,0 +1,134 @@
+"""
+Benchmark list z wyborem pól (?fields=) vs pełny schemat odpowiedzi.
+
+Tworzy tymczasową bazę z N wizytami i klientami, po czym pobiera całą listę
+GET /appointments/ i /users/ stronami po MAX_PAGE_SIZE (kursorem) – pełne
+wiersze oraz warianty z ?fields= – i mierzy czas CPU procesu oraz rozmiar
+odpowiedzi.
+
+Uruchomienie (z katalogu VetClinic/API):
+    python -m benchmarks.bench_list_fields --rows 10000 --runs 5
+"""
+
+import argparse
+import datetime
+import os
+import statistics
+import tempfile
+import time
+
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from vetclinic_api.core.database import Base, build_async_engine, build_engine, get_async_db, get_db
+from vetclinic_api.core.pagination import MAX_PAGE_SIZE
+from vetclinic_api.main import app
+from vetclinic_api.models.animals import Animal
+from vetclinic_api.models.appointments import Appointment
+from vetclinic_api.models.facility import Facility
+from vetclinic_api.models.users import Client, Doctor
+
+SCENARIOS = [
+    ("wizyty: pełne", "/appointments/"),
+    ("wizyty: id,visit_datetime", "/appointments/?fields=id,visit_datetime"),
+    ("klienci: pełne", "/users/"),
+    ("klienci: id,first_name,last_name", "/users/?fields=id,first_name,last_name"),
+]
+
+
+def seed(url: str, rows: int) -> None:
+    engine = build_engine(url)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    facility = Facility(name="F", address="ul. Benchmarkowa 1")
+    db.add(facility)
+    db.flush()
+    doctor = Doctor(first_name="Jan", last_name="Lekarz", email="j@lekarz.pl", backup_email="b@x.pl",
+                    password_hash="x", specialization="chirurg", permit_number="12345",
+                    facility_id=facility.id)
+    clients = [
+        Client(first_name=f"Imię{i}", last_name=f"Nazwisko{i}", email=f"k{i}@x.pl", password_hash="x",
+               phone_number="+48123456789", address="ul. A 1", postal_code="00-001",
+               wallet_address=f"0x{i:040x}")
+        for i in range(rows)
+    ]
+    db.add(doctor)
+    db.add_all(clients)
+    db.flush()
+    animal = Animal(name="Rex", species="pies", owner_id=clients[0].id)
+    db.add(animal)
+    db.flush()
+    start = datetime.datetime(2024, 1, 1, 8, 0)
+    db.add_all(
+        Appointment(doctor_id=doctor.id, animal_id=animal.id, owner_id=clients[i].id,
+                    facility_id=facility.id, visit_datetime=start + datetime.timedelta(minutes=15 * i),
+                    reason="Kontrola okresowa", notes="Brak uwag", fee=100.0)
+        for i in range(rows)
+    )
+    db.commit()
+    db.close()
+    engine.dispose()
+
+
+def fetch_all(client: TestClient, path: str) -> tuple[int, int]:
+    """Pobiera wszystkie strony listy; zwraca (liczba wierszy, bajty)."""
+    sep = "&" if "?" in path else "?"
+    target = f"{path}{sep}limit={MAX_PAGE_SIZE}"
+    rows = size = 0
+    while target:
+        response = client.get(target)
+        assert response.status_code == 200, response.text
+        rows += len(response.json())
+        size += len(response.content)
+        cursor = response.headers.get("X-Next-Cursor")
+        target = f"{path}{sep}limit={MAX_PAGE_SIZE}&cursor={cursor}" if cursor else None
+    return rows, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    url = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='vetclinic-bench-'), 'bench.db')}"
+    seed(url, args.rows)
+
+    sync_session = sessionmaker(bind=build_engine(url))
+    async_session = async_sessionmaker(bind=build_async_engine(url, poolclass=NullPool),
+                                       expire_on_commit=False)
+
+    def override_get_db():
+        db = sync_session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def override_get_async_db():
+        async with async_session() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    try:
+        with TestClient(app) as client:
+            for label, path in SCENARIOS:
+                fetch_all(client, path)  # rozgrzewka
+                cpu = []
+                for _ in range(args.runs):
+                    t0 = time.process_time()
+                    rows, size = fetch_all(client, path)
+                    cpu.append(time.process_time() - t0)
+                print(
+                    f"{label:>34}: {statistics.median(cpu) * 1000:8.1f} ms CPU, "
+                    f"{size / 1024:8.1f} KiB, {rows} wierszy"
+                )
+    finally:
+        app.dependency_overrides.clear()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Benchmark wyszukiwania użytkownika przy logowaniu (core.security.get_user_by_email).
+
+Porównuje dotychczasowe trzy kolejne zapytania (klient -> lekarz -> konsultant)
+z jednym zapytaniem z LEFT JOIN po indeksach email. Mierzy średni czas
+i liczbę zapytań na wyszukiwanie dla każdej roli oraz nieistniejącego e-maila
+(najgorszy przypadek – logowanie na nieznane konto).
+
+Uruchomienie (z katalogu VetClinic/API):
+    python -m benchmarks.bench_login --users 5000 --lookups 2000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+from vetclinic_api.core.database import Base, build_engine
+from vetclinic_api.core.security import get_user_by_email
+from vetclinic_api.models.facility import Facility
+from vetclinic_api.models.users import Client, Consultant, Doctor
+
+
+def sequential_lookup(db, email):
+    """Poprzednia implementacja: do trzech zapytań jedno po drugim."""
+    for model in (Client, Doctor, Consultant):
+        user = db.query(model).filter(model.email == email).first()
+        if user:
+            return user
+    return None
+
+
+def seed(engine, users: int) -> None:
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    facility = Facility(name="F", address="ul. Benchmarkowa 1")
+    db.add(facility)
+    db.flush()
+    for i in range(users):
+        db.add(Client(first_name="K", last_name="K", email=f"k{i}@x.pl", password_hash="x",
+                      phone_number="+48123456789", address="ul. A 1", postal_code="00-001",
+                      wallet_address=f"0x{i:040x}"))
+        db.add(Doctor(first_name="L", last_name="L", email=f"l{i}@lekarz.pl", backup_email="b@x.pl",
+                      password_hash="x", specialization="chirurg", permit_number="12345",
+                      facility_id=facility.id))
+        db.add(Consultant(first_name="O", last_name="O", email=f"o{i}@x.pl", backup_email="b@x.pl",
+                          password_hash="x", facility_id=facility.id))
+    db.commit()
+    db.close()
+
+
+def measure(engine, lookup, email: str, lookups: int) -> tuple[float, float]:
+    statements = 0
+
+    def count(*args):
+        nonlocal statements
+        statements += 1
+
+    Session = sessionmaker(bind=engine)
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        start = time.perf_counter()
+        for _ in range(lookups):
+            # nowa sesja jak w żądaniu HTTP – bez trafień w identity map
+            db = Session()
+            lookup(db, email)
+            db.close()
+        elapsed = time.perf_counter() - start
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+    return elapsed / lookups * 1e6, statements / lookups
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=5000, help="użytkowników na rolę")
+    parser.add_argument("--lookups", type=int, default=2000)
+    args = parser.parse_args()
+
+    url = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='vetclinic-bench-'), 'bench.db')}"
+    engine = build_engine(url)
+    seed(engine, args.users)
+
+    cases = {
+        "klient": "k1@x.pl",
+        "lekarz": "l1@lekarz.pl",
+        "konsultant": "o1@x.pl",
+        "nieznany": "brak@x.pl",
+    }
+    for label, email in cases.items():
+        old_us, old_q = measure(engine, sequential_lookup, email, args.lookups)
+        new_us, new_q = measure(engine, get_user_by_email, email, args.lookups)
+        print(
+            f"{label:>10}: 3 zapytania {old_us:7.1f} µs ({old_q:.0f} SQL) | "
+            f"1 zapytanie {new_us:7.1f} µs ({new_q:.0f} SQL)"
+        )
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
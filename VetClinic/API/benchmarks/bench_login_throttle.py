@@ -0,0 +1,141 @@
+"""
+Benchmark zgadywania haseł: zapisy do bazy przy nieudanych logowaniach.
+
+Symuluje credential stuffing – wiele nieudanych logowań na istniejące konta
+(kilka prób na konto). Porównuje dawną obsługę porażki (odczyt, zmiana
+failed_login_attempts/locked_until i commit przy każdej próbie) z
+core.throttle (licznik w pamięci, blokady zapisywane partią). Liczy
+instrukcje UPDATE i commity oraz ile prób w ogóle doszło do bcrypt.
+
+Uruchomienie (z katalogu VetClinic/API):
+    python -m benchmarks.bench_login_throttle --accounts 200 --attempts 8
+"""
+
+import argparse
+import datetime
+import os
+import tempfile
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+from vetclinic_api.core import hashing, throttle
+from vetclinic_api.core.database import Base, build_engine, get_db
+from vetclinic_api.core.security import get_user_by_email
+from vetclinic_api.main import app
+from vetclinic_api.models.users import Client
+
+MAX_FAILS = 5
+BLOCK_PERIOD = datetime.timedelta(minutes=15)
+
+
+def seed(engine, accounts: int) -> None:
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    # niski koszt bcrypt – mierzymy bazę, nie haszowanie
+    hashed = hashing.pwd_context.hash("Poprawne1!", rounds=4)
+    for i in range(accounts):
+        db.add(Client(first_name="K", last_name="K", email=f"k{i}@x.pl", password_hash=hashed,
+                      phone_number="+48123456789", address="ul. A 1", postal_code="00-001",
+                      wallet_address=f"0x{i:040x}"))
+    db.commit()
+    db.close()
+
+
+def old_failure(db, email: str) -> bool:
+    """Poprzednia implementacja: commit przy każdej nieudanej próbie."""
+    now = datetime.datetime.utcnow()
+    user = get_user_by_email(db, email)
+    if user.locked_until and user.locked_until > now:
+        return False
+    hashing.pwd_context.verify("zle-haslo", user.password_hash)
+    user.failed_login_attempts += 1
+    if user.failed_login_attempts >= MAX_FAILS:
+        user.locked_until = now + BLOCK_PERIOD
+        user.failed_login_attempts = 0
+    db.commit()
+    return True
+
+
+class Counter:
+    def __init__(self, engine):
+        self.engine, self.updates, self.commits = engine, 0, 0
+
+    def _execute(self, conn, cursor, statement, *args):
+        self.updates += statement.startswith("UPDATE")
+
+    def _commit(self, conn):
+        self.commits += 1
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self._execute)
+        event.listen(self.engine, "commit", self._commit)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self._execute)
+        event.remove(self.engine, "commit", self._commit)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--accounts", type=int, default=200)
+    parser.add_argument("--attempts", type=int, default=8, help="prób na konto")
+    args = parser.parse_args()
+    total = args.accounts * args.attempts
+
+    url = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='vetclinic-bench-'), 'bench.db')}"
+    engine = build_engine(url)
+    seed(engine, args.accounts)
+    Session = sessionmaker(bind=engine)
+
+    verified = 0
+    with Counter(engine) as c:
+        for _ in range(args.attempts):
+            for i in range(args.accounts):
+                with Session() as db:
+                    verified += old_failure(db, f"k{i}@x.pl")
+    print(f"   dawniej: {c.updates:5d} UPDATE, {c.commits:5d} commitów, bcrypt {verified}/{total}")
+
+    def override_get_db():
+        db = Session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    verified = 0
+    verify = hashing.verify_password
+
+    def counting_verify(password, hashed):
+        nonlocal verified
+        verified += 1
+        return verify(password, hashed)
+
+    hashing.verify_password = counting_verify
+    app.dependency_overrides[get_db] = override_get_db
+    throttle.login_throttle.clear()
+    try:
+        with TestClient(app) as client, Counter(engine) as c:
+            # konta zablokowane przez pierwszy przebieg – zaczynamy od zera
+            with Session() as db:
+                db.query(Client).update({"locked_until": None, "failed_login_attempts": 0})
+                db.commit()
+            c.updates = c.commits = 0
+            for _ in range(args.attempts):
+                for i in range(args.accounts):
+                    client.post("/users/login", json={"email": f"k{i}@x.pl", "password": "zle-haslo"})
+            flushed = throttle.flush_lockouts(session_factory=Session)
+        print(
+            f"  throttle: {c.updates:5d} UPDATE, {c.commits:5d} commitów, bcrypt {verified}/{total} "
+            f"({flushed} blokad zapisanych jedną partią)"
+        )
+    finally:
+        hashing.verify_password = verify
+        app.dependency_overrides.clear()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
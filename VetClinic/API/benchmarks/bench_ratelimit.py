@@ -0,0 +1,59 @@
+"""
+Benchmark kosztu limitów żądań (core.ratelimit) na jedno żądanie.
+
+Mierzy średni czas pobrania żetonu dla backendu w pamięci i wspólnego
+pliku SQLite (kilka wątków naraz – jak workery współdzielące budżet).
+
+Uruchomienie (z katalogu VetClinic/API):
+    python -m benchmarks.bench_ratelimit --takes 20000 --threads 4
+"""
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+import anyio
+
+from vetclinic_api.core.ratelimit import MemoryBackend, SQLiteBackend
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--takes", type=int, default=20000)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--clients", type=int, default=1000)
+    args = parser.parse_args()
+
+    memory = MemoryBackend()
+
+    async def run_memory():
+        for i in range(args.takes):
+            await memory.take(f"login:{i % args.clients}", 1000.0, 1000.0)
+
+    start = time.perf_counter()
+    anyio.run(run_memory)
+    print(f"  memory: {(time.perf_counter() - start) / args.takes * 1e6:7.2f} µs/żeton")
+
+    path = os.path.join(tempfile.mkdtemp(prefix="vetclinic-bench-"), "rl.db")
+    per_thread = args.takes // args.threads
+
+    def run_sqlite():
+        backend = SQLiteBackend(path)
+        for i in range(per_thread):
+            backend.take_sync(f"login:{i % args.clients}", 1000.0, 1000.0)
+
+    SQLiteBackend(path).reset()  # utworzenie tabeli
+    threads = [threading.Thread(target=run_sqlite) for _ in range(args.threads)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    print(f"  sqlite: {elapsed / (per_thread * args.threads) * 1e6:7.2f} µs/żeton ({args.threads} wątki)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Benchmark zapisów do SQLite: domyślne ustawienia vs profil z core.sqlite.
+
+Każdy wątek symuluje osobne żądanie HTTP: otwiera własną sesję, dodaje
+placówkę, poprawia ją w tej samej transakcji i robi commit. Równolegle
+działają czytelnicy pobierający ostatnie wiersze.
+
+Uruchomienie (z katalogu VetClinic/API):
+    python -m benchmarks.bench_sqlite_writes --writers 16 --writes 100
+"""
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+from sqlalchemy.orm import sessionmaker
+
+from vetclinic_api.core.database import Base, build_engine
+from vetclinic_api.core.sqlite import SerializedWriter
+from vetclinic_api.models.facility import Facility
+
+
+def run(profile: bool, writers: int, writes: int, readers: int) -> dict:
+    tmp_dir = tempfile.mkdtemp(prefix="vetclinic-bench-")
+    url = f"sqlite:///{os.path.join(tmp_dir, 'bench.db')}"
+    # pula musi pomieścić wszystkie wątki, żeby mierzyć bazę, a nie pulę
+    engine = build_engine(url, sqlite_profile=profile, pool_size=writers + readers)
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    if profile:
+        SerializedWriter().install(Session)
+
+    ok = 0
+    failed = 0
+    lock = threading.Lock()
+    stop = threading.Event()
+
+    def writer(n):
+        nonlocal ok, failed
+        for i in range(writes):
+            db = Session()
+            try:
+                facility = Facility(name=f"F{n}-{i}", address="ul. Benchmarkowa 1")
+                db.add(facility)
+                db.flush()
+                facility.phone = f"+48{facility.id:09d}"
+                db.commit()
+                with lock:
+                    ok += 1
+            except Exception:
+                db.rollback()
+                with lock:
+                    failed += 1
+            finally:
+                db.close()
+
+    def reader():
+        while not stop.is_set():
+            db = Session()
+            try:
+                db.query(Facility).order_by(Facility.id.desc()).limit(20).all()
+            except Exception:
+                pass
+            finally:
+                db.close()
+
+    reader_threads = [threading.Thread(target=reader) for _ in range(readers)]
+    writer_threads = [threading.Thread(target=writer, args=(n,)) for n in range(writers)]
+    for t in reader_threads:
+        t.start()
+    start = time.perf_counter()
+    for t in writer_threads:
+        t.start()
+    for t in writer_threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    stop.set()
+    for t in reader_threads:
+        t.join()
+    engine.dispose()
+
+    return {
+        "profile": "wal+queue" if profile else "default",
+        "ok": ok,
+        "failed": failed,
+        "seconds": elapsed,
+        "writes_per_s": ok / elapsed if elapsed else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--writers", type=int, default=16)
+    parser.add_argument("--writes", type=int, default=100)
+    parser.add_argument("--readers", type=int, default=4)
+    args = parser.parse_args()
+
+    for profile in (False, True):
+        r = run(profile, args.writers, args.writes, args.readers)
+        print(
+            f"{r['profile']:>10}: {r['ok']:6d} ok, {r['failed']:5d} błędów, "
+            f"{r['seconds']:7.2f}s, {r['writes_per_s']:8.1f} zapisów/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
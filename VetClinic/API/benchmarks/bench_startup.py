@@ -0,0 +1,70 @@
+"""
+Benchmark startu: import aplikacji FastAPI oraz serwisów GUI.
+
+Każdy pomiar to osobny proces Pythona (zimny import), żeby mierzyć to,
+co widzi użytkownik przy uruchomieniu uvicorn lub GUI. Dla API mierzymy
+też pełny lifespan (sprawdzenie rewizji schematu).
+
+Uruchomienie (z katalogu VetClinic/API):
+    python -m benchmarks.bench_startup --runs 5
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+API_DIR = Path(__file__).resolve().parents[1]
+GUI_DIR = API_DIR.parent / "GUI"
+
+SCENARIOS = {
+    "api: import": "import vetclinic_api.main",
+    "api: import + lifespan": (
+        "from fastapi.testclient import TestClient\n"
+        "from vetclinic_api.main import app\n"
+        "with TestClient(app):\n"
+        "    pass"
+    ),
+    "gui: import serwisów": (
+        "import vetclinic_gui.services.clients_service\n"
+        "import vetclinic_gui.services.appointments_service\n"
+        "from vetclinic_gui.services.db import verify_database\n"
+        "verify_database()"
+    ),
+}
+
+TIMER = (
+    "import time\n"
+    "_t0 = time.perf_counter()\n"
+    "{code}\n"
+    "print(time.perf_counter() - _t0)"
+)
+
+
+def measure(code: str) -> float:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        p for p in (str(API_DIR), str(GUI_DIR), env.get("PYTHONPATH")) if p
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", TIMER.format(code=code)],
+        cwd=API_DIR, env=env, check=True, capture_output=True, text=True,
+    ).stdout
+    return float(out.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'scenariusz':<26}{'mediana [ms]':>14}{'min [ms]':>12}")
+    for name, code in SCENARIOS.items():
+        times = [measure(code) * 1000 for _ in range(args.runs)]
+        print(f"{name:<26}{statistics.median(times):>14.1f}{min(times):>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Benchmark provisioning TOTP: URI i kod QR.
+
+Porównuje dawną ścieżkę /users/setup-totp (URI z pyotp + PNG zapisany
+w katalogu roboczym) z obrazem budowanym w pamięci oraz koszt powtórnego
+provisioning tego samego (e-mail, secret) – np. kolejne logowania przed
+potwierdzeniem TOTP – z pamięci podręcznej.
+
+Uruchomienie (z katalogu VetClinic/API):
+    python -m benchmarks.bench_totp --runs 200
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import pyotp
+import qrcode
+
+from vetclinic_api.core.security import get_totp_provisioning_uri, totp_qr_png
+
+
+def old_setup(email: str, secret: str, workdir: str) -> None:
+    uri = pyotp.TOTP(secret).provisioning_uri(name=email, issuer_name="VetClinic")
+    qrcode.make(uri).save(os.path.join(workdir, f"{email}_qrcode.png"))
+
+
+def new_setup(email: str, secret: str) -> bytes:
+    return totp_qr_png(get_totp_provisioning_uri(email, secret))
+
+
+def per_call(fn, runs: int) -> float:
+    start = time.perf_counter()
+    for i in range(runs):
+        fn(i)
+    return (time.perf_counter() - start) / runs * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=200)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="vetclinic-bench-")
+    secrets = [pyotp.random_base32() for _ in range(args.runs)]
+
+    old = per_call(lambda i: old_setup(f"u{i}@x.pl", secrets[i], workdir), args.runs)
+    fresh = per_call(lambda i: new_setup(f"n{i}@x.pl", secrets[i]), args.runs)
+    repeat = per_call(lambda i: new_setup("n0@x.pl", secrets[0]), args.runs)
+    for label, ms in (("plik PNG na dysku", old), ("PNG w pamięci, nowy secret", fresh),
+                      ("ten sam (e-mail, secret)", repeat)):
+        print(f"{label:>28}: {ms:7.3f} ms/wywołanie")
+    print(f"{'plików w katalogu (dawniej)':>28}: {len(os.listdir(workdir))}")
+
+
+if __name__ == "__main__":
+    main()
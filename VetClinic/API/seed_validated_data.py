@@ -3,7 +3,8 @@
 
 import datetime
 from sqlalchemy.exc import IntegrityError
-from vetclinic_api.core.database      import engine, SessionLocal, Base
+from vetclinic_api.core.database      import SessionLocal
+from vetclinic_api.core.schema        import bootstrap_schema
 from vetclinic_api.crud.users_crud    import create_user
 from vetclinic_api.crud.animal_crud   import create_animal
 from vetclinic_api.crud.appointments_crud  import create_appointment
@@ -23,8 +24,8 @@ from vetclinic_api.models.medical_records import MedicalRecord
 from vetclinic_api.models.weight_logs     import WeightLog
 
 def main():
-    # 1) Utwórz tabele jeśli jeszcze nie istnieją
-    Base.metadata.create_all(bind=engine)
+    # 1) Przygotuj schemat (nowa baza: tabele z modeli, istniejąca: migracje)
+    bootstrap_schema()
     db = SessionLocal()
     print("🔧 Rozpoczynam seedowanie danych...")
 
@@ -0,0 +1,25 @@
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from vetclinic_api.core import ratelimit
+from vetclinic_api.core.database import Base, build_engine
+
+
+@pytest.fixture(autouse=True)
+def reset_rate_limits():
+    # budżety żądań (core.ratelimit) są wspólne dla całego procesu testów
+    ratelimit.backend.reset()
+    yield
+    ratelimit.backend.reset()
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    """
+    Fabryka sesji nad pustą bazą SQLite w pliku (nie :memory: – profil SQLite
+    włącza klucze obce). Moduły dokładają własne wiersze, nadpisując fixture.
+    """
+    eng = build_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    Base.metadata.create_all(bind=eng)
+    yield sessionmaker(bind=eng)
+    eng.dispose()
@@ -0,0 +1,348 @@
+import datetime
+from decimal import Decimal
+
+import pytest
+from fastapi.testclient import TestClient
+
+from vetclinic_api.core.database import get_db
+from vetclinic_api.core.sqlite import SerializedWriter, WriteQueueTimeout
+from vetclinic_api.crud.animal_crud import delete_animals
+from vetclinic_api.crud.appointments_crud import create_appointment, delete_appointment, delete_appointments
+from vetclinic_api.crud.users_crud import delete_clients
+from vetclinic_api.crud.medical_records import create_medical_record, update_medical_record
+from vetclinic_api.main import app
+from vetclinic_api.models.anchor_batch import AnchorBatch
+from vetclinic_api.models.anchor_queue import AnchorJob
+from vetclinic_api.models.animals import Animal
+from vetclinic_api.models.appointments import Appointment
+from vetclinic_api.models.facility import Facility
+from vetclinic_api.models.medical_records import MedicalRecord
+from vetclinic_api.models.users import Client, Doctor
+from vetclinic_api.schemas.appointment import AppointmentCreate
+from vetclinic_api.schemas.medical_records import MedicalRecordCreate, MedicalRecordUpdate
+from vetclinic_api.services import anchor_service
+from vetclinic_api.services.anchor_service import AnchorWorker, MerkleAnchorWorker, inclusion_proof, queue_metrics
+
+
+class FakeChain:
+    """Węzeł w pamięci: transakcje wysłane przez worker i ich receipty."""
+
+    def __init__(self):
+        self.sent = []
+        self.roots = []
+        self.receipts = {}
+        self.fail_send = None
+        self.revert = False
+        self.on_wait = None
+
+    def send_record_tx(self, op, record_id, data_hash=None):
+        if self.fail_send:
+            raise self.fail_send
+        tx = f"0x{len(self.sent) + 1:064x}"
+        self.sent.append((op, record_id, data_hash))
+        self.receipts[tx] = {"status": 0 if self.revert else 1}
+        return tx
+
+    def send_root_tx(self, root, leaf_count):
+        tx = f"0x{len(self.sent) + len(self.roots) + 1:064x}"
+        self.roots.append((root, leaf_count))
+        self.receipts[tx] = {"status": 1}
+        return tx
+
+    def wait_for_receipt(self, tx_hash, timeout):
+        if self.on_wait:
+            self.on_wait()
+        return self.receipts[tx_hash]
+
+    def find_receipt(self, tx_hash):
+        return self.receipts.get(tx_hash)
+
+
+@pytest.fixture
+def chain(monkeypatch):
+    fake = FakeChain()
+    for name in ("send_record_tx", "send_root_tx", "wait_for_receipt", "find_receipt"):
+        monkeypatch.setattr(anchor_service.blockchain_crud, name, getattr(fake, name))
+    return fake
+
+
+@pytest.fixture
+def session_factory(session_factory):
+    with session_factory() as db:
+        db.add(Facility(id=1, name="F", address="ul. A 1"))
+        db.add(Doctor(id=1, first_name="L", last_name="L", email="l@x.pl", backup_email="b@x.pl",
+                      password_hash="x", specialization="chirurg", permit_number="12345", facility_id=1))
+        db.add(Client(id=1, first_name="K", last_name="K", email="k@x.pl", password_hash="x",
+                      phone_number="+48123456789", address="ul. A 1", postal_code="00-001 Warszawa",
+                      wallet_address="0x1"))
+        db.add(Animal(id=1, owner_id=1, name="Rex", species="pies"))
+        db.commit()
+    return session_factory
+
+
+def seed_writes(db):
+    appt = create_appointment(db, AppointmentCreate(
+        owner_id=1, animal_id=1, doctor_id=1, facility_id=1,
+        visit_datetime=datetime.datetime(2025, 6, 2, 9, 0), fee=Decimal("100.00"),
+    ))
+    rec = create_medical_record(db, MedicalRecordCreate(appointment_id=appt.id, animal_id=1, description="opis"))
+    return appt.id, rec
+
+
+def worker(session_factory, **kw):
+    return AnchorWorker(session_factory=session_factory, retry_base=60, **kw)
+
+
+def probe_writes_while_waiting(session_factory, chain) -> list[bool]:
+    """Przy każdym czekaniu na receipt inna sesja próbuje zapisu przez kolejkę zapisów."""
+    SerializedWriter(timeout=0.1).install(session_factory)
+    results = []
+
+    def write():
+        with session_factory() as other:
+            other.add(Facility(name=f"W{len(results)}", address="ul. B 2"))
+            try:
+                other.commit()
+                results.append(True)
+            except WriteQueueTimeout:
+                results.append(False)
+
+    chain.on_wait = write
+    return results
+
+
+def test_writes_only_enqueue(session_factory, chain):
+    with session_factory() as db:
+        appt_id, rec = seed_writes(db)
+        assert db.get(Appointment, appt_id).tx_hash is None
+        assert rec["anchor_status"] == "pending" and rec["blockchain_tx"] is None
+        assert chain.sent == []
+        assert queue_metrics(db)["pending"] == 2
+
+
+def test_worker_anchors_and_backfills(session_factory, chain):
+    with session_factory() as db:
+        appt_id, rec = seed_writes(db)
+        upd = update_medical_record(db, rec["id"], MedicalRecordUpdate(description="nowy"))
+
+    assert worker(session_factory).drain() == 3
+    assert [s[:2] for s in chain.sent] == [("add", appt_id), ("add", rec["id"]), ("update", rec["id"])]
+    with session_factory() as db:
+        assert db.get(Appointment, appt_id).tx_hash
+        record = db.get(MedicalRecord, rec["id"])
+        assert record.anchor_status == "anchored"
+        assert record.data_hash == upd["data_hash"]
+        # transakcja aktualizacji (ostatnia), nie dodania
+        assert record.blockchain_tx == f"0x{3:064x}"
+        assert queue_metrics(db) == {"pending": 0, "failed": 0, "lag_seconds": 0.0, "batches_pending": 0}
+
+
+def test_worker_does_not_hold_write_slot_while_waiting(session_factory, chain):
+    with session_factory() as db:
+        _, rec = seed_writes(db)
+        update_medical_record(db, rec["id"], MedicalRecordUpdate(description="nowy"))
+    writes = probe_writes_while_waiting(session_factory, chain)
+
+    assert worker(session_factory).drain() == 3
+    # API zapisuje w trakcie czekania na każdy z receiptów partii
+    assert writes == [True, True, True]
+    with session_factory() as db:
+        assert db.get(MedicalRecord, rec["id"]).anchor_status == "anchored"
+
+
+@pytest.mark.parametrize("purge", [
+    lambda db, appt_id: delete_appointments(db, [appt_id]),
+    lambda db, appt_id: delete_appointment(db, appt_id),
+    lambda db, appt_id: delete_animals(db, [1]),
+    lambda db, appt_id: delete_clients(db, [1]),
+])
+def test_bulk_delete_enqueues_record_deletes(session_factory, chain, purge):
+    with session_factory() as db:
+        appt_id, rec = seed_writes(db)
+        purge(db, appt_id)
+        assert db.get(MedicalRecord, rec["id"]) is None
+        delete_job = db.query(AnchorJob).filter_by(op="delete").one()
+        assert (delete_job.kind, delete_job.record_id) == ("medical_record", rec["id"])
+
+    worker(session_factory).drain()
+    # oczekujące "add" rekordu nie zostawia go aktywnego on-chain – po nim idzie "delete"
+    with session_factory() as db:
+        jobs = db.query(AnchorJob).filter_by(kind="medical_record").order_by(AnchorJob.id).all()
+        assert [(j.op, j.status) for j in jobs] == [("add", "anchored"), ("delete", "anchored")]
+    assert chain.sent[-1][:2] == ("delete", rec["id"])
+
+
+def test_retries_keep_order_and_give_up(session_factory, chain):
+    with session_factory() as db:
+        _, rec = seed_writes(db)
+        update_medical_record(db, rec["id"], MedicalRecordUpdate(description="nowy"))
+
+    chain.fail_send = ConnectionError("node down")
+    w = worker(session_factory, max_attempts=2)
+    assert w.drain() == 3
+    with session_factory() as db:
+        jobs = db.query(AnchorJob).order_by(AnchorJob.id).all()
+        # add wizyty i add rekordu – próba 1; update czeka na add rekordu
+        assert [j.attempts for j in jobs] == [1, 1, 0]
+        assert jobs[0].next_attempt_at > datetime.datetime.utcnow()
+        assert "node down" in jobs[0].last_error
+        # kolejne przebiegi nie ruszają zadań przed terminem ponowienia
+        assert w.drain() == 0
+        db.query(AnchorJob).update({"next_attempt_at": datetime.datetime.utcnow()})
+        db.commit()
+
+    # update rekordu nadal czeka, bo add rekordu znów się nie udał
+    assert w.drain() == 3
+    with session_factory() as db:
+        statuses = [j.status for j in db.query(AnchorJob).order_by(AnchorJob.id)]
+        assert statuses == ["failed", "failed", "pending"]
+        assert db.get(MedicalRecord, rec["id"]).anchor_status == "pending"
+        assert queue_metrics(db)["failed"] == 2
+    assert chain.sent == []
+
+
+def test_restart_recovers_submitted_tx(session_factory, chain):
+    with session_factory() as db:
+        appt_id, rec = seed_writes(db)
+        job = db.query(AnchorJob).filter_by(kind="appointment").one()
+        # worker wysłał transakcję i przepadł przed zapisaniem wyniku; dzierżawa wygasła
+        job.tx_hash, job.locked_by = "0xabc", "dead-worker"
+        job.next_attempt_at = datetime.datetime.utcnow() - datetime.timedelta(seconds=1)
+        db.commit()
+    chain.receipts["0xabc"] = {"status": 1}
+
+    worker(session_factory).drain()
+    # wizyta nie została wysłana ponownie – tylko rekord medyczny
+    assert [s[:2] for s in chain.sent] == [("add", rec["id"])]
+    with session_factory() as db:
+        assert db.get(Appointment, appt_id).tx_hash == "0xabc"
+        assert db.query(AnchorJob).filter_by(kind="appointment").one().attempts == 1
+
+
+def test_reverted_tx_is_resent(session_factory, chain):
+    with session_factory() as db:
+        seed_writes(db)
+    chain.revert = True
+    worker(session_factory).drain()
+    with session_factory() as db:
+        jobs = db.query(AnchorJob).all()
+        assert all(j.status == "pending" and j.tx_hash is None and "revert" in j.last_error for j in jobs)
+
+
+def test_anchoring_metrics_endpoint(session_factory, chain):
+    with session_factory() as db:
+        seed_writes(db)
+        db.query(AnchorJob).update({"created_at": datetime.datetime.utcnow() - datetime.timedelta(seconds=30)})
+        db.commit()
+
+    def override_get_db():
+        with session_factory() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = override_get_db
+    try:
+        r = TestClient(app).get("/metrics/anchoring")
+    finally:
+        app.dependency_overrides.clear()
+    assert r.status_code == 200
+    body = r.json()
+    assert body["pending"] == 2 and body["failed"] == 0
+    assert 29 <= body["lag_seconds"] < 60
+
+
+def age_jobs(session_factory, seconds):
+    with session_factory() as db:
+        db.query(AnchorJob).update(
+            {"created_at": datetime.datetime.utcnow() - datetime.timedelta(seconds=seconds)})
+        db.commit()
+
+
+def test_merkle_batch_waits_for_window(session_factory, chain):
+    with session_factory() as db:
+        appt_id, rec = seed_writes(db)
+    w = MerkleAnchorWorker(session_factory=session_factory, max_leaves=10, window=60)
+    assert w.drain() == 0
+    assert chain.roots == []
+
+    age_jobs(session_factory, 61)
+    assert w.drain() == 2
+    assert chain.sent == [] and len(chain.roots) == 1
+    root, count = chain.roots[0]
+    assert count == 2
+    with session_factory() as db:
+        batch = db.query(AnchorBatch).one()
+        assert batch.status == "anchored" and batch.root == "0x" + root.hex()
+        assert db.get(Appointment, appt_id).tx_hash == batch.tx_hash
+        record = db.get(MedicalRecord, rec["id"])
+        assert record.anchor_status == "anchored" and record.blockchain_tx == batch.tx_hash
+
+        proof = inclusion_proof(db, "medical_record", rec["id"])
+        assert proof["verified"] and proof["root"] == batch.root
+        assert proof["data_hash"] == record.data_hash
+        assert queue_metrics(db)["pending"] == 0
+
+
+def test_merkle_full_batch_closes_window(session_factory, chain):
+    with session_factory() as db:
+        _, rec = seed_writes(db)
+        update_medical_record(db, rec["id"], MedicalRecordUpdate(description="nowy"))
+    w = MerkleAnchorWorker(session_factory=session_factory, max_leaves=2, window=3600)
+    # pełna partia (2 liście) od razu, trzecie zadanie czeka na okno
+    assert w.drain() == 2
+    assert [count for _, count in chain.roots] == [2]
+    with session_factory() as db:
+        assert queue_metrics(db)["pending"] == 1
+        assert db.get(MedicalRecord, rec["id"]).anchor_status == "pending"
+
+
+def test_merkle_worker_does_not_hold_write_slot_while_waiting(session_factory, chain):
+    with session_factory() as db:
+        seed_writes(db)
+    w = MerkleAnchorWorker(session_factory=session_factory, max_leaves=1, window=3600)
+    with session_factory() as db:
+        w._build_batch(db, datetime.datetime.utcnow())
+    writes = probe_writes_while_waiting(session_factory, chain)
+
+    # dwie partie w jednym przebiegu: zbudowana wcześniej i nowa
+    assert w.process_batch() == 2
+    assert len(chain.roots) == 2
+    assert writes == [True, True]
+
+
+def test_merkle_restart_reuses_sent_root(session_factory, chain):
+    with session_factory() as db:
+        seed_writes(db)
+    age_jobs(session_factory, 120)
+    w = MerkleAnchorWorker(session_factory=session_factory, max_leaves=10, window=60)
+    with session_factory() as db:
+        batch = w._build_batch(db, datetime.datetime.utcnow())
+        # korzeń wysłany, worker przepadł przed receiptem; dzierżawa wygasła
+        batch.tx_hash, batch.locked_by = "0xroot", "dead-worker"
+        db.commit()
+    chain.receipts["0xroot"] = {"status": 1}
+
+    assert w.drain() == 2
+    assert chain.roots == []
+    with session_factory() as db:
+        assert {j.tx_hash for j in db.query(AnchorJob)} == {"0xroot"}
+
+
+def test_medical_record_proof_endpoint(session_factory, chain):
+    with session_factory() as db:
+        _, rec = seed_writes(db)
+    age_jobs(session_factory, 120)
+    MerkleAnchorWorker(session_factory=session_factory, max_leaves=10, window=60).drain()
+
+    def override_get_db():
+        with session_factory() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = override_get_db
+    try:
+        client = TestClient(app)
+        r = client.get(f"/medical_records/{rec['id']}/proof")
+        assert r.status_code == 200
+        assert r.json()["verified"] is True and r.json()["op"] == "add"
+        assert client.get("/medical_records/999/proof").status_code == 404
+    finally:
+        app.dependency_overrides.clear()
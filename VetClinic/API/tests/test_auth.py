@@ -0,0 +1,104 @@
+import datetime
+
+import jwt
+import pytest
+from fastapi.testclient import TestClient
+
+from vetclinic_api.core import auth, security
+from vetclinic_api.core.auth import TTLCache
+from vetclinic_api.main import app
+from vetclinic_api.schemas.users import CurrentUser
+
+client = TestClient(app)
+
+DOCTOR = CurrentUser(id=7, role="lekarz", email="l@x.pl", first_name="Jan", last_name="Nowak", facility_id=1)
+
+
+@pytest.fixture(autouse=True)
+def clean_caches():
+    auth.tokens.clear()
+    auth.users.clear()
+    yield
+    auth.tokens.clear()
+    auth.users.clear()
+
+
+@pytest.fixture
+def lookups(monkeypatch):
+    calls = []
+
+    async def fake_load_user(role, user_id):
+        calls.append((role, user_id))
+        return DOCTOR if (role, user_id) == ("lekarz", 7) else None
+
+    monkeypatch.setattr(auth, "load_user", fake_load_user)
+    return calls
+
+
+def bearer(token):
+    return {"Authorization": f"Bearer {token}"}
+
+
+def doctor_token(**delta):
+    return security.create_access_token(
+        {"user_id": 7, "email": "l@x.pl", "role": "lekarz"},
+        expires_delta=datetime.timedelta(**delta) if delta else None,
+    )
+
+
+def test_me_verifies_once_and_caches_user(monkeypatch, lookups):
+    decodes = []
+    real_decode = jwt.decode
+    monkeypatch.setattr(auth.jwt, "decode", lambda *a, **kw: decodes.append(1) or real_decode(*a, **kw))
+    token = doctor_token()
+    for _ in range(3):
+        r = client.get("/users/me", headers=bearer(token))
+        assert r.status_code == 200
+        assert r.json()["email"] == "l@x.pl" and r.json()["role"] == "lekarz"
+    assert len(decodes) == 1
+    assert lookups == [("lekarz", 7)]
+
+
+def test_missing_token():
+    r = client.get("/users/me")
+    assert r.status_code == 401
+    assert r.headers["www-authenticate"] == "Bearer"
+
+
+def test_bad_signature(lookups):
+    forged = jwt.encode({"user_id": 7, "role": "lekarz", "exp": 4102444800}, "inny-klucz", algorithm="HS256")
+    assert client.get("/users/me", headers=bearer(forged)).status_code == 401
+    assert lookups == []
+    assert len(auth.tokens) == 0
+
+
+def test_expired_token(lookups):
+    assert client.get("/users/me", headers=bearer(doctor_token(seconds=-1))).status_code == 401
+
+
+def test_unknown_user(lookups):
+    token = security.create_access_token({"user_id": 99, "role": "lekarz"})
+    assert client.get("/users/me", headers=bearer(token)).status_code == 401
+
+
+def test_forget_user_reloads(lookups):
+    token = doctor_token()
+    client.get("/users/me", headers=bearer(token))
+    auth.forget_user("lekarz", 7)
+    client.get("/users/me", headers=bearer(token))
+    assert lookups == [("lekarz", 7), ("lekarz", 7)]
+
+
+def test_ttl_cache_expiry_and_lru():
+    cache = TTLCache(maxsize=2)
+    cache.put("a", 1, expires_at=100)
+    assert cache.get("a", now=99) == 1
+    assert cache.get("a", now=100) is None  # wygasa dokładnie w chwili exp
+    assert len(cache) == 0
+
+    cache.put("a", 1, expires_at=1e12)
+    cache.put("b", 2, expires_at=1e12)
+    cache.get("a")
+    cache.put("c", 3, expires_at=1e12)  # wypycha najdawniej użyty "b"
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
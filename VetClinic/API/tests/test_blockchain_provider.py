@@ -0,0 +1,112 @@
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from fastapi.testclient import TestClient
+
+from vetclinic_api.core import contract_registry
+from vetclinic_api.core.blockchain import BlockchainProvider, get_provider
+from vetclinic_api.crud import blockchain_crud, medical_records
+from vetclinic_api.main import app
+
+CONTRACT = "0x" + "12" * 20
+ACCOUNT = "0x" + "aa" * 20
+RESULTS = {
+    "web3_clientVersion": "fake/1.0",
+    "eth_accounts": [ACCOUNT],
+    "eth_chainId": "0x539",
+    "eth_blockNumber": "0x2a",
+}
+
+
+class RpcNode(ThreadingHTTPServer):
+    """Atrapa węzła JSON-RPC z keep-alive; liczy połączenia TCP i zapytania."""
+
+    daemon_threads = True
+
+    def __init__(self):
+        self.connections = 0
+        self.calls = []
+        super().__init__(("127.0.0.1", 0), RpcHandler)
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class RpcHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.calls.append(request["method"])
+        body = json.dumps({"jsonrpc": "2.0", "id": request["id"],
+                           "result": RESULTS[request["method"]]}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def node(monkeypatch):
+    monkeypatch.setitem(contract_registry.CONFIGURED_ADDRESSES, "MedicalRecord", CONTRACT)
+    server = RpcNode()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_crud_modules_share_one_provider():
+    assert blockchain_crud._provider is medical_records.provider is get_provider()
+
+
+def test_one_provider_and_connect_per_url(node, monkeypatch):
+    connects = []
+    original = BlockchainProvider._connect
+    monkeypatch.setattr(BlockchainProvider, "_connect", lambda self: connects.append(1) or original(self))
+
+    with ThreadPoolExecutor(8) as pool:
+        providers = list(pool.map(lambda _: get_provider(node.url), range(32)))
+        results = list(pool.map(lambda p: p.get(), providers))
+
+    assert len({id(p) for p in providers}) == 1
+    assert len(connects) == 1
+    assert all(r[0].address.lower() == CONTRACT for r in results)
+    assert node.calls.count("eth_accounts") == 1
+
+    # kolejne zapytania idą tą samą sesją i tym samym połączeniem keep-alive
+    before = node.connections
+    provider = providers[0]
+    for _ in range(5):
+        assert provider.health()["ok"]
+    assert node.connections - before <= 1
+    assert len(connects) == 1
+
+
+def test_health_reports_unreachable_node():
+    health = BlockchainProvider("http://127.0.0.1:9").health()
+    assert health["ok"] is False and "9" in health["error"]
+
+
+def test_health_endpoint(node, monkeypatch):
+    client = TestClient(app)
+    monkeypatch.setattr("vetclinic_api.routers.blockchain.get_provider", lambda: BlockchainProvider(node.url))
+    r = client.get("/blockchain/health")
+    assert r.status_code == 200
+    assert r.json()["block_number"] == 42
+
+    monkeypatch.setattr("vetclinic_api.routers.blockchain.get_provider",
+                        lambda: BlockchainProvider("http://127.0.0.1:9"))
+    assert client.get("/blockchain/health").status_code == 503
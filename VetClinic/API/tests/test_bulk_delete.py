@@ -0,0 +1,106 @@
+import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event, func, select
+
+from vetclinic_api.core.database import get_db
+from vetclinic_api.crud.animal_crud import delete_animals
+from vetclinic_api.crud.appointments_crud import delete_appointments
+from vetclinic_api.crud.doctors import delete_doctors
+from vetclinic_api.crud.users_crud import delete_client, delete_clients
+from vetclinic_api.main import app
+from vetclinic_api.models.animals import Animal
+from vetclinic_api.models.appointments import Appointment
+from vetclinic_api.models.facility import Facility
+from vetclinic_api.models.invoice import Invoice
+from vetclinic_api.models.medical_records import MedicalRecord
+from vetclinic_api.models.users import Client, Doctor
+from vetclinic_api.models.weight_logs import WeightLog
+
+VISIT = datetime.datetime(2025, 6, 2, 9, 0)
+
+
+@pytest.fixture
+def session_factory(session_factory):
+    with session_factory() as db:
+        db.add(Facility(id=1, name="F", address="ul. A 1"))
+        for i in (1, 2):
+            db.add(Doctor(id=i, first_name="L", last_name="L", email=f"l{i}@x.pl", backup_email="b@x.pl",
+                          password_hash="x", specialization="chirurg", permit_number=f"1234{i}",
+                          facility_id=1))
+        for c in (1, 2, 3):
+            db.add(Client(id=c, first_name="K", last_name="K", email=f"k{c}@x.pl", password_hash="x",
+                          phone_number="+48123456789", address="ul. A 1", postal_code="00-001 Warszawa",
+                          wallet_address=f"0x{c}"))
+            db.add(Animal(id=c, owner_id=c, name="Rex", species="pies"))
+            db.add(Appointment(id=c, doctor_id=1, animal_id=c, owner_id=c, facility_id=1,
+                               visit_datetime=VISIT + datetime.timedelta(hours=c)))
+            db.add(MedicalRecord(animal_id=c, appointment_id=c, description="opis"))
+            db.add(WeightLog(animal_id=c, weight=10.0))
+            db.add(Invoice(client_id=c, amount=100))
+        db.commit()
+    return session_factory
+
+
+def count(db, model, **where):
+    stmt = select(func.count()).select_from(model).filter_by(**where)
+    return db.scalar(stmt)
+
+
+def test_delete_clients_one_transaction(session_factory):
+    db = session_factory()
+    commits = []
+    event.listen(db.get_bind(), "commit", lambda conn: commits.append(1))
+
+    assert delete_clients(db, [3, 1, 99, 1]) == [1, 3]
+    assert len(commits) == 1
+    for model in (Client, Animal, Appointment, MedicalRecord, WeightLog, Invoice):
+        assert count(db, model) == 1, model.__name__
+    assert count(db, Invoice, client_id=2) == 1
+    assert delete_clients(db, [1, 3]) == []
+    assert delete_client(db, 2) and not delete_client(db, 2)
+    db.close()
+
+
+def test_delete_animals_and_appointments(session_factory):
+    db = session_factory()
+    assert delete_animals(db, [1, 42]) == [1]
+    assert count(db, Appointment, animal_id=1) == 0
+    assert count(db, MedicalRecord, animal_id=1) == 0
+    assert count(db, WeightLog, animal_id=1) == 0
+    assert count(db, Client) == 3
+
+    assert delete_appointments(db, [2, 3, 7]) == [2, 3]
+    assert count(db, Appointment) == 0
+    assert count(db, MedicalRecord) == 0
+    assert count(db, Animal) == 2
+    db.close()
+
+
+def test_delete_doctors_keeps_doctors_with_visits(session_factory):
+    db = session_factory()
+    assert delete_doctors(db, [1, 2, 5]) == ([2], [1])
+    assert count(db, Doctor) == 1
+    db.close()
+
+
+def test_bulk_delete_endpoints(session_factory):
+    def override_get_db():
+        with session_factory() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = override_get_db
+    try:
+        client = TestClient(app)
+        r = client.request("DELETE", "/doctors/", json=[1, 2, 5])
+        assert r.status_code == 200
+        assert r.json() == {"deleted": [2], "not_found": [5], "conflict": [1]}
+        r = client.request("DELETE", "/appointments/", json=[1, 8])
+        assert r.json() == {"deleted": [1], "not_found": [8], "conflict": []}
+        r = client.request("DELETE", "/animals/", json=[2])
+        assert r.json()["deleted"] == [2]
+        r = client.request("DELETE", "/users/", json=[1, 2, 3, 4])
+        assert r.json() == {"deleted": [1, 2, 3], "not_found": [4], "conflict": []}
+    finally:
+        app.dependency_overrides.clear()
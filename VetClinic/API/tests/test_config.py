@@ -50,3 +50,24 @@ def test_config_loads_env_and_defaults(monkeypatch):
     assert config.SMTP_FROM == "from@test.pl"
     assert config.DATABASE_URL.startswith("sqlite:///")
     assert config.DATABASE_URL.endswith("vetclinic.db")
+
+
+def test_config_database_from_env(monkeypatch):
+    unload_module()
+    monkeypatch.setattr(pathlib.Path, "exists", lambda self: True)
+    monkeypatch.setenv("DATABASE_URL", "postgresql+psycopg2://vet:pw@db:5432/vetclinic")
+    monkeypatch.setenv("DB_POOL_SIZE", "20")
+    monkeypatch.setenv("DB_MAX_OVERFLOW", "40")
+    monkeypatch.setenv("DB_POOL_PRE_PING", "false")
+    monkeypatch.setenv("DB_POOL_RECYCLE", "600")
+    monkeypatch.setenv("DB_STATEMENT_TIMEOUT_MS", "5000")
+    config = importlib.import_module(MODULE_PATH)
+    importlib.reload(config)
+
+    assert config.DATABASE_URL == "postgresql+psycopg2://vet:pw@db:5432/vetclinic"
+    assert config.DB_POOL_SIZE == 20
+    assert config.DB_MAX_OVERFLOW == 40
+    assert config.DB_POOL_PRE_PING is False
+    assert config.DB_POOL_RECYCLE == 600
+    assert config.DB_STATEMENT_TIMEOUT_MS == 5000
+    unload_module()
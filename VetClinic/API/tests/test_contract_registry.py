@@ -0,0 +1,101 @@
+from types import SimpleNamespace
+
+import pytest
+
+from vetclinic_api.core import contract_registry
+from vetclinic_api.core.contract_registry import (
+    ZERO_ADDRESS, ContractNotDeployedError, bootstrap, load_cache, registry_key, resolve_address,
+)
+
+MEDICAL = "0x" + "11" * 20
+REGISTRY = "0x" + "22" * 20
+
+
+class FakeEth:
+    """Minimalny węzeł: kod pod adresami, AddressRegistry i deploy kontraktów."""
+
+    def __init__(self, chain_id=1337):
+        self.chain_id = chain_id
+        self.code = {REGISTRY.lower(): b"\x60"}
+        self.registry = {}
+        self.deployed = []
+        self.accounts = ["0x" + "aa" * 20]
+
+    def get_code(self, address):
+        return self.code.get(address.lower(), b"")
+
+    def wait_for_transaction_receipt(self, tx):
+        return SimpleNamespace(contractAddress=tx)
+
+    def contract(self, address=None, abi=None, bytecode=None):
+        eth = self
+        if bytecode is not None:
+            def transact(_):
+                address = "0x" + f"{len(eth.deployed) + 0x33:02x}" * 20
+                eth.deployed.append(address)
+                eth.code[address] = b"\x60"
+                return address
+            return SimpleNamespace(constructor=lambda: SimpleNamespace(transact=transact))
+
+        def set_address(key, addr):
+            return SimpleNamespace(transact=lambda _: eth.registry.__setitem__(key, addr))
+
+        def get_address(key):
+            return SimpleNamespace(call=lambda: eth.registry.get(key, ZERO_ADDRESS))
+
+        return SimpleNamespace(functions=SimpleNamespace(setAddress=set_address, getAddress=get_address))
+
+
+@pytest.fixture
+def w3():
+    return SimpleNamespace(eth=FakeEth())
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return tmp_path / "addresses.json"
+
+
+def test_configured_address_wins(w3, cache):
+    assert resolve_address(w3, configured=MEDICAL, cache_path=cache).lower() == MEDICAL
+    assert not cache.exists()
+
+
+def test_registry_lookup_is_cached(w3, cache):
+    w3.eth.registry[registry_key("MedicalRecord")] = MEDICAL
+    w3.eth.code[MEDICAL] = b"\x60"
+    assert resolve_address(w3, registry_address=REGISTRY, cache_path=cache).lower() == MEDICAL
+    assert load_cache(cache) == {"1337": {"MedicalRecord": MEDICAL}}
+
+    # z pamięci podręcznej – bez rejestru
+    w3.eth.registry.clear()
+    assert resolve_address(w3, registry_address=None, cache_path=cache).lower() == MEDICAL
+
+
+def test_stale_cache_is_ignored(w3, cache):
+    w3.eth.code[MEDICAL] = b"\x60"
+    contract_registry.save_cached_address(1337, "MedicalRecord", MEDICAL, cache)
+    del w3.eth.code[MEDICAL]  # np. restart Ganache
+    with pytest.raises(ContractNotDeployedError):
+        resolve_address(w3, registry_address=None, cache_path=cache)
+
+
+def test_resolve_never_deploys(w3, cache):
+    with pytest.raises(ContractNotDeployedError, match="bootstrap"):
+        resolve_address(w3, registry_address=REGISTRY, cache_path=cache)
+    assert w3.eth.deployed == []
+
+
+def test_bootstrap_deploys_once_and_registers(w3, cache):
+    account = w3.eth.accounts[0]
+    address = bootstrap(w3, account, registry_address=REGISTRY, cache_path=cache)
+    assert w3.eth.deployed == [address]
+    assert w3.eth.registry[registry_key("MedicalRecord")] == address
+    assert load_cache(cache)["1337"]["MedicalRecord"] == address
+
+    assert bootstrap(w3, account, registry_address=REGISTRY, cache_path=cache) == address
+    assert len(w3.eth.deployed) == 1
+
+    redeployed = bootstrap(w3, account, redeploy=True, registry_address=REGISTRY, cache_path=cache)
+    assert redeployed != address and len(w3.eth.deployed) == 2
+    assert resolve_address(w3, registry_address=None, cache_path=cache) == redeployed
@@ -0,0 +1,67 @@
+import os
+import shutil
+import subprocess
+import sys
+
+from vetclinic_api.core import contracts
+from vetclinic_api.core.config import BASE_DIR
+from vetclinic_api.core.contracts import (
+    CONTRACTS_DIR, Artifact, artifact_path, find_artifact, source_hash, write_artifact,
+)
+
+
+def test_source_hash_ignores_line_endings():
+    assert source_hash("a\r\nb\r\n") == source_hash("a\nb\n")
+    assert source_hash("a\nb\n") != source_hash("a\nc\n")
+
+
+def test_shipped_artifact_matches_source():
+    artifact = find_artifact("MedicalRecord")
+    assert artifact is not None
+    assert artifact.bytecode
+    assert {e.get("name") for e in artifact.abi} >= {"addRecord", "getRecord", "getRecordsByOwner"}
+
+
+def test_changed_source_needs_new_artifact(tmp_path):
+    src_dir, build_dir = tmp_path / "contracts", tmp_path / "build"
+    src_dir.mkdir()
+    shutil.copy(CONTRACTS_DIR / "MedicalRecord.sol", src_dir)
+    source = (src_dir / "MedicalRecord.sol").read_text()
+    write_artifact(Artifact("MedicalRecord", [], "6080", source_hash(source)), build_dir)
+    assert find_artifact("MedicalRecord", src_dir, build_dir).bytecode == "6080"
+
+    changed = source + "\n// zmiana\n"
+    (src_dir / "MedicalRecord.sol").write_text(changed)
+    assert find_artifact("MedicalRecord", src_dir, build_dir) is None
+    write_artifact(Artifact("MedicalRecord", [], "6081", source_hash(changed)), build_dir)
+    assert find_artifact("MedicalRecord", src_dir, build_dir).bytecode == "6081"
+    # obie wersje leżą obok siebie
+    assert artifact_path("MedicalRecord", source_hash(source), build_dir).exists()
+
+
+def test_missing_artifact_compiled_once(monkeypatch):
+    calls = []
+    artifact = Artifact("MedicalRecord", [], "60", "x")
+    monkeypatch.setattr(contracts, "find_artifact", lambda name: None)
+    monkeypatch.setattr(contracts, "compile_contract", lambda name: calls.append(name) or artifact)
+    contracts.load_artifact.cache_clear()
+    try:
+        assert contracts.load_artifact("MedicalRecord") is artifact
+        assert contracts.load_artifact("MedicalRecord") is artifact
+    finally:
+        contracts.load_artifact.cache_clear()
+    assert calls == ["MedicalRecord"]
+
+
+def test_import_does_not_need_solc():
+    # solcx niedostępny: import CRUD i utworzenie providera nie mogą go wymagać
+    code = (
+        "import sys; sys.modules['solcx'] = None\n"
+        "import vetclinic_api.crud.appointments_crud, vetclinic_api.crud.medical_records\n"
+        "from vetclinic_api.core.blockchain import BlockchainProvider\n"
+        "assert BlockchainProvider()._abi\n"
+    )
+    env = {**os.environ, "PYTHONPATH": str(BASE_DIR)}
+    result = subprocess.run([sys.executable, "-c", code], cwd=BASE_DIR, env=env,
+                            capture_output=True, text=True, timeout=120)
+    assert result.returncode == 0, result.stderr
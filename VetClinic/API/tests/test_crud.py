@@ -28,6 +28,7 @@ import vetclinic_api.crud.invoice_crud as invoice_crud
 import vetclinic_api.crud.weight_log_crud as weight_log_crud
 import vetclinic_api.crud.blockchain_crud as blockchain_crud
 import vetclinic_api.crud.medical_records as medical_records
+from vetclinic_api.models.anchor_queue import AnchorJob
 
 
 # ─── fixtures ────────────────────────────────────────────────────────────────
@@ -253,9 +254,8 @@ def test_users_crud(db, monkeypatch):
 # ─── appointments_crud tests ──────────────────────────────────────────────────
 
 def test_appointments_crud(db, monkeypatch):
-    # stub invoice + blockchain
+    # stub invoice (zapis on-chain trafia do kolejki kotwiczenia)
     monkeypatch.setattr(appointments_crud, "create_invoice", lambda db,i: None)
-    monkeypatch.setattr(appointments_crud, "blockchain_add_record", lambda i,h: "0xTXX")
 
     now = datetime.utcnow()
     appt = appointments_crud.create_appointment(db, AppointmentCreate(
@@ -266,7 +266,10 @@ def test_appointments_crud(db, monkeypatch):
         doctor_id=7,         
         facility_id=3        
     ))
-    assert appt.tx_hash == "0xTXX"
+    # tx_hash uzupełni worker kotwiczenia; wizyta czeka w kolejce
+    assert appt.tx_hash is None
+    job = db.query(AnchorJob).filter_by(kind="appointment", record_id=appt.id).one()
+    assert job.op == "add" and job.status == "pending" and job.data_hash.startswith("0x")
 
     # get / list
     assert appointments_crud.get_appointment(db, appt.id).id == appt.id
@@ -365,10 +368,6 @@ def test_medical_records_crud(db, monkeypatch):
     # stub DB lookups
     monkeypatch.setattr(medical_records, "get_appointment", lambda db,i: True)
     monkeypatch.setattr(medical_records, "get_animal", lambda db,i: True)
-    # stub on‐chain CRUD
-    monkeypatch.setattr(medical_records.blockchain_crud, "add_record",    lambda i,h: "TX1")
-    monkeypatch.setattr(medical_records.blockchain_crud, "update_record", lambda i,h: "TX2")
-    monkeypatch.setattr(medical_records.blockchain_crud, "delete_record", lambda i:   "TX3")
     # stub provider.get
     class DummyC:
         def __init__(self): self.functions = self
@@ -385,7 +384,8 @@ def test_medical_records_crud(db, monkeypatch):
         diagnosis="Diag",
         treatment="Treat"
     ))
-    assert mr["blockchain_tx"] == "TX1"
+    # zapis on-chain w kolejce – bez czekania na blok
+    assert mr["blockchain_tx"] is None and mr["anchor_status"] == "pending"
     rid = mr["id"]
 
     # get / not found
@@ -399,9 +399,11 @@ def test_medical_records_crud(db, monkeypatch):
 
     # update
     upd = medical_records.update_medical_record(db, rid, MedicalRecordUpdate(description="New"))
-    assert upd["blockchain_tx"] == "TX2"
+    assert upd["data_hash"] != mr["data_hash"]
 
     # delete
-    assert medical_records.delete_medical_record(db, rid) == "TX3"
+    medical_records.delete_medical_record(db, rid)
+    ops = [j.op for j in db.query(AnchorJob).filter_by(kind="medical_record", record_id=rid).order_by(AnchorJob.id)]
+    assert ops == ["add", "update", "delete"]
     with pytest.raises(Exception):
         medical_records.get_medical_record(db, rid)
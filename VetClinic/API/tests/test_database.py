@@ -0,0 +1,143 @@
+# VetClinic/API/tests/test_database.py
+from sqlalchemy import inspect
+from sqlalchemy.pool import QueuePool
+
+import vetclinic_api.core.database as database
+from vetclinic_api.core.database import Base, build_engine, engine_options
+
+
+def test_engine_options_sqlite():
+    opts = engine_options("sqlite:///vetclinic.db")
+    assert opts == {"connect_args": {"check_same_thread": False}}
+
+
+def test_engine_options_postgresql(monkeypatch):
+    monkeypatch.setattr(database, "DB_POOL_SIZE", 15)
+    monkeypatch.setattr(database, "DB_MAX_OVERFLOW", 30)
+    monkeypatch.setattr(database, "DB_POOL_RECYCLE", 900)
+    monkeypatch.setattr(database, "DB_POOL_PRE_PING", True)
+    monkeypatch.setattr(database, "DB_STATEMENT_TIMEOUT_MS", 2500)
+
+    opts = engine_options("postgresql+psycopg2://vet:pw@localhost/vetclinic")
+    assert opts["pool_size"] == 15
+    assert opts["max_overflow"] == 30
+    assert opts["pool_recycle"] == 900
+    assert opts["pool_pre_ping"] is True
+    assert opts["connect_args"] == {"options": "-c statement_timeout=2500"}
+
+
+def test_engine_options_postgresql_without_timeout(monkeypatch):
+    monkeypatch.setattr(database, "DB_STATEMENT_TIMEOUT_MS", 0)
+    opts = engine_options("postgresql://vet:pw@localhost/vetclinic")
+    assert "connect_args" not in opts
+
+
+def test_build_engine_sqlite_file(tmp_path):
+    eng = build_engine(f"sqlite:///{tmp_path / 'clinic.db'}")
+    assert isinstance(eng.pool, QueuePool)
+    Base.metadata.create_all(bind=eng)
+    tables = set(inspect(eng).get_table_names())
+    assert {"clients", "doctors", "animals", "appointments", "medical_records"} <= tables
+    eng.dispose()
+
+
+# ─── profil SQLite ───────────────────────────────────────────────────────────
+
+import threading
+import pytest
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+
+from vetclinic_api.core.sqlite import SerializedWriter, WriteQueueTimeout
+from vetclinic_api.models.facility import Facility
+
+
+@pytest.fixture
+def profiled_engine(tmp_path):
+    eng = build_engine(f"sqlite:///{tmp_path / 'profile.db'}", sqlite_profile=True)
+    Base.metadata.create_all(bind=eng)
+    yield eng
+    eng.dispose()
+
+
+def test_sqlite_profile_pragmas(profiled_engine):
+    with profiled_engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+        assert conn.execute(text("PRAGMA foreign_keys")).scalar() == 1
+        assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 5000
+        assert conn.execute(text("PRAGMA cache_size")).scalar() == -64000
+
+
+def test_sqlite_without_profile_keeps_defaults(tmp_path):
+    eng = build_engine(f"sqlite:///{tmp_path / 'plain.db'}", sqlite_profile=False)
+    with eng.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "delete"
+        assert conn.execute(text("PRAGMA foreign_keys")).scalar() == 0
+    eng.dispose()
+
+
+def test_serialized_writer_queues_concurrent_writes(profiled_engine):
+    Session = sessionmaker(bind=profiled_engine)
+    writer = SerializedWriter(timeout=10)
+    writer.install(Session)
+    errors = []
+
+    def worker(n):
+        for i in range(20):
+            db = Session()
+            try:
+                db.add(Facility(name=f"F{n}-{i}", address="ul. Testowa 1"))
+                db.commit()
+            except Exception as exc:  # pragma: no cover - tylko diagnostyka
+                errors.append(exc)
+            finally:
+                db.close()
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    db = Session()
+    assert db.query(Facility).count() == 160
+    db.close()
+
+
+def test_serialized_writer_releases_on_rollback_and_times_out(profiled_engine):
+    Session = sessionmaker(bind=profiled_engine)
+    writer = SerializedWriter(timeout=0.1)
+    writer.install(Session)
+
+    holder = Session()
+    holder.add(Facility(name="A", address="B"))
+    holder.flush()  # trzyma slot do końca transakcji
+
+    other = Session()
+    other.add(Facility(name="C", address="D"))
+    with pytest.raises(WriteQueueTimeout):
+        other.flush()
+    other.close()
+
+    holder.close()  # rollback zwalnia slot
+    bulk = Session()
+    bulk.query(Facility).delete()  # masowy DELETE też przechodzi przez kolejkę
+    bulk.commit()
+    bulk.close()
+
+
+# ─── silnik asynchroniczny ───────────────────────────────────────────────────
+
+from vetclinic_api.core.database import async_url
+
+
+def test_async_url_drivers():
+    assert async_url("sqlite:///vetclinic.db") == "sqlite+aiosqlite:///vetclinic.db"
+    assert (
+        async_url("postgresql+psycopg2://vet:pw@db:5432/vetclinic")
+        == "postgresql+asyncpg://vet:pw@db:5432/vetclinic"
+    )
+    with pytest.raises(ValueError):
+        async_url("oracle://scott:tiger@db/xe")
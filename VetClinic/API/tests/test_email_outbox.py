@@ -0,0 +1,199 @@
+import asyncio
+import datetime
+import email
+import smtplib
+import socket
+import threading
+
+import pytest
+
+from vetclinic_api.crud import users_crud
+from vetclinic_api.models.email_outbox import EmailOutbox
+from vetclinic_api.schemas.users import ClientCreate
+from vetclinic_api.services.email_service import (
+    REDACTED_BODY, EmailService, OutboxSender, SMTPConnection, build_message,
+)
+
+aiosmtpd = pytest.importorskip("aiosmtpd.controller")
+
+
+class Inbox:
+    """Handler aiosmtpd: zapamiętuje wiadomości i liczbę sesji SMTP."""
+
+    def __init__(self):
+        self.messages = []
+        self.sessions = 0
+
+    async def handle_EHLO(self, server, session, envelope, hostname, responses):
+        self.sessions += 1
+        session.host_name = hostname
+        return responses
+
+    async def handle_DATA(self, server, session, envelope):
+        body = email.message_from_bytes(envelope.content).get_payload(decode=True).decode()
+        self.messages.append((envelope.rcpt_tos, body))
+        return "250 OK"
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@pytest.fixture
+def smtp_server():
+    inbox = Inbox()
+    controller = aiosmtpd.Controller(inbox, hostname="127.0.0.1", port=_free_port())
+    controller.start()
+    yield inbox, controller.port
+    controller.stop()
+
+
+def _queue(session_factory, n):
+    with session_factory() as db:
+        for i in range(n):
+            EmailService.queue_temporary_password(db, f"u{i}@x.pl", f"haslo{i}")
+        db.commit()
+
+
+def test_batch_sent_over_one_connection(smtp_server, session_factory):
+    inbox, port = smtp_server
+    _queue(session_factory, 5)
+    conn = SMTPConnection(host="127.0.0.1", port=port, security="none", user=None)
+    sender = OutboxSender(session_factory, conn, batch_size=2)
+
+    assert sender.drain() == 5
+    conn.close()
+    assert inbox.sessions == 1
+    assert sorted(m[0][0] for m in inbox.messages) == [f"u{i}@x.pl" for i in range(5)]
+    assert "haslo3" in "".join(m[1] for m in inbox.messages)
+    with session_factory() as db:
+        rows = db.query(EmailOutbox).all()
+        assert {r.status for r in rows} == {"sent"}
+        assert all(r.locked_by is None and r.sent_at for r in rows)
+        # wysłane wiadomości nie przechowują już tymczasowych haseł
+        assert {r.body for r in rows} == {REDACTED_BODY}
+    # nic do wysłania – drugi przebieg nie pobiera niczego
+    assert sender.process_batch() == 0
+
+
+def test_failed_send_backs_off_then_gives_up(session_factory):
+    _queue(session_factory, 1)
+    conn = SMTPConnection(host="127.0.0.1", port=_free_port(), security="none", user=None, timeout=1)
+    sender = OutboxSender(session_factory, conn, max_attempts=3, retry_base=10, retry_max=15)
+
+    assert sender.process_batch() == 1
+    with session_factory() as db:
+        row = db.query(EmailOutbox).one()
+        assert (row.status, row.attempts) == ("pending", 1)
+        assert "haslo0" in row.body  # potrzebne do ponowienia
+        assert row.last_error.startswith("ConnectionRefusedError")
+        assert row.next_attempt_at > datetime.datetime.utcnow() + datetime.timedelta(seconds=5)
+    # przed terminem kolejnej próby wiadomość nie jest pobierana
+    assert sender.process_batch() == 0
+    assert [sender.backoff(a) for a in (1, 2, 3)] == [10, 15, 15]
+
+    for attempts in (2, 3):
+        with session_factory() as db:
+            db.query(EmailOutbox).update({"next_attempt_at": datetime.datetime(2000, 1, 1)})
+            db.commit()
+        assert sender.process_batch() == 1
+    with session_factory() as db:
+        row = db.query(EmailOutbox).one()
+        assert (row.status, row.attempts) == ("failed", 3)
+        assert row.body == REDACTED_BODY
+
+
+def test_claimed_batch_skipped_by_other_sender(session_factory):
+    _queue(session_factory, 3)
+    first = OutboxSender(session_factory, SMTPConnection(host="127.0.0.1", port=1))
+    with session_factory() as db:
+        assert len(first._claim(db, datetime.datetime.utcnow())) == 3
+    # druga instancja (np. inny worker) nie widzi zarezerwowanych wiadomości
+    assert OutboxSender(session_factory).process_batch() == 0
+
+
+def test_reconnects_after_server_disconnect(smtp_server):
+    inbox, port = smtp_server
+    conn = SMTPConnection(host="127.0.0.1", port=port, security="none", user=None)
+    conn.send(build_message("a@x.pl", "T", "1"))
+    # połączenie zerwane po stronie klienta/serwera – kolejna wysyłka łączy się ponownie
+    conn._smtp.close()
+    conn.send(build_message("b@x.pl", "T", "2"))
+    conn.close()
+    assert conn.connects == 2
+    assert len(inbox.messages) == 2
+
+
+def test_create_client_only_queues(session_factory, monkeypatch):
+    def no_smtp(*a, **k):
+        raise AssertionError("rejestracja nie powinna łączyć się z SMTP")
+    monkeypatch.setattr(smtplib, "SMTP", no_smtp)
+    monkeypatch.setattr(smtplib, "SMTP_SSL", no_smtp)
+    monkeypatch.setattr(users_crud, "get_password_hash", lambda p: "hash")
+
+    with session_factory() as db:
+        client = users_crud.create_client(db, ClientCreate(
+            first_name="Jan", last_name="K", email="jan@x.pl", password="x", role="klient",
+            phone_number="+48123456789", address="ul. A 1", postal_code="00-001 Warszawa",
+            wallet_address="0x1",
+        ))
+        row = db.query(EmailOutbox).one()
+        assert client.id is not None
+        assert (row.to_address, row.status) == ("jan@x.pl", "pending")
+
+
+def test_run_loop_sends_in_background(smtp_server, session_factory):
+    inbox, port = smtp_server
+    _queue(session_factory, 2)
+    conn = SMTPConnection(host="127.0.0.1", port=port, security="none", user=None)
+    sender = OutboxSender(session_factory, conn)
+
+    async def run_briefly():
+        task = asyncio.create_task(sender.run(interval=0.01))
+        for _ in range(200):
+            if len(inbox.messages) == 2:
+                break
+            await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(run_briefly())
+    assert len(inbox.messages) == 2
+    # anulowanie zadania zamyka połączenie
+    assert conn._smtp is None
+
+
+def test_cancel_waits_for_batch_before_closing_connection(session_factory):
+    _queue(session_factory, 3)
+    events = []
+    sending, release = threading.Event(), threading.Event()
+
+    class SlowConnection(SMTPConnection):
+        def send(self, msg):
+            sending.set()
+            release.wait(5)
+            events.append(("send", msg["To"]))
+
+        def close(self):
+            events.append(("close",))
+
+    sender = OutboxSender(session_factory, SlowConnection(), batch_size=1)
+
+    async def cancel_mid_send():
+        task = asyncio.create_task(sender.run(interval=0.01))
+        await asyncio.to_thread(sending.wait, 5)
+        task.cancel()
+        await asyncio.sleep(0.05)
+        assert events == []  # połączenie nie jest zamykane w trakcie wysyłki
+        release.set()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancel_mid_send())
+    # bieżąca partia dokończona, kolejne już nie pobierane, potem zamknięcie
+    assert events == [("send", "u0@x.pl"), ("close",)]
+    with session_factory() as db:
+        assert [r.status for r in db.query(EmailOutbox).order_by(EmailOutbox.id)] == ["sent", "pending", "pending"]
@@ -0,0 +1,38 @@
+# VetClinic/API/tests/test_encoding.py
+from datetime import datetime
+from decimal import Decimal
+
+import msgpack
+import orjson
+import pytest
+from starlette.requests import Request
+
+from vetclinic_api.core.encoding import JSON, MSGPACK, NDJSON, dumps, negotiate
+
+
+def make_request(accept=None):
+    headers = [(b"accept", accept.encode())] if accept is not None else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+@pytest.mark.parametrize("accept, expected", [
+    (None, JSON),
+    ("*/*", JSON),
+    ("application/msgpack", MSGPACK),
+    ("application/json;q=0.5, application/msgpack", MSGPACK),
+    ("application/msgpack;q=0.2, application/json", JSON),
+    ("application/x-ndjson", NDJSON),
+    ("text/html", JSON),  # nieobsługiwany typ -> domyślny JSON
+])
+def test_negotiate(accept, expected):
+    assert negotiate(make_request(accept), (JSON, MSGPACK, NDJSON)) == expected
+
+
+def test_negotiate_ndjson_only_where_offered():
+    assert negotiate(make_request("application/x-ndjson")) == JSON
+
+
+def test_dumps_handles_dates_and_decimals():
+    data = [{"at": datetime(2024, 7, 1, 9, 0), "amount": Decimal("100.00")}]
+    assert orjson.loads(dumps(data)) == [{"at": "2024-07-01T09:00:00", "amount": "100.00"}]
+    assert msgpack.unpackb(dumps(data, MSGPACK)) == [{"at": "2024-07-01T09:00:00", "amount": "100.00"}]
@@ -0,0 +1,93 @@
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi.testclient import TestClient
+
+from vetclinic_api.core import hashing
+from vetclinic_api.core.hashing import HashingOverloaded, PasswordHasher
+from vetclinic_api.main import app
+from vetclinic_api.routers import users
+
+client = TestClient(app)
+
+
+def test_inline_roundtrip_and_metrics():
+    h = PasswordHasher(workers=0, queue_limit=0)
+    hashed = h.hash("Sekret123!")
+    assert h.verify("Sekret123!", hashed)
+    assert not h.verify("zle", hashed)
+    m = h.metrics()
+    assert m["completed"] == 3 and m["in_flight"] == 0 and m["rejected"] == 0
+    assert m["capacity"] == 1
+
+
+def test_rejects_when_full():
+    h = PasswordHasher(workers=0, queue_limit=0)
+    entered, release = threading.Event(), threading.Event()
+
+    def slow(*_):
+        entered.set()
+        release.wait(5)
+        return True
+
+    t = threading.Thread(target=h._run, args=(slow,))
+    t.start()
+    assert entered.wait(5)
+    # jedyny slot zajęty -> natychmiastowa odmowa, bez czekania
+    with pytest.raises(HashingOverloaded):
+        h.verify("a", "b")
+    release.set()
+    t.join()
+    assert h.metrics()["rejected"] == 1
+    # po zwolnieniu slotu znów przyjmuje
+    assert h._run(lambda: True)
+
+
+def test_process_pool_roundtrip():
+    h = PasswordHasher(workers=1, queue_limit=2)
+    try:
+        hashed = h.hash("Sekret123!")
+        assert h.verify("Sekret123!", hashed)
+        assert hashing.pwd_context.verify("Sekret123!", hashed)
+    finally:
+        h.shutdown()
+    assert h.metrics()["completed"] == 2
+
+
+def test_pool_recovers_after_worker_dies():
+    h = PasswordHasher(workers=1, queue_limit=2)
+    try:
+        hashed = h.hash("Sekret123!")
+        # proces puli zabity (np. OOM) – pula trwale uszkodzona
+        for proc in list(h._executor._processes.values()):
+            proc.kill()
+            proc.join(5)
+        assert h.verify("Sekret123!", hashed)
+        assert h.hash("inne")
+    finally:
+        h.shutdown()
+    m = h.metrics()
+    assert m["completed"] == 3 and m["failed"] == 1 and m["in_flight"] == 0
+
+
+def test_login_overloaded_returns_503(monkeypatch):
+    user = MagicMock()
+    user.locked_until = None
+
+    def overloaded(p, h):
+        raise HashingOverloaded("pełno")
+
+    monkeypatch.setattr(users, "get_user_by_email", lambda db, email: user)
+    monkeypatch.setattr(users, "verify_password", overloaded)
+    r = client.post("/users/login", json={"email": "a@b.com", "password": "pass"})
+    assert r.status_code == 503
+    assert r.headers["retry-after"] == "1"
+
+
+def test_hashing_metrics_endpoint(monkeypatch):
+    monkeypatch.setattr(hashing, "hasher", PasswordHasher(workers=0, queue_limit=3))
+    hashing.hash_password("x")
+    r = client.get("/metrics/hashing")
+    assert r.status_code == 200
+    assert r.json()["completed"] == 1 and r.json()["capacity"] == 4
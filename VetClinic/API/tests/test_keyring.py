@@ -0,0 +1,176 @@
+import datetime
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+import jwt
+import pyotp
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+import vetclinic_api.core.security as sec
+from vetclinic_api.core import config, hashing
+from vetclinic_api.core.database import Base, build_engine
+from vetclinic_api.core.keyring import KeyRing, SigningKey, load_keyring
+from vetclinic_api.models.facility import Facility
+from vetclinic_api.models.users import Doctor
+
+UTC = datetime.timezone.utc
+T0 = datetime.datetime(2025, 6, 1, tzinfo=UTC)
+API_DIR = Path(__file__).resolve().parent.parent
+
+# Rotacja: "new" podpisuje od T0, "old" weryfikuje jeszcze 2 h (zakładka)
+ROTATION = [
+    {"kid": "old", "secret": "s-old", "not_after": "2025-06-01T02:00:00Z"},
+    {"kid": "new", "secret": "s-new", "not_before": "2025-06-01T00:00:00Z"},
+]
+
+
+def test_signing_key_follows_rotation_window():
+    ring = KeyRing.from_json(json.dumps(ROTATION))
+    hour = datetime.timedelta(hours=1)
+    assert ring.signing_key(T0 - hour).kid == "old"
+    assert ring.signing_key(T0).kid == "new"
+    # zakładka: oba klucze weryfikują, po not_after stary już nie
+    assert ring.verification_key("old", T0 + hour).kid == "old"
+    assert ring.verification_key("old", T0 + 2 * hour) is None
+    # nowy klucz weryfikuje także przed not_before (przesunięte zegary)
+    assert ring.verification_key("new", T0 - hour).kid == "new"
+    assert ring.verification_key("brak", T0) is None
+    assert ring.verification_key(None, T0) is None
+
+
+def test_keyring_rejects_bad_config():
+    with pytest.raises(ValueError):
+        KeyRing([])
+    with pytest.raises(ValueError):
+        KeyRing([SigningKey("a", "x"), SigningKey("a", "y")])
+    with pytest.raises(RuntimeError):
+        KeyRing([SigningKey("a", "x", not_after=T0)]).signing_key(T0)
+
+
+def test_load_keyring_sources(monkeypatch, tmp_path):
+    monkeypatch.setattr(config, "JWT_KEYS_FILE", None)
+    monkeypatch.setattr(config, "JWT_KEYS", None)
+    monkeypatch.setattr(config, "SECRET_KEY", "wspolny")
+    ring = load_keyring()
+    assert list(ring.keys) == ["default"] and ring.keys["default"].secret == "wspolny"
+
+    monkeypatch.setattr(config, "JWT_KEYS", json.dumps(ROTATION))
+    assert set(load_keyring().keys) == {"old", "new"}
+
+    path = tmp_path / "keys.json"
+    path.write_text(json.dumps({"keys": [{"kid": "plik", "secret": "s"}]}))
+    monkeypatch.setattr(config, "JWT_KEYS_FILE", str(path))
+    assert list(load_keyring().keys) == ["plik"]
+
+
+def test_unconfigured_keyring_never_uses_default_secret(monkeypatch):
+    monkeypatch.setattr(config, "JWT_KEYS_FILE", None)
+    monkeypatch.setattr(config, "JWT_KEYS", None)
+    monkeypatch.setattr(config, "SECRET_KEY", config.DEFAULT_SECRET_KEY)
+    first, second = load_keyring(), load_keyring()
+    assert first.signing_key().secret != config.DEFAULT_SECRET_KEY
+    # losowy klucz na proces – token podpisany domyślnym sekretem nie przechodzi
+    assert first.signing_key().secret != second.signing_key().secret
+    monkeypatch.setattr(sec, "keyring", first)
+    exp = datetime.datetime.now(UTC) + datetime.timedelta(minutes=5)
+    forged = jwt.encode({"user_id": 1, "exp": exp}, config.DEFAULT_SECRET_KEY, algorithm=sec.ALGORITHM,
+                        headers={"kid": "default"})
+    with pytest.raises(jwt.InvalidSignatureError):
+        sec.decode_access_token(forged)
+
+
+def test_decode_access_token_with_rotated_keys(monkeypatch):
+    old = SigningKey("old", "s-old")
+    monkeypatch.setattr(sec, "keyring", KeyRing([old]))
+    token = sec.create_access_token({"user_id": 1})
+
+    # po rotacji stary token nadal przechodzi, ale tylko do not_after klucza
+    retire = datetime.datetime.now(UTC) + datetime.timedelta(minutes=10)
+    new = SigningKey("new", "s-new", not_before=datetime.datetime.now(UTC))
+    monkeypatch.setattr(sec, "keyring", KeyRing([SigningKey("old", "s-old", not_after=retire), new]))
+    claims, valid_until = sec.decode_access_token(token)
+    assert claims["user_id"] == 1
+    assert valid_until == retire.timestamp()
+    assert jwt.get_unverified_header(sec.create_access_token({"user_id": 1}))["kid"] == "new"
+
+    # klucz usunięty z konfiguracji -> token odrzucony
+    monkeypatch.setattr(sec, "keyring", KeyRing([new]))
+    with pytest.raises(jwt.InvalidTokenError):
+        sec.decode_access_token(token)
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _start_api(env: dict) -> tuple[subprocess.Popen, str]:
+    port = _free_port()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "vetclinic_api.main:app", "--port", str(port)],
+        cwd=API_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            pytest.fail("Serwer API nie wystartował")
+        try:
+            httpx.get(f"{url}/openapi.json", timeout=1)
+            return proc, url
+        except httpx.TransportError:
+            time.sleep(0.2)
+    proc.kill()
+    pytest.fail("Serwer API nie odpowiada")
+
+
+def test_token_from_one_process_works_on_another(tmp_path):
+    """Logowanie na jednym procesie API, wywołanie endpointu na drugim."""
+    db_url = f"sqlite:///{tmp_path / 'multi.db'}"
+    engine = build_engine(db_url)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    facility = Facility(name="F", address="ul. Testowa 1")
+    db.add(facility)
+    db.flush()
+    secret = pyotp.random_base32()
+    db.add(Doctor(first_name="Jan", last_name="Nowak", email="jan@lekarz.pl", backup_email="b@x.pl",
+                  password_hash=hashing.pwd_context.hash("Haslo123!"), specialization="chirurg",
+                  permit_number="12345", facility_id=facility.id, totp_secret=secret,
+                  totp_confirmed=True))
+    db.commit()
+    db.close()
+    engine.dispose()
+
+    env = {
+        **os.environ,
+        "DATABASE_URL": db_url,
+        "SCHEMA_CHECK": "skip",
+        "PASSWORD_HASH_WORKERS": "0",
+        "JWT_KEYS": json.dumps([{"kid": "k1", "secret": "wspolny-sekret-testowy"}]),
+        "PYTHONPATH": os.pathsep.join([str(API_DIR), os.environ.get("PYTHONPATH", "")]),
+    }
+    servers = [_start_api(env), _start_api(env)]
+    try:
+        (_, url_a), (_, url_b) = servers
+        r = httpx.post(f"{url_a}/users/login", json={
+            "email": "jan@lekarz.pl", "password": "Haslo123!", "totp_code": pyotp.TOTP(secret).now(),
+        })
+        assert r.status_code == 200, r.text
+        token = r.json()["access_token"]
+
+        r = httpx.get(f"{url_b}/users/me", headers={"Authorization": f"Bearer {token}"})
+        assert r.status_code == 200, r.text
+        assert r.json()["email"] == "jan@lekarz.pl" and r.json()["role"] == "lekarz"
+    finally:
+        for proc, _ in servers:
+            proc.terminate()
+            proc.wait(10)
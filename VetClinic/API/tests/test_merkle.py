@@ -0,0 +1,40 @@
+import pytest
+
+from vetclinic_api.core.merkle import build_levels, leaf_hash, node_hash, proof, root, verify
+
+
+def leaves(n):
+    return [leaf_hash("medical_record", "add", i, f"{i:064x}") for i in range(n)]
+
+
+def test_single_leaf_is_root():
+    levels = build_levels(leaves(1))
+    assert root(levels) == levels[0][0]
+    assert proof(levels, 0) == []
+
+
+@pytest.mark.parametrize("n", [2, 3, 4, 5, 7, 8, 13, 64, 100])
+def test_every_proof_verifies(n):
+    items = leaves(n)
+    levels = build_levels(items)
+    top = root(levels)
+    for i, leaf in enumerate(items):
+        path = proof(levels, i)
+        assert len(path) <= (n - 1).bit_length()
+        assert verify(leaf, path, top)
+        # zmieniony hash rekordu nie przechodzi weryfikacji
+        assert not verify(leaf_hash("medical_record", "add", i, "f" * 64), path, top)
+
+
+def test_leaf_fields_and_order_matter():
+    assert leaf_hash("appointment", "add", 1, "h") != leaf_hash("medical_record", "add", 1, "h")
+    assert leaf_hash("medical_record", "add", 1, "h") != leaf_hash("medical_record", "update", 1, "h")
+    a, b = leaves(2)
+    # pary sortowane – dowód nie zależy od strony, liść nie udaje węzła
+    assert node_hash(a, b) == node_hash(b, a)
+    assert root(build_levels([a, b])) != leaf_hash("medical_record", "add", 0, a.hex())
+
+
+def test_empty_batch_rejected():
+    with pytest.raises(ValueError):
+        build_levels([])
@@ -0,0 +1,51 @@
+# VetClinic/API/tests/test_pagination.py
+from datetime import datetime
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import sessionmaker
+
+from vetclinic_api.core.database import Base, build_engine
+from vetclinic_api.core.pagination import InvalidCursor, decode_cursor, encode_cursor, keyset
+from vetclinic_api.crud import appointments_crud, facility_crud
+from vetclinic_api.models.facility import Facility
+
+
+def test_cursor_roundtrip_with_datetime():
+    key = appointments_crud.PAGE_KEY
+    token = encode_cursor([datetime(2025, 3, 1, 9, 30), 42])
+    assert "=" not in token
+    assert decode_cursor(token, key) == (datetime(2025, 3, 1, 9, 30), 42)
+
+
+@pytest.mark.parametrize("token", [
+    "%%%",
+    encode_cursor([1, 2]),               # zła liczba kolumn
+    encode_cursor(["2025-03-01", "x"]),  # zły typ id
+    encode_cursor(["nie-data", 1]),
+])
+def test_decode_cursor_rejects_invalid(token):
+    with pytest.raises(InvalidCursor):
+        decode_cursor(token, appointments_crud.PAGE_KEY)
+
+
+def test_keyset_walks_all_rows_without_offset(tmp_path):
+    eng = build_engine(f"sqlite:///{tmp_path / 'page.db'}")
+    Base.metadata.create_all(bind=eng)
+    db = sessionmaker(bind=eng)()
+    db.add_all([Facility(name=f"F{i}", address="ul. A 1") for i in range(7)])
+    db.commit()
+
+    seen, after = [], None
+    while True:
+        page = facility_crud.get_facilities(db, limit=3, after=after)
+        if not page:
+            break
+        seen += [f.name for f in page]
+        after = decode_cursor(encode_cursor([page[-1].id]), facility_crud.PAGE_KEY)
+
+    assert seen == [f"F{i}" for i in range(7)]
+    stmt = keyset(select(Facility), facility_crud.PAGE_KEY, after=(3,), skip=10, limit=2)
+    assert "OFFSET" not in str(stmt)  # kursor ma pierwszeństwo przed skip
+    db.close()
+    eng.dispose()
@@ -0,0 +1,142 @@
+# VetClinic/API/tests/test_query_plans.py
+"""
+Regresja planów zapytań: każde gorące zapytanie z crud/*.py i serwisów GUI
+musi korzystać z indeksu (SEARCH), a nie z pełnego skanu tabeli.
+
+Domyślnie sprawdzamy SQLite (kopia vetclinic.db po migracjach oraz świeży
+bootstrap z modeli). Ustawienie TEST_POSTGRES_URL (pusta baza) dodaje
+PostgreSQL – tam EXPLAIN przy enable_seqscan=off nie może zawierać Seq Scan.
+"""
+import os
+import shutil
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import delete, inspect, select, text
+
+from vetclinic_api.core.config import BASE_DIR
+from vetclinic_api.core.database import Base, build_engine
+from vetclinic_api.core.schema import bootstrap_schema
+from vetclinic_api.core.security import USER_BY_EMAIL
+from vetclinic_api.core.unique_email import taken_emails_stmt
+from vetclinic_api.crud.appointments_crud import _doctor_visit_times_stmt, appointments_stmt
+from vetclinic_api.models.animals import Animal
+from vetclinic_api.models.appointments import Appointment
+from vetclinic_api.models.invoice import Invoice
+from vetclinic_api.models.medical_records import MedicalRecord
+from vetclinic_api.models.users import Doctor
+from vetclinic_api.models.weight_logs import WeightLog
+
+FROM = datetime(2025, 1, 1)
+TO = datetime(2025, 12, 31)
+
+HOT_QUERIES = {
+    "wizyty klienta": select(Appointment).where(Appointment.owner_id == 1),
+    "historia wizyt zwierzęcia": (
+        select(Appointment)
+        .where(Appointment.animal_id == 1)
+        .order_by(Appointment.visit_datetime)
+    ),
+    "wolne terminy lekarza": _doctor_visit_times_stmt(1, date(2025, 6, 30)),
+    "dokumentacja wizyty": select(MedicalRecord).where(MedicalRecord.appointment_id == 1),
+    "dokumentacja zwierzęcia": select(MedicalRecord).where(MedicalRecord.animal_id == 1),
+    "wykres wagi": (
+        select(WeightLog)
+        .where(WeightLog.animal_id == 1, WeightLog.recorded_at.between(FROM, TO))
+        .order_by(WeightLog.recorded_at)
+    ),
+    "zwierzęta klienta": select(Animal).where(Animal.owner_id == 1),
+    "faktury klienta": select(Invoice).where(Invoice.client_id == 1),
+    "faktury klienta wg statusu": select(Invoice).where(
+        Invoice.client_id == 1, Invoice.status == "pending"
+    ),
+    # users_crud.delete_client
+    "usuwanie dokumentacji klienta": delete(MedicalRecord).where(
+        MedicalRecord.appointment_id.in_(
+            select(Appointment.id).where(Appointment.owner_id == 1)
+        )
+    ),
+    "usuwanie zwierząt klienta": delete(Animal).where(Animal.owner_id == 1),
+    # paginacja kursorowa listy wizyt (visit_datetime, id)
+    "strona wizyt za kursorem": appointments_stmt(0, 101, (FROM, 5)),
+    # filtry list (?doctor_id=&facility_id=&from=&to=)
+    "wizyty lekarza w zakresie": appointments_stmt(doctor_id=1, date_from=FROM, date_to=TO),
+    "wizyty placówki w zakresie": appointments_stmt(facility_id=1, date_from=FROM, date_to=TO),
+    "wizyty zwierzęcia": appointments_stmt(animal_id=1, priority="pilna"),
+    # core.security.get_user_by_email (logowanie, zmiana hasła, TOTP)
+    "użytkownik po e-mailu": USER_BY_EMAIL.params(email="jan@x.pl"),
+    # core.unique_email – zajęte adresy przy zakładaniu lekarza/konsultanta
+    "zajęte adresy lekarzy": taken_emails_stmt(Doctor.email, "j", "kowalski", "lekarz.vetclinic.com"),
+}
+
+
+def _sqlite_migrated(tmp_path):
+    # Kopia bazy projektu podniesiona migracjami do head
+    path = tmp_path / "migrated.db"
+    shutil.copy(BASE_DIR / "vetclinic.db", path)
+    return build_engine(f"sqlite:///{path}")
+
+
+def _sqlite_fresh(tmp_path):
+    return build_engine(f"sqlite:///{tmp_path / 'fresh.db'}")
+
+
+def _postgres(tmp_path):
+    url = os.getenv("TEST_POSTGRES_URL")
+    if not url:
+        pytest.skip("TEST_POSTGRES_URL nie ustawione")
+    return build_engine(url)
+
+
+@pytest.fixture(params=[_sqlite_migrated, _sqlite_fresh, _postgres],
+                ids=["sqlite-migrated", "sqlite-fresh", "postgresql"])
+def plan_engine(request, tmp_path):
+    eng = request.param(tmp_path)
+    bootstrap_schema(eng)
+    yield eng
+    eng.dispose()
+
+
+def full_scans(conn, stmt) -> list[str]:
+    """Zwraca kroki planu, które czytają całą tabelę."""
+    compiled = stmt.compile(dialect=conn.dialect)
+    if conn.dialect.name == "sqlite":
+        params = tuple(compiled.params[k] for k in compiled.positiontup)
+        rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", params).all()
+        # "SCAN tabela" bez indeksu; "SEARCH ... USING INDEX" jest w porządku.
+        # Skany podzapytań (np. jednowierszowego probe) nie czytają tabel.
+        return [
+            r[-1] for r in rows
+            if r[-1].startswith("SCAN ") and "INDEX" not in r[-1]
+            and r[-1].split()[1] in Base.metadata.tables
+        ]
+
+    conn.execute(text("SET LOCAL enable_seqscan = off"))
+    rows = conn.execute(text(f"EXPLAIN {compiled}"), compiled.params).all()
+    return [r[0] for r in rows if "Seq Scan" in r[0]]
+
+
+@pytest.mark.parametrize("name", list(HOT_QUERIES))
+def test_hot_query_uses_index(plan_engine, name):
+    with plan_engine.begin() as conn:
+        assert full_scans(conn, HOT_QUERIES[name]) == [], name
+
+
+def test_migration_matches_model_indexes(tmp_path):
+    migrated = _sqlite_migrated(tmp_path)
+    fresh = _sqlite_fresh(tmp_path)
+    bootstrap_schema(migrated)
+    bootstrap_schema(fresh)
+
+    def index_set(eng):
+        insp = inspect(eng)
+        return {
+            (table, ix["name"], tuple(ix["column_names"]))
+            for table in Base.metadata.tables
+            for ix in insp.get_indexes(table)
+        }
+
+    assert index_set(fresh) <= index_set(migrated)
+    assert not any(name == "ix_invoices_client_id" for _, name, _ in index_set(migrated))
+    migrated.dispose()
+    fresh.dispose()
@@ -0,0 +1,108 @@
+import threading
+
+import anyio
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from vetclinic_api.core import throttle
+from vetclinic_api.core.ratelimit import (
+    DEFAULT_GROUPS, MemoryBackend, RateLimitMiddleware, RouteGroup, SQLiteBackend, configured_groups,
+)
+from vetclinic_api.main import app
+from vetclinic_api.routers import users
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def take(backend, key="g:ip", rate=1.0, burst=2):
+    return anyio.run(backend.take, key, rate, burst)
+
+
+@pytest.mark.parametrize("backend_cls", [MemoryBackend, SQLiteBackend])
+def test_token_bucket_burst_and_refill(backend_cls, tmp_path):
+    clock = FakeClock()
+    backend = (SQLiteBackend(str(tmp_path / "rl.db"), clock=clock)
+               if backend_cls is SQLiteBackend else MemoryBackend(clock=clock))
+    assert take(backend) == 0
+    assert take(backend) == 0
+    assert take(backend) == pytest.approx(1.0)  # pusty kubełek: żeton za 1 s
+    assert take(backend, key="g:inny") == 0  # inny klient ma własny budżet
+    clock.now += 0.5
+    assert take(backend) == pytest.approx(0.5)
+    clock.now += 0.5
+    assert take(backend) == 0
+
+
+def test_sqlite_budget_shared_between_workers(tmp_path):
+    path = str(tmp_path / "rl.db")
+    workers = [SQLiteBackend(path) for _ in range(4)]
+    granted = []
+
+    def run(backend):
+        for _ in range(10):
+            granted.append(backend.take_sync("login:1.2.3.4", 0.001, 15) == 0)
+
+    threads = [threading.Thread(target=run, args=(b,)) for b in workers]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    # 40 prób z czterech "procesów", jeden wspólny budżet 15 żetonów
+    assert sum(granted) == 15
+
+
+def test_memory_backend_is_bounded():
+    backend = MemoryBackend(max_keys=3)
+    for i in range(10):
+        take(backend, key=f"g:{i}")
+    assert len(backend._buckets) == 3
+
+
+def test_middleware_returns_429_with_retry_after():
+    mini = FastAPI()
+
+    @mini.post("/drogo")
+    def expensive():
+        return {"ok": True}
+
+    @mini.get("/tanio")
+    def cheap():
+        return {"ok": True}
+
+    group = RouteGroup("drogo", r"^/drogo$", rate=0.1, burst=2, methods=frozenset({"POST"}))
+    mini.add_middleware(RateLimitMiddleware, groups=[group], backend=MemoryBackend())
+    c = TestClient(mini)
+    assert [c.post("/drogo").status_code for _ in range(2)] == [200, 200]
+    r = c.post("/drogo")
+    assert r.status_code == 429
+    assert r.headers["retry-after"] == "10"
+    # inne trasy i metody bez limitu
+    assert all(c.get("/tanio").status_code == 200 for _ in range(5))
+
+
+def test_configured_groups_override():
+    groups = {g.name: g for g in configured_groups(DEFAULT_GROUPS, '{"login": {"rate": 2, "burst": 3}}')}
+    assert (groups["login"].rate, groups["login"].burst) == (2.0, 3.0)
+    assert groups["payments"] == next(g for g in DEFAULT_GROUPS if g.name == "payments")
+    assert groups["blockchain_owner"].matches("GET", "/blockchain/records-by-owner/0xabc")
+    assert not groups["appointments_create"].matches("GET", "/appointments/")
+
+
+def test_login_burst_limited_per_client(monkeypatch):
+    monkeypatch.setattr(users, "get_user_by_email", lambda db, email: None)
+    client = TestClient(app)
+    burst = int(next(g.burst for g in configured_groups() if g.name == "login"))
+    codes = []
+    for i in range(burst + 1):
+        # różne e-maile – limit grupy działa niezależnie od core.throttle
+        codes.append(client.post("/users/login", json={"email": f"u{i}@b.com", "password": "x"}).status_code)
+    throttle.login_throttle.clear()
+    assert codes[:burst] == [400] * burst
+    assert codes[-1] == 429
@@ -71,7 +71,7 @@ def test_register_only_clients(monkeypatch):
     assert r2.status_code == 400
 
 def test_users_get(monkeypatch):
-    monkeypatch.setattr(users, "list_clients", lambda db: [
+    monkeypatch.setattr(users, "list_clients", lambda db, **kw: [
         {
             "id": 1,
             "first_name": "Anna",
@@ -124,9 +124,10 @@ def test_user_delete_notfound(monkeypatch):
     assert r.status_code == 404
 
 def test_user_delete_many(monkeypatch):
-    monkeypatch.setattr(users, "delete_client", lambda db, uid: True)
+    monkeypatch.setattr(users, "delete_clients", lambda db, ids: list(ids))
     r = client.request("DELETE", "/users/", json=[1, 2])
-    assert r.status_code == 204
+    assert r.status_code == 200
+    assert r.json()["deleted"] == [1, 2]
 
 # ========================== ANIMALS ==========================
 def test_animal_create(monkeypatch):
@@ -244,7 +245,7 @@ def test_blockchain_delete(monkeypatch):
 
 # ========================== CONSULTANTS ==========================
 def test_consultant_crud(monkeypatch):
-    monkeypatch.setattr(consultants, "list_consultants", lambda db, skip=0, limit=100: [
+    monkeypatch.setattr(consultants, "list_consultants", lambda db, skip=0, limit=100, after=None, fields=(): [
         {
             "id": 1,
             "first_name": "Anna",
@@ -285,7 +286,7 @@ def test_consultant_crud(monkeypatch):
 
 # ========================== DOCTORS ==========================
 def test_doctor_crud(monkeypatch):
-    monkeypatch.setattr(doctors, "list_doctors", lambda db: [
+    monkeypatch.setattr(doctors, "list_doctors", lambda db, **kw: [
         {
             "id": 1,
             "first_name": "Jan",
@@ -332,7 +333,7 @@ def test_doctor_crud(monkeypatch):
 
 # ========================== FACILITIES ==========================
 def test_facility_crud(monkeypatch):
-    monkeypatch.setattr(facilities, "get_facilities", lambda db, skip, limit: [
+    monkeypatch.setattr(facilities, "get_facilities", lambda db, skip, limit, after=None, fields=(): [
         {
             "id": 1,
             "name": "F",
@@ -373,17 +374,19 @@ def test_invoice_crud(monkeypatch):
 
 # ========================== MEDICAL RECORDS ==========================
 def test_medical_records_crud(monkeypatch):
-    monkeypatch.setattr(medical_records, "list_medical_records", lambda db, skip=0, limit=100: [
-        {
-            "id": 1,
-            "appointment_id": 101,
-            "animal_id": 21,
-            "description": "Kontrola",
-            "created_at": "2024-07-01T10:00:00",
-            "data_hash": "abc123",
-            "blockchain_tx": "0xdeadbeef"
-        }
-    ])
+    async def fake_list_medical_records(db, skip=0, limit=100, after=None, include=(), fields=()):
+        return [
+            {
+                "id": 1,
+                "appointment_id": 101,
+                "animal_id": 21,
+                "description": "Kontrola",
+                "created_at": "2024-07-01T10:00:00",
+                "data_hash": "abc123",
+                "blockchain_tx": "0xdeadbeef"
+            }
+        ]
+    monkeypatch.setattr(medical_records, "list_medical_records_async", fake_list_medical_records)
     r = client.get("/medical_records/")
     assert r.status_code == 200
 
@@ -439,19 +442,21 @@ def test_consultant_read_notfound(monkeypatch):
 
 # --- TEST 3: Odczyt wszystkich wizyt (appointments) ---
 def test_appointments_list(monkeypatch):
-    monkeypatch.setattr(appointments.appointments_crud, "get_appointments", lambda db, skip, limit: [
-        {
-            "id": 1,
-            "owner_id": 1,
-            "animal_id": 2,
-            "visit_datetime": "2024-07-03T09:00:00",
-            "fee": 111.00,
-            "doctor_id": 7,
-            "facility_id": 1,
-            "created_at": "2024-07-02T08:00:00",
-            "updated_at": "2024-07-02T08:00:00"
-        }
-    ])
+    async def fake_get_appointments(db, skip, limit, after=None, **filters):
+        return [
+            {
+                "id": 1,
+                "owner_id": 1,
+                "animal_id": 2,
+                "visit_datetime": "2024-07-03T09:00:00",
+                "fee": 111.00,
+                "doctor_id": 7,
+                "facility_id": 1,
+                "created_at": "2024-07-02T08:00:00",
+                "updated_at": "2024-07-02T08:00:00"
+            }
+        ]
+    monkeypatch.setattr(appointments.appointments_crud, "get_appointments_async", fake_get_appointments)
     r = client.get("/appointments/")
     assert r.status_code == 200
     assert isinstance(r.json(), list)
@@ -462,4 +467,212 @@ def test_appointments_free_slots_sunday(monkeypatch):
     # nie patchujemy, endpoint ma logiczkę która sprawdza niedzielę
     response = client.get("/appointments/free_slots/?doctor_id=5&date=2024-07-07")  # 2024-07-07 to niedziela
     assert response.status_code == 200
-    assert response.json() == []
\ No newline at end of file
+    assert response.json() == []
+
+# ========================== ASYNC READS ==========================
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from vetclinic_api.core.database import Base, build_engine, build_async_engine, get_async_db
+from vetclinic_api.models.users import Client, Doctor
+from vetclinic_api.models.facility import Facility
+from vetclinic_api.models.animals import Animal as AnimalModel
+from vetclinic_api.models.appointments import Appointment as AppointmentModel
+from vetclinic_api.models.invoice import Invoice as InvoiceModel
+
+
+@pytest.fixture
+def async_client(tmp_path):
+    url = f"sqlite:///{tmp_path / 'async.db'}"
+    sync_engine = build_engine(url)
+    Base.metadata.create_all(bind=sync_engine)
+    db = sessionmaker(bind=sync_engine)()
+    facility = Facility(name="F", address="ul. A 1")
+    owner = Client(first_name="Anna", last_name="Nowak", email="anna@x.pl", password_hash="x",
+                   phone_number="+48123456789", address="ul. A 1", postal_code="00-001", wallet_address="0xA")
+    db.add_all([facility, owner])
+    db.flush()
+    doctor = Doctor(first_name="Jan", last_name="Lekarz", email="j@lekarz.pl", backup_email="b@x.pl",
+                    password_hash="x", specialization="chirurg", permit_number="12345", facility_id=facility.id)
+    animal = AnimalModel(name="Rex", species="pies", owner_id=owner.id)
+    db.add_all([doctor, animal])
+    db.flush()
+    db.add_all([
+        AppointmentModel(doctor_id=doctor.id, animal_id=animal.id, owner_id=owner.id, facility_id=facility.id,
+                         visit_datetime=datetime.datetime(2024, 7, 1, 9, 0), fee=100.0),
+        AppointmentModel(doctor_id=doctor.id, animal_id=animal.id, owner_id=owner.id, facility_id=facility.id,
+                         visit_datetime=datetime.datetime(2024, 7, 1, 10, 15), fee=100.0),
+        InvoiceModel(client_id=owner.id, amount=100),
+    ])
+    db.commit()
+    db.close()
+
+    async_engine = build_async_engine(url, poolclass=NullPool)
+    AsyncSessionLocal = async_sessionmaker(bind=async_engine, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with AsyncSessionLocal() as session:
+            yield session
+
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    with TestClient(app) as c:
+        yield c
+    app.dependency_overrides.pop(get_async_db, None)
+    sync_engine.dispose()
+
+
+def test_async_list_endpoints(async_client):
+    assert [a["name"] for a in async_client.get("/animals/").json()] == ["Rex"]
+    assert len(async_client.get("/appointments/").json()) == 2
+    assert len(async_client.get("/appointments/?skip=1&limit=5").json()) == 1
+    assert async_client.get("/invoices/").json()[0]["status"] == "pending"
+    assert async_client.get("/medical_records/").json() == []
+
+
+def test_async_cursor_pagination(async_client):
+    r1 = async_client.get("/appointments/?limit=1")
+    assert r1.status_code == 200
+    assert r1.json()[0]["visit_datetime"].startswith("2024-07-01T09:00")
+    cursor = r1.headers["X-Next-Cursor"]
+    assert 'rel="next"' in r1.headers["Link"]
+
+    r2 = async_client.get(f"/appointments/?limit=1&cursor={cursor}")
+    assert r2.json()[0]["visit_datetime"].startswith("2024-07-01T10:15")
+    assert "X-Next-Cursor" not in r2.headers  # ostatnia strona
+
+    assert async_client.get("/appointments/?cursor=zly-token").status_code == 400
+    # kursor wizyt (data, id) nie pasuje do listy zwierząt (id)
+    assert async_client.get(f"/animals/?cursor={cursor}").status_code == 400
+
+
+def test_async_list_filters(async_client):
+    assert len(async_client.get("/animals/?owner_id=1").json()) == 1
+    assert async_client.get("/animals/?owner_id=999").json() == []
+
+    r = async_client.get("/appointments/?doctor_id=1&from=2024-07-01T10:00:00&to=2024-07-02T00:00:00")
+    assert [v["visit_datetime"][11:16] for v in r.json()] == ["10:15"]
+    assert async_client.get("/appointments/?facility_id=1&priority=pilna").json() == []
+    assert len(async_client.get("/appointments/?owner_id=1&animal_id=1").json()) == 2
+
+    assert len(async_client.get("/invoices/?client_id=1&status=pending").json()) == 1
+    assert async_client.get("/invoices/?client_id=1&status=paid").json() == []
+
+
+def test_async_include_relations(async_client):
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    statements = []
+    def count(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(Engine, "before_cursor_execute", count)
+    try:
+        r = async_client.get("/appointments/?include=doctor,owner,animal,facility,medical_records")
+    finally:
+        event.remove(Engine, "before_cursor_execute", count)
+
+    assert r.status_code == 200
+    visit = r.json()[0]
+    assert visit["doctor"]["last_name"] == "Lekarz"
+    assert visit["owner"]["email"] == "anna@x.pl"
+    assert visit["animal"]["name"] == "Rex"
+    assert visit["facility"]["name"] == "F"
+    assert visit["medical_records"] == []
+    # strona = 1 zapytanie o wizyty + po 1 na każdą relację, niezależnie od liczby wierszy
+    assert len(statements) == 1 + 5
+
+    plain = async_client.get("/appointments/").json()[0]
+    assert "doctor" not in plain and "medical_records" not in plain
+
+    animal = async_client.get("/animals/?include=owner,weight_logs").json()[0]
+    assert animal["owner"]["last_name"] == "Nowak" and animal["weight_logs"] == []
+    assert "medical_records" not in animal
+
+    r = async_client.get("/medical_records/?include=owner")
+    assert r.status_code == 400
+    assert "Dozwolone: animal, appointment" in r.json()["detail"]
+
+
+def test_async_lists_validate_rows_once(async_client, monkeypatch):
+    import fastapi.routing
+
+    async def no_second_pass(*args, **kwargs):
+        raise AssertionError("lista nie powinna przechodzić walidacji response_model")
+    monkeypatch.setattr(fastapi.routing, "serialize_response", no_second_pass)
+
+    # wiersze serializowane raz (schemat bazowy albo embed) i kodowane bezpośrednio
+    for url in ("/appointments/", "/appointments/?include=doctor", "/animals/",
+                "/animals/?include=owner", "/medical_records/?include=animal"):
+        r = async_client.get(url)
+        assert r.status_code == 200, url
+    plain = async_client.get("/appointments/").json()[0]
+    assert plain["fee"] == 100.0 and plain["visit_datetime"] == "2024-07-01T09:00:00"
+    assert "doctor" not in plain
+
+
+def test_async_sparse_fields(async_client):
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    statements = []
+    def capture(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(Engine, "before_cursor_execute", capture)
+    try:
+        r = async_client.get("/appointments/?fields=id,fee&limit=1")
+    finally:
+        event.remove(Engine, "before_cursor_execute", capture)
+
+    assert r.status_code == 200
+    assert r.json() == [{"id": 1, "fee": 100.0}]
+    # kursor działa także przy wybranych polach (klucz sortowania jest pobierany)
+    assert "X-Next-Cursor" in r.headers
+    select_sql = statements[0]
+    assert "reason" not in select_sql and "notes" not in select_sql
+
+    with_rel = async_client.get("/appointments/?fields=id&include=doctor").json()[0]
+    assert with_rel == {"id": 1, "doctor": with_rel["doctor"]}
+    assert with_rel["doctor"]["last_name"] == "Lekarz"
+
+    invoice = async_client.get("/invoices/?fields=amount,created_at").json()[0]
+    assert invoice["amount"] == "100.00" and set(invoice) == {"amount", "created_at"}
+
+    r = async_client.get("/animals/?fields=id,color")
+    assert r.status_code == 400
+    assert "color" in r.json()["detail"]
+
+
+def test_async_content_negotiation(async_client):
+    import json
+    import msgpack
+
+    r = async_client.get("/appointments/")
+    assert r.headers["content-type"] == "application/json"
+
+    r = async_client.get("/appointments/?limit=1", headers={"Accept": "application/msgpack"})
+    assert r.headers["content-type"] == "application/msgpack"
+    rows = msgpack.unpackb(r.content)
+    assert len(rows) == 1 and rows[0]["visit_datetime"].startswith("2024-07-01T09:00")
+    assert "X-Next-Cursor" in r.headers
+
+    animals = async_client.get("/animals/?fields=name", headers={"Accept": "application/msgpack"})
+    assert msgpack.unpackb(animals.content) == [{"name": "Rex"}]
+
+    # NDJSON: eksport całej listy niezależnie od limitu strony
+    r = async_client.get("/appointments/?limit=1&fields=id", headers={"Accept": "application/x-ndjson"})
+    assert r.headers["content-type"] == "application/x-ndjson"
+    assert [json.loads(line) for line in r.text.splitlines()] == [{"id": 1}, {"id": 2}]
+
+    r = async_client.get("/invoices/", headers={"Accept": "application/x-ndjson"})
+    invoice = json.loads(r.text.splitlines()[0])
+    assert invoice["amount"] == "100.00" and invoice["status"] == "pending"
+
+
+def test_async_free_slots(async_client):
+    r = async_client.get("/appointments/free_slots/?doctor_id=1&date=2024-07-01")
+    assert r.status_code == 200
+    slots = r.json()
+    assert "09:00" not in slots and "10:15" not in slots
+    assert "08:00" in slots and len(slots) == 44 - 2
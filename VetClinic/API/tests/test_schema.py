@@ -0,0 +1,65 @@
+# VetClinic/API/tests/test_schema.py
+import pytest
+from sqlalchemy import inspect, text
+
+from vetclinic_api.core.database import Base, build_engine
+from vetclinic_api.core.schema import (
+    SchemaMismatchError,
+    bootstrap_schema,
+    current_revision,
+    head_revision,
+    main,
+    verify_schema,
+)
+
+
+@pytest.fixture
+def empty_engine(tmp_path):
+    eng = build_engine(f"sqlite:///{tmp_path / 'schema.db'}")
+    yield eng
+    eng.dispose()
+
+
+def test_import_does_not_create_tables(empty_engine):
+    # Sam import modułów aplikacji nie może wykonywać DDL
+    import vetclinic_api.main  # noqa: F401
+    assert inspect(empty_engine).get_table_names() == []
+
+
+def test_verify_rejects_empty_database(empty_engine):
+    assert current_revision(empty_engine) is None
+    with pytest.raises(SchemaMismatchError) as exc:
+        verify_schema(empty_engine)
+    assert "bootstrap" in str(exc.value)
+
+
+def test_bootstrap_creates_tables_and_stamps_head(empty_engine):
+    assert bootstrap_schema(empty_engine) == head_revision()
+
+    tables = set(inspect(empty_engine).get_table_names())
+    assert set(Base.metadata.tables) <= tables
+    assert "alembic_version" in tables
+    assert verify_schema(empty_engine) == head_revision()
+
+    # Ponowny bootstrap jest bezpieczny (brak migracji do wykonania)
+    assert bootstrap_schema(empty_engine) == head_revision()
+
+
+def test_verify_rejects_outdated_revision(empty_engine):
+    bootstrap_schema(empty_engine)
+    with empty_engine.begin() as conn:
+        conn.execute(text("UPDATE alembic_version SET version_num = 'stara'"))
+
+    with pytest.raises(SchemaMismatchError):
+        verify_schema(empty_engine)
+
+
+def test_cli_verify_exit_codes(empty_engine, monkeypatch, capsys):
+    import vetclinic_api.core.schema as schema
+
+    monkeypatch.setattr(schema, "verify_schema", lambda: verify_schema(empty_engine))
+    assert main(["verify"]) == 1
+    bootstrap_schema(empty_engine)
+    assert main(["verify"]) == 0
+    assert head_revision() in capsys.readouterr().out
+    assert main(["nieznane"]) == 2
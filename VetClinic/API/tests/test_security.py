@@ -8,6 +8,7 @@ from passlib.context import CryptContext
 from pathlib import Path
 
 import vetclinic_api.core.security as sec
+from vetclinic_api.core.keyring import KeyRing, SigningKey
 from vetclinic_api.models.users import Client, Doctor, Consultant
 
 def test_password_hash_and_verify():
@@ -17,19 +18,20 @@ def test_password_hash_and_verify():
     assert sec.verify_password(pwd, hashed) is True
     assert sec.verify_password("wrong", hashed) is False
 
-class DummyQuery:
-    def __init__(self, result):
-        self._res = result
-    def filter(self, *args, **kwargs):
-        return self
+class DummyResult:
+    def __init__(self, row):
+        self._row = row
     def first(self):
-        return self._res
+        return self._row
 
 class DummySession:
+    """Jeden wiersz (Client, Doctor, Consultant) – jak LEFT JOIN w USER_BY_EMAIL."""
     def __init__(self, mapping):
         self._map = mapping
-    def query(self, model):
-        return DummyQuery(self._map.get(model, None))
+        self.executed = 0
+    def execute(self, stmt, params=None):
+        self.executed += 1
+        return DummyResult(tuple(self._map.get(m) for m in (Client, Doctor, Consultant)))
 
 @pytest.mark.parametrize("mapping,expected", [
     ({Client: "C", Doctor: None, Consultant: None}, "C"),
@@ -41,12 +43,39 @@ def test_get_user_by_email(mapping, expected):
     session = DummySession(mapping)
     result = sec.get_user_by_email(session, "foo@bar")
     assert result == expected
+    assert session.executed == 1
+
+def test_get_user_by_email_single_query(tmp_path):
+    from sqlalchemy import event
+    from sqlalchemy.orm import sessionmaker
+    from vetclinic_api.core.database import Base, build_engine
+    from vetclinic_api.models.facility import Facility
+
+    eng = build_engine(f"sqlite:///{tmp_path / 'users.db'}")
+    Base.metadata.create_all(bind=eng)
+    db = sessionmaker(bind=eng)()
+    facility = Facility(name="F", address="ul. A 1")
+    db.add(facility)
+    db.flush()
+    db.add(Consultant(first_name="Ola", last_name="Nowak", email="o@x.pl", backup_email="b@x.pl",
+                      password_hash="x", facility_id=facility.id))
+    db.commit()
+
+    statements = []
+    event.listen(eng, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    user = sec.get_user_by_email(db, "o@x.pl")
+    assert isinstance(user, Consultant) and user.first_name == "Ola"
+    assert sec.get_user_by_email(db, "brak@x.pl") is None
+    assert len(statements) == 2  # po jednym zapytaniu na wyszukiwanie
+    db.close()
+    eng.dispose()
 
 def test_create_access_token_default_and_custom_expiry(monkeypatch):
     # Ustawiamy znany klucz, żebyśmy mogli rozkodować JWT
-    monkeypatch.setattr(sec, "SECRET_KEY", "testkey123")
+    monkeypatch.setattr(sec, "keyring", KeyRing([SigningKey(kid="k1", secret="testkey123")]))
     # default expiry = 1h
     token1 = sec.create_access_token({"sub": "user1"})
+    assert jwt.get_unverified_header(token1)["kid"] == "k1"
     data1 = jwt.decode(token1, "testkey123", algorithms=[sec.ALGORITHM])
     assert data1["sub"] == "user1"
     assert "exp" in data1
@@ -72,6 +101,23 @@ def test_totp_secret_and_uri():
     assert f"secret={secret}" in uri
     assert "issuer=VetX" in uri
 
+def test_totp_uri_and_qr_cached(monkeypatch):
+    sec.get_totp_provisioning_uri.cache_clear()
+    sec.totp_qr_png.cache_clear()
+    calls = []
+    real = pyotp.TOTP.provisioning_uri
+    monkeypatch.setattr(pyotp.TOTP, "provisioning_uri",
+                        lambda self, **kw: calls.append(kw) or real(self, **kw))
+    secret = "JBSWY3DPEHPK3PXP"
+    uri = sec.get_totp_provisioning_uri("bob@x.com", secret)
+    assert sec.get_totp_provisioning_uri("bob@x.com", secret) == uri
+    assert len(calls) == 1
+    # nowy secret -> nowe URI
+    assert sec.get_totp_provisioning_uri("bob@x.com", "KRSXG5CTMVRXEZLU") != uri
+    png = sec.totp_qr_png(uri)
+    assert png[:8] == b"\x89PNG\r\n\x1a\n"
+    assert sec.totp_qr_png(uri) is png
+
 def test_generate_qr_code(tmp_path):
     # wygeneruj TOTP URI
     secret = "JBSWY3DPEHPK3PXP"
@@ -20,6 +20,7 @@ def test_send_temporary_password(monkeypatch):
         def set_debuglevel(self, level): self.debug = level
         def login(self, user, pwd): self.logged = (user, pwd)
         def send_message(self, msg): self.sent = msg
+        def quit(self): pass
 
     monkeypatch.setattr("smtplib.SMTP_SSL", lambda *a, **k: DummySMTP())
     # Nic nie powinno rzucić wyjątku
@@ -0,0 +1,106 @@
+import datetime
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+from vetclinic_api.core import throttle
+from vetclinic_api.core.database import Base, build_engine, get_db
+from vetclinic_api.core.throttle import LoginThrottle, persist_lockouts
+from vetclinic_api.main import app
+from vetclinic_api.models.facility import Facility
+from vetclinic_api.models.users import Client, Doctor
+from vetclinic_api.routers import users
+
+client = TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def clean_throttle():
+    throttle.login_throttle.clear()
+    yield
+    throttle.login_throttle.clear()
+
+
+def test_sliding_window_blocks_after_max_fails():
+    t = LoginThrottle(max_fails=3, window=60, block_period=300)
+    assert not t.record_failure("a@x.pl", "1.1.1.1", now=0)
+    assert not t.record_failure("a@x.pl", "1.1.1.1", now=10)
+    # porażka z innego IP to osobny licznik
+    assert not t.record_failure("a@x.pl", "2.2.2.2", now=15)
+    assert t.record_failure("a@x.pl", "1.1.1.1", now=20)
+    assert t.retry_after("A@x.pl ", "1.1.1.1", now=21) == pytest.approx(299)
+    assert t.retry_after("a@x.pl", "2.2.2.2", now=21) == 0
+    assert t.retry_after("a@x.pl", "1.1.1.1", now=320) == 0
+    assert set(t.drain_lockouts()) == {"a@x.pl"}
+    assert t.drain_lockouts() == {}
+
+
+def test_failures_outside_window_do_not_block():
+    t = LoginThrottle(max_fails=3, window=60, block_period=300)
+    for now in (0, 50, 100, 150, 200):
+        assert not t.record_failure("a@x.pl", "ip", now=now)
+    assert t.retry_after("a@x.pl", "ip", now=201) == 0
+
+
+def test_success_resets_and_memory_is_bounded():
+    t = LoginThrottle(max_fails=2, window=60, block_period=300, max_keys=3)
+    t.record_failure("a@x.pl", "ip", now=0)
+    t.record_success("a@x.pl", "ip")
+    assert not t.record_failure("a@x.pl", "ip", now=1)
+    for i in range(10):
+        t.record_failure(f"u{i}@x.pl", "ip", now=2)
+    assert len(t._failures) <= 3
+
+
+def test_throttled_login_rejected_before_bcrypt(monkeypatch):
+    user = MagicMock()
+    user.locked_until = None
+    db = MagicMock()
+    verified = []
+    monkeypatch.setattr(users, "get_user_by_email", lambda db, email: user)
+    monkeypatch.setattr(users, "verify_password", lambda p, h: verified.append(p) or False)
+    app.dependency_overrides[get_db] = lambda: db
+    try:
+        for _ in range(throttle.login_throttle.max_fails):
+            r = client.post("/users/login", json={"email": "a@b.com", "password": "zle"})
+            assert r.status_code == 400
+        r = client.post("/users/login", json={"email": "a@b.com", "password": "zle"})
+    finally:
+        app.dependency_overrides.clear()
+    assert r.status_code == 429
+    assert int(r.headers["retry-after"]) > 0
+    assert len(verified) == throttle.login_throttle.max_fails
+    # nieudane próby nie zapisują nic w bazie
+    db.commit.assert_not_called()
+    assert "a@b.com" in throttle.login_throttle.drain_lockouts()
+
+
+def test_persist_lockouts_in_one_batch(tmp_path):
+    eng = build_engine(f"sqlite:///{tmp_path / 'lock.db'}")
+    Base.metadata.create_all(bind=eng)
+    db = sessionmaker(bind=eng)()
+    facility = Facility(name="F", address="ul. A 1")
+    db.add(facility)
+    db.flush()
+    db.add(Client(first_name="A", last_name="B", email="k@x.pl", password_hash="x",
+                  phone_number="+48123456789", address="ul. A 1", postal_code="00-001",
+                  wallet_address="0x1"))
+    db.add(Doctor(first_name="L", last_name="L", email="l@x.pl", backup_email="b@x.pl",
+                  password_hash="x", specialization="chirurg", permit_number="12345",
+                  facility_id=facility.id))
+    db.commit()
+
+    until = datetime.datetime(2030, 1, 1, 12, 0)
+    statements = []
+    event.listen(eng, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    persist_lockouts(db, {"k@x.pl": until, "l@x.pl": until, "brak@x.pl": until})
+    # jedno executemany na tabelę ról, jeden commit
+    assert sum(s.startswith("UPDATE") for s in statements) == 3
+    db.expire_all()
+    assert db.query(Client).one().locked_until == until
+    assert db.query(Doctor).one().locked_until == until
+    db.close()
+    eng.dispose()
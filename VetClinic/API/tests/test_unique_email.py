@@ -0,0 +1,108 @@
+import pytest
+from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError
+
+from vetclinic_api.core.unique_email import create_with_unique_email, taken_emails
+from vetclinic_api.crud.consultants import consultant_local_parts
+from vetclinic_api.models.facility import Facility
+from vetclinic_api.models.users import Doctor
+from vetclinic_api.routers.doctors import DOCTOR_EMAIL_DOMAIN, doctor_local_parts
+
+
+@pytest.fixture
+def session_factory(session_factory):
+    with session_factory() as db:
+        db.add(Facility(id=1, name="F", address="ul. A 1"))
+        db.commit()
+    return session_factory
+
+
+def add_doctor(db, email, permit="12345"):
+    db.add(Doctor(first_name="J", last_name="K", email=email, backup_email="b@x.pl",
+                  password_hash="x", specialization="chirurg", permit_number=permit, facility_id=1))
+    db.commit()
+
+
+def create_doctor(db, permit="12345"):
+    def create(email):
+        add_doctor(db, email, permit)
+        return email
+    return create
+
+
+def test_candidates_order():
+    parts = doctor_local_parts("jan", "kowalski")
+    assert [next(parts) for _ in range(6)] == [
+        "j.kowalski", "jkowalski", "jakowalski", "jankowalski", "jkowalski1", "jkowalski2",
+    ]
+    parts = consultant_local_parts("a.nowak")
+    assert [next(parts) for _ in range(3)] == ["a.nowak", "a.nowak1", "a.nowak2"]
+
+
+def test_next_free_email_in_one_query(session_factory):
+    db = session_factory()
+    taken = ["j.kowalski", "jkowalski", "jakowalski", "jankowalski", "jkowalski1"]
+    for i, local in enumerate(taken + ["a.kowalski", "j.nowak"]):
+        add_doctor(db, f"{local}@{DOCTOR_EMAIL_DOMAIN}", permit=f"{10000 + i}")
+    assert taken_emails(db, Doctor.email, "j", "kowalski", DOCTOR_EMAIL_DOMAIN) == {
+        f"{local}@{DOCTOR_EMAIL_DOMAIN}" for local in taken
+    }
+
+    selects = []
+    event.listen(db.get_bind(), "before_cursor_execute",
+                 lambda *args: selects.append(args[2]) if args[2].startswith("SELECT") else None)
+    email = create_with_unique_email(
+        db, Doctor.email, lambda: doctor_local_parts("jan", "kowalski"),
+        prefix="j", contains="kowalski", domain=DOCTOR_EMAIL_DOMAIN, create=create_doctor(db, "99999"),
+    )
+    assert email == f"jkowalski2@{DOCTOR_EMAIL_DOMAIN}"
+    assert len(selects) == 1
+    db.close()
+
+
+def test_like_wildcards_in_name_are_literal(session_factory):
+    db = session_factory()
+    add_doctor(db, f"jxkowalski@{DOCTOR_EMAIL_DOMAIN}")
+    assert taken_emails(db, Doctor.email, "j", "_kowalski", DOCTOR_EMAIL_DOMAIN) == set()
+    db.close()
+
+
+def test_concurrent_creation_retries_with_next_email(session_factory):
+    db, other = session_factory(), session_factory()
+    calls = []
+
+    def create(email):
+        if not calls:
+            # równoległe żądanie zajmuje ten sam adres między wyborem a zapisem
+            add_doctor(other, email, permit="11111")
+        calls.append(email)
+        add_doctor(db, email, permit="22222")
+        return email
+
+    email = create_with_unique_email(
+        db, Doctor.email, lambda: doctor_local_parts("jan", "kowalski"),
+        prefix="j", contains="kowalski", domain=DOCTOR_EMAIL_DOMAIN, create=create,
+    )
+    assert calls == [f"j.kowalski@{DOCTOR_EMAIL_DOMAIN}", f"jkowalski@{DOCTOR_EMAIL_DOMAIN}"]
+    assert email == calls[-1]
+    db.close()
+    other.close()
+
+
+def test_other_integrity_errors_are_not_retried(session_factory):
+    db = session_factory()
+    calls = []
+
+    def create(email):
+        calls.append(email)
+        db.add(Doctor(first_name="J", last_name="K", email=email, backup_email=None,
+                      password_hash="x", specialization="chirurg", permit_number="1", facility_id=1))
+        db.commit()
+
+    with pytest.raises(IntegrityError):
+        create_with_unique_email(
+            db, Doctor.email, lambda: doctor_local_parts("jan", "kowalski"),
+            prefix="j", contains="kowalski", domain=DOCTOR_EMAIL_DOMAIN, create=create,
+        )
+    assert len(calls) == 1
+    db.close()
@@ -1,6 +1,8 @@
+import base64
 import pytest
 import datetime
 from fastapi.testclient import TestClient
+from vetclinic_api.core.throttle import login_throttle
 from vetclinic_api.routers import users
 from vetclinic_api.schemas.users import ClientCreate, UserLogin, PasswordReset, ConfirmTOTP
 from unittest.mock import MagicMock
@@ -11,6 +13,13 @@ from vetclinic_api.main import app
 
 client = TestClient(app)
 
+@pytest.fixture(autouse=True)
+def clean_login_throttle():
+    # nieudane logowania z testów nie mogą blokować kolejnych
+    login_throttle.clear()
+    yield
+    login_throttle.clear()
+
 def example_client():
     return {
         "id": 1,
@@ -44,7 +53,7 @@ def test_register_client_wrong_role(monkeypatch):
 
 # --- LISTA I GET ---
 def test_get_users(monkeypatch):
-    monkeypatch.setattr(users, "list_clients", lambda db: [example_client()])
+    monkeypatch.setattr(users, "list_clients", lambda db, **kw: [example_client()])
     r = client.get("/users/")
     assert r.status_code == 200
     assert r.json()[0]["id"] == 1
@@ -86,9 +95,10 @@ def test_delete_user_notfound(monkeypatch):
 
 # --- DELETE MANY ---
 def test_delete_many(monkeypatch):
-    monkeypatch.setattr(users, "delete_client", lambda db, uid: True)
+    monkeypatch.setattr(users, "delete_clients", lambda db, ids: [1, 3])
     r = client.request("DELETE", "/users/", json=[1, 2, 3])
-    assert r.status_code == 204
+    assert r.status_code == 200
+    assert r.json() == {"deleted": [1, 3], "not_found": [2], "conflict": []}
 
 # --- CHANGE PASSWORD ---
 def test_change_password_success(monkeypatch):
@@ -153,10 +163,23 @@ def test_setup_totp_success(monkeypatch):
     monkeypatch.setattr(users, "get_user_by_email", lambda db, email: user)
     monkeypatch.setattr(pyotp, "random_base32", lambda: "KZQW4===")
     monkeypatch.setattr(pyotp.TOTP, "provisioning_uri", lambda self, name, issuer_name: "otpauth://totp/fake")
-    monkeypatch.setattr(users, "generate_qr_code", lambda uri: MagicMock(save=lambda fn: None))
     r = client.post("/users/setup-totp", params={"email": "a@b.com"})
     assert r.status_code == 200
     assert "totp_uri" in r.json()
+    # obraz QR w odpowiedzi (base64), bez pliku na dysku
+    prefix = "data:image/png;base64,"
+    assert r.json()["qr_code"].startswith(prefix)
+    assert base64.b64decode(r.json()["qr_code"][len(prefix):])[:8] == b"\x89PNG\r\n\x1a\n"
+
+def test_setup_totp_png(monkeypatch):
+    user = MagicMock()
+    user.email = "a@b.com"
+    monkeypatch.setattr(users, "get_user_by_email", lambda db, email: user)
+    r = client.post("/users/setup-totp", params={"email": "a@b.com"}, headers={"Accept": "image/png"})
+    assert r.status_code == 200
+    assert r.headers["content-type"] == "image/png"
+    assert r.content[:8] == b"\x89PNG\r\n\x1a\n"
+    assert r.headers["x-totp-uri"] == f"otpauth://totp/VetClinic:a%40b.com?secret={user.totp_secret}&issuer=VetClinic"
 
 def test_setup_totp_nouser(monkeypatch):
     monkeypatch.setattr(users, "get_user_by_email", lambda db, email: None)
@@ -194,7 +217,7 @@ def test_read_doctors(monkeypatch):
          "specialization": "internista", "permit_number": "12345", "facility_id": 1}
     ]
     # Uwaga: podmień na poprawną ścieżkę do twojego routera!
-    monkeypatch.setattr("vetclinic_api.routers.doctors.list_doctors", lambda db: fake_doctors)
+    monkeypatch.setattr("vetclinic_api.routers.doctors.list_doctors", lambda db, **kw: fake_doctors)
     response = client.get("/doctors/")
     assert response.status_code == 200
     assert isinstance(response.json(), list)
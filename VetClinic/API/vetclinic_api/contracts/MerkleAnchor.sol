@@ -0,0 +1,42 @@
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.0;
+
+/// @notice Kotwiczenie partii hashy rekordów: on-chain tylko korzeń drzewa Merkle
+contract MerkleAnchor {
+    struct Root {
+        uint256 timestamp;
+        uint256 leafCount;
+        address submitter;
+    }
+
+    // korzeń -> kiedy i przez kogo został zapisany
+    mapping(bytes32 => Root) private _roots;
+
+    event RootAnchored(bytes32 indexed root, uint256 leafCount, address indexed submitter);
+
+    /// @notice Zapisuje korzeń partii (każdy korzeń tylko raz)
+    function anchorRoot(bytes32 root, uint256 leafCount) external {
+        require(leafCount > 0, "Empty batch");
+        require(_roots[root].timestamp == 0, "Root already anchored");
+        _roots[root] = Root(block.timestamp, leafCount, msg.sender);
+        emit RootAnchored(root, leafCount, msg.sender);
+    }
+
+    /// @notice Zwraca dane zapisanego korzenia (timestamp 0 = brak)
+    function getRoot(bytes32 root) external view returns (uint256 timestamp, uint256 leafCount, address submitter) {
+        Root memory r = _roots[root];
+        return (r.timestamp, r.leafCount, r.submitter);
+    }
+
+    /// @notice Sprawdza dowód przynależności liścia; węzeł = keccak256(0x01 || min || max)
+    function verify(bytes32 leaf, bytes32[] calldata proof, bytes32 root) external view returns (bool) {
+        bytes32 node = leaf;
+        for (uint256 i = 0; i < proof.length; i++) {
+            bytes32 sibling = proof[i];
+            node = node < sibling
+                ? keccak256(abi.encodePacked(bytes1(0x01), node, sibling))
+                : keccak256(abi.encodePacked(bytes1(0x01), sibling, node));
+        }
+        return node == root && _roots[root].timestamp != 0;
+    }
+}
@@ -0,0 +1,141 @@
+"""
+Uwierzytelnianie żądań tokenem JWT (nagłówek Authorization: Bearer ...).
+
+get_current_user to zależność FastAPI dla endpointów wymagających
+zalogowania. Żeby sprawdzanie tokenu przy każdym żądaniu prawie nic nie
+kosztowało, trzymamy dwie pamięci podręczne LRU:
+- tokens: skrót SHA-256 tokenu -> zweryfikowane claims; wpis wygasa
+  dokładnie w chwili "exp" tokenu (albo wycofania klucza – core.keyring),
+  więc wygasły token nigdy nie przejdzie,
+- users: (rola, id) -> CurrentUser; wpis żyje AUTH_USER_CACHE_TTL sekund
+  (nie dłużej niż token), a zmiana lub usunięcie konta usuwa go od razu
+  (forget_user w CRUD).
+Sam token nie jest przechowywany – kluczem jest jego skrót.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+import jwt
+from fastapi import Depends, HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+
+from vetclinic_api.core import security
+from vetclinic_api.core.config import (
+    AUTH_TOKEN_CACHE_SIZE,
+    AUTH_USER_CACHE_SIZE,
+    AUTH_USER_CACHE_TTL,
+)
+from vetclinic_api.core.database import get_async_sessionmaker
+from vetclinic_api.models.users import Client, Consultant, Doctor
+from vetclinic_api.schemas.users import CurrentUser
+
+# Rola z tokenu (właściwość role modelu) -> model
+ROLE_MODELS = {"klient": Client, "lekarz": Doctor, "consultant": Consultant}
+
+bearer_scheme = HTTPBearer(auto_error=False)
+
+
+class TTLCache:
+    """Pamięć LRU o stałym rozmiarze, każdy wpis z własnym czasem wygaśnięcia."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, now: Optional[float] = None) -> Any:
+        now = time.time() if now is None else now
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[1] <= now:
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, value: Any, expires_at: float) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+tokens = TTLCache(AUTH_TOKEN_CACHE_SIZE)
+users = TTLCache(AUTH_USER_CACHE_SIZE)
+
+
+def _unauthorized(detail: str) -> HTTPException:
+    return HTTPException(
+        status.HTTP_401_UNAUTHORIZED, detail, headers={"WWW-Authenticate": "Bearer"}
+    )
+
+
+def decode_token(token: str) -> dict:
+    """Zweryfikowane claims tokenu; podpis i "exp" sprawdzamy raz na token."""
+    key = hashlib.sha256(token.encode()).digest()
+    claims = tokens.get(key)
+    if claims is not None:
+        return claims
+    try:
+        claims, valid_until = security.decode_access_token(token)
+    except jwt.ExpiredSignatureError:
+        raise _unauthorized("Token wygasł")
+    except jwt.InvalidTokenError:
+        raise _unauthorized("Nieprawidłowy token")
+    if claims.get("role") not in ROLE_MODELS or not isinstance(claims.get("user_id"), int):
+        raise _unauthorized("Nieprawidłowy token")
+    tokens.put(key, claims, valid_until)
+    return claims
+
+
+async def load_user(role: str, user_id: int) -> Optional[CurrentUser]:
+    """Odczyt użytkownika z bazy (tylko przy braku w pamięci podręcznej)."""
+    async with get_async_sessionmaker()() as db:
+        user = await db.get(ROLE_MODELS[role], user_id)
+        return CurrentUser.model_validate(user) if user is not None else None
+
+
+def forget_user(role: str, user_id: int) -> None:
+    """Usuwa zapamiętane dane użytkownika – wywoływane po zmianie/usunięciu konta."""
+    users.pop((role, user_id))
+
+
+async def get_current_user(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(bearer_scheme),
+) -> CurrentUser:
+    """Zależność: zalogowany użytkownik z tokenu Bearer albo 401."""
+    if credentials is None:
+        raise _unauthorized("Brak tokenu")
+    claims = decode_token(credentials.credentials)
+    key = (claims["role"], claims["user_id"])
+    user = users.get(key)
+    if user is None:
+        user = await load_user(*key)
+        if user is None:
+            raise _unauthorized("Konto nie istnieje")
+        users.put(key, user, min(time.time() + AUTH_USER_CACHE_TTL, claims["exp"]))
+    return user
@@ -1,47 +1,99 @@
-from web3 import Web3
-from solcx import compile_source, install_solc, set_solc_version
-import os
+"""
+Połączenie z blockchainem – jeden provider na proces i adres RPC.
+
+Dawniej crud.blockchain_crud i crud.medical_records tworzyły osobne
+BlockchainProvider: podwójne wczytywanie artefaktu, dwa połączenia Web3,
+a przy leniwym deployu – dwa różne kontrakty. Teraz get_provider(rpc_url)
+zwraca wspólną instancję z rejestru procesu:
+- inicjalizacja leniwa (pierwsze get()), chroniona blokadą – równoległe
+  wątki łączą się z węzłem dokładnie raz,
+- jedna sesja HTTP (requests.Session z pulą połączeń) na adres RPC,
+  współdzielona przez wszystkie wątki – web3 domyślnie trzyma osobną
+  sesję dla każdego wątku,
+- health(): sonda stanu węzła i kontraktu (GET /blockchain/health).
+"""
+
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from web3 import HTTPProvider, Web3
+from web3._utils.http_session_manager import HTTPSessionManager
+
+from vetclinic_api.core.config import BLOCKCHAIN_POOL_SIZE, BLOCKCHAIN_TIMEOUT, BLOCKCHAIN_URL
+from vetclinic_api.core.contract_registry import resolve_address
+from vetclinic_api.core.contracts import load_artifact
+
+
+def pooled_session(pool_size: int = BLOCKCHAIN_POOL_SIZE) -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+class _SharedSessionManager(HTTPSessionManager):
+    """Menedżer sesji web3 zwracający zawsze tę samą sesję (niezależnie od wątku)."""
+
+    def __init__(self, session: requests.Session):
+        super().__init__()
+        self._session = session
+
+    def cache_and_return_session(self, endpoint_uri, session=None, request_timeout=None):
+        return self._session
+
+
+class PooledHTTPProvider(HTTPProvider):
+    def __init__(self, endpoint_uri: str, session: requests.Session, timeout: float = BLOCKCHAIN_TIMEOUT):
+        super().__init__(endpoint_uri, request_kwargs={"timeout": timeout})
+        self._request_session_manager = _SharedSessionManager(session)
 
-# Jednorazowa instalacja/ustawienie solc przy załadowaniu modułu
-install_solc("0.8.0")
-set_solc_version("0.8.0")
 
 class BlockchainProvider:
-    def __init__(self, rpc_url: str = "http://127.0.0.1:8545"):
+    def __init__(self, rpc_url: str = BLOCKCHAIN_URL):
         self.rpc_url = rpc_url
+        self.session = None
         self.w3 = None
         self.account = None
         self.contract = None
-        self._abi = None
+        # pozostałe kontrakty (np. MerkleAnchor), rozwiązywane przy pierwszym użyciu
+        self._contracts = {}
+        self._lock = threading.Lock()
 
-        # Wczytujemy ABI/bin kod raz, bez deployu
-        contract_path = os.path.join(os.path.dirname(__file__), "../contracts/MedicalRecord.sol")
-        with open(contract_path, "r") as f:
-            source = f.read()
-        compiled = compile_source(source, output_values=["abi", "bin"])
-        _, interface = compiled.popitem()
-        self._abi = interface["abi"]
-        self._bin = interface["bin"]
+        # ABI z artefaktu (core.contracts) – bez solc
+        self._abi = load_artifact("MedicalRecord").abi
+
+    def _connect(self) -> Web3:
+        self.session = pooled_session()
+        w3 = Web3(PooledHTTPProvider(self.rpc_url, self.session))
+        if not w3.is_connected():
+            self.session.close()
+            raise ConnectionError(f"Nie można połączyć się z blockchainem pod {self.rpc_url}")
+        return w3
 
     def _ensure_initialized(self):
         if self.contract is not None:
             return
 
-        # 1. Połącz z Web3
-        self.w3 = Web3(Web3.HTTPProvider(self.rpc_url))
-        if not self.w3.is_connected():
-            raise ConnectionError(f"Nie można połączyć się z blockchainem pod {self.rpc_url}")
+        with self._lock:
+            if self.contract is not None:
+                return
 
-        # 2. Wybierz konto
-        self.account = self.w3.eth.accounts[0]
+            # 1. Połącz z Web3 (jedna sesja HTTP z pulą połączeń)
+            if self.w3 is None:
+                self.w3 = self._connect()
 
-        # 3. Deploy kontraktu
-        contract_cls = self.w3.eth.contract(abi=self._abi, bytecode=self._bin)
-        tx_hash = contract_cls.constructor().transact({'from': self.account})
-        receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash)
+            # 2. Wybierz konto
+            self.account = self.w3.eth.accounts[0]
 
-        # 4. Zapisz instancję
-        self.contract = self.w3.eth.contract(address=receipt.contractAddress, abi=self._abi)
+            # 3. Adres wdrożonego kontraktu (konfiguracja / cache / AddressRegistry);
+            #    deploy tylko przez: python -m vetclinic_api.core.contract_registry bootstrap
+            address = resolve_address(self.w3, "MedicalRecord")
+
+            # 4. Zapisz instancję
+            self.contract = self.w3.eth.contract(address=address, abi=self._abi)
 
     def get(self):
         """
@@ -49,3 +101,50 @@ class BlockchainProvider:
         """
         self._ensure_initialized()
         return self.contract, self.account, self.w3
+
+    def get_contract(self, name: str):
+        """
+        Jak get(), ale dla innego kontraktu z rejestru adresów (core.contract_registry),
+        np. MerkleAnchor. ABI z artefaktu, adres rozwiązywany raz na proces.
+        """
+        _, account, w3 = self.get()
+        contract = self._contracts.get(name)
+        if contract is None:
+            with self._lock:
+                contract = self._contracts.get(name)
+                if contract is None:
+                    contract = self._contracts[name] = w3.eth.contract(
+                        address=resolve_address(w3, name), abi=load_artifact(name).abi
+                    )
+        return contract, account, w3
+
+    def health(self) -> dict:
+        """Sonda: czy węzeł odpowiada i czy znamy adres kontraktu (nie rzuca wyjątków)."""
+        start = time.perf_counter()
+        try:
+            contract, _, w3 = self.get()
+            block = w3.eth.block_number
+        except Exception as exc:
+            return {"ok": False, "rpc_url": self.rpc_url, "error": str(exc)}
+        return {
+            "ok": True,
+            "rpc_url": self.rpc_url,
+            "contract": contract.address,
+            "block_number": block,
+            "latency_ms": round((time.perf_counter() - start) * 1000, 1),
+        }
+
+
+_providers: dict[str, BlockchainProvider] = {}
+_providers_lock = threading.Lock()
+
+
+def get_provider(rpc_url: str = BLOCKCHAIN_URL) -> BlockchainProvider:
+    """Wspólny provider dla rpc_url (jeden na proces)."""
+    provider = _providers.get(rpc_url)
+    if provider is None:
+        with _providers_lock:
+            provider = _providers.get(rpc_url)
+            if provider is None:
+                provider = _providers[rpc_url] = BlockchainProvider(rpc_url)
+    return provider
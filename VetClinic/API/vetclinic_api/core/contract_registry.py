@@ -0,0 +1,183 @@
+"""
+Adresy wdrożonych kontraktów (MedicalRecord, MerkleAnchor).
+
+Dawniej BlockchainProvider przy pierwszym użyciu wdrażał nowy kontrakt –
+każdy worker API, przebieg testów i sesja GUI pisały do innego kontraktu
+i płaciły za deploy (transakcja + oczekiwanie na receipt) przy starcie.
+Teraz adres rozwiązujemy, w kolejności:
+
+1. konfiguracja (MEDICAL_RECORD_ADDRESS, MERKLE_ANCHOR_ADDRESS),
+2. lokalna pamięć podręczna (CONTRACT_ADDRESS_CACHE, klucz: chain id),
+   o ile pod adresem wciąż jest kod (np. po restarcie Ganache go nie ma),
+3. kontrakt AddressRegistry (ADDRESS_REGISTRY_ADDRESS) – wynik trafia
+   do pamięci podręcznej.
+
+Deploy wykonuje wyłącznie jawny bootstrap (MerkleAnchor – gdy ANCHOR_MODE=merkle):
+    python -m vetclinic_api.core.contract_registry bootstrap [--redeploy]
+"""
+
+import json
+import sys
+from pathlib import Path
+from typing import Optional
+
+from web3 import Web3
+
+from vetclinic_api.core.config import (
+    ADDRESS_REGISTRY_ADDRESS,
+    ANCHOR_MODE,
+    BLOCKCHAIN_URL,
+    CONTRACT_ADDRESS_CACHE,
+    MEDICAL_RECORD_ADDRESS,
+    MERKLE_ANCHOR_ADDRESS,
+)
+from vetclinic_api.core.contracts import Artifact, compile_contract, load_artifact
+
+ZERO_ADDRESS = "0x" + "0" * 40
+
+# Adresy podane wprost w konfiguracji (mają pierwszeństwo)
+CONFIGURED_ADDRESSES = {"MedicalRecord": MEDICAL_RECORD_ADDRESS, "MerkleAnchor": MERKLE_ANCHOR_ADDRESS}
+
+
+def bootstrap_contracts() -> list[str]:
+    """Kontrakty wdrażane przez bootstrap w bieżącym trybie kotwiczenia."""
+    return ["MedicalRecord", "MerkleAnchor"] if ANCHOR_MODE == "merkle" else ["MedicalRecord"]
+
+
+class ContractNotDeployedError(RuntimeError):
+    """Nie znaleziono adresu kontraktu w konfiguracji, pamięci podręcznej ani rejestrze."""
+
+
+def registry_key(name: str) -> bytes:
+    """Klucz bytes32 w AddressRegistry: keccak256 nazwy kontraktu."""
+    return Web3.keccak(text=name)
+
+
+def load_cache(path: Path = CONTRACT_ADDRESS_CACHE) -> dict:
+    try:
+        return json.loads(Path(path).read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def save_cached_address(chain_id: int, name: str, address: str, path: Path = CONTRACT_ADDRESS_CACHE) -> None:
+    path = Path(path)
+    cache = load_cache(path)
+    cache.setdefault(str(chain_id), {})[name] = address
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".json.tmp")
+    tmp.write_text(json.dumps(cache, indent=2), encoding="utf-8")
+    tmp.replace(path)
+
+
+def _has_code(w3: Web3, address: str) -> bool:
+    return len(w3.eth.get_code(address)) > 0
+
+
+def _registry(w3: Web3, registry_address: str):
+    return w3.eth.contract(
+        address=Web3.to_checksum_address(registry_address),
+        abi=load_artifact("AddressRegistry").abi,
+    )
+
+
+def resolve_address(
+    w3: Web3,
+    name: str = "MedicalRecord",
+    configured: Optional[str] = None,
+    registry_address: Optional[str] = ADDRESS_REGISTRY_ADDRESS,
+    cache_path: Path = CONTRACT_ADDRESS_CACHE,
+) -> str:
+    """Adres kontraktu name (checksum). Nigdy nie wdraża kontraktu."""
+    configured = configured or CONFIGURED_ADDRESSES.get(name)
+    if configured:
+        return Web3.to_checksum_address(configured)
+
+    chain_id = w3.eth.chain_id
+    cached = load_cache(cache_path).get(str(chain_id), {}).get(name)
+    if cached and _has_code(w3, cached):
+        return Web3.to_checksum_address(cached)
+
+    if registry_address:
+        address = _registry(w3, registry_address).functions.getAddress(registry_key(name)).call()
+        if address != ZERO_ADDRESS and _has_code(w3, address):
+            save_cached_address(chain_id, name, address, cache_path)
+            return Web3.to_checksum_address(address)
+
+    raise ContractNotDeployedError(
+        f"Brak adresu kontraktu {name} dla sieci {chain_id}. "
+        "Ustaw adres w konfiguracji (MEDICAL_RECORD_ADDRESS, MERKLE_ANCHOR_ADDRESS), "
+        "ADDRESS_REGISTRY_ADDRESS albo uruchom: "
+        "python -m vetclinic_api.core.contract_registry bootstrap"
+    )
+
+
+def deployable_artifact(name: str) -> Artifact:
+    """Artefakt z bytecode – artefakt z samym ABI wymaga kompilacji (solc)."""
+    artifact = load_artifact(name)
+    return artifact if artifact.bytecode else compile_contract(name)
+
+
+def deploy(w3: Web3, account: str, name: str) -> str:
+    artifact = deployable_artifact(name)
+    contract_cls = w3.eth.contract(abi=artifact.abi, bytecode=artifact.bytecode)
+    tx_hash = contract_cls.constructor().transact({"from": account})
+    receipt = w3.eth.wait_for_transaction_receipt(tx_hash)
+    return receipt.contractAddress
+
+
+def bootstrap(
+    w3: Web3,
+    account: str,
+    name: str = "MedicalRecord",
+    redeploy: bool = False,
+    registry_address: Optional[str] = ADDRESS_REGISTRY_ADDRESS,
+    cache_path: Path = CONTRACT_ADDRESS_CACHE,
+) -> str:
+    """
+    Zwraca adres istniejącego kontraktu, a gdy go brak (albo redeploy=True)
+    wdraża nowy, zapisuje go w AddressRegistry (jeśli skonfigurowany)
+    i w pamięci podręcznej.
+    """
+    if not redeploy:
+        try:
+            return resolve_address(w3, name, registry_address=registry_address, cache_path=cache_path)
+        except ContractNotDeployedError:
+            pass
+
+    address = deploy(w3, account, name)
+    if registry_address:
+        tx_hash = _registry(w3, registry_address).functions.setAddress(
+            registry_key(name), address
+        ).transact({"from": account})
+        w3.eth.wait_for_transaction_receipt(tx_hash)
+    save_cached_address(w3.eth.chain_id, name, address, cache_path)
+    return address
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = sys.argv[1:] if argv is None else argv
+    action = args[0] if args else "show"
+    w3 = Web3(Web3.HTTPProvider(BLOCKCHAIN_URL))
+    if not w3.is_connected():
+        print(f"Nie można połączyć się z blockchainem pod {BLOCKCHAIN_URL}", file=sys.stderr)
+        return 1
+    if action == "bootstrap":
+        for name in bootstrap_contracts():
+            address = bootstrap(w3, w3.eth.accounts[0], name, redeploy="--redeploy" in args)
+            print(f"{name}: {address}")
+        return 0
+    if action == "show":
+        try:
+            for name in bootstrap_contracts():
+                print(f"{name}: {resolve_address(w3, name)}")
+        except ContractNotDeployedError as exc:
+            print(exc, file=sys.stderr)
+            return 1
+        return 0
+    print("Użycie: python -m vetclinic_api.core.contract_registry [bootstrap [--redeploy]|show]", file=sys.stderr)
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
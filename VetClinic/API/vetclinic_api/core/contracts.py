@@ -0,0 +1,138 @@
+"""
+Artefakty kontraktów (ABI + bytecode) zamiast kompilacji Solidity przy imporcie.
+
+Dawniej import core.blockchain instalował solc, a każdy BlockchainProvider
+kompilował MedicalRecord.sol – w każdym workerze, teście i sesji GUI.
+Teraz ABI i bytecode czytamy z plików:
+
+    <CONTRACT_BUILD_DIR>/<Kontrakt>-<skrót źródła>.json
+
+Skrót to SHA-256 treści pliku .sol (z ujednoliconymi końcami linii), więc
+zmiana źródła automatycznie unieważnia stary artefakt, a kilka wersji może
+leżeć obok siebie. solc (py-solc-x) jest potrzebny tylko wtedy, gdy
+artefaktu dla bieżącego źródła brakuje – i dopiero w tym momencie go
+importujemy. Artefakty zapisuje też services.compile_and_deploy.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+from vetclinic_api.core.config import CONTRACT_BUILD_DIR, SOLC_VERSION
+
+logger = logging.getLogger(__name__)
+
+CONTRACTS_DIR = Path(__file__).resolve().parent.parent / "contracts"
+
+_compile_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class Artifact:
+    name: str
+    abi: list
+    bytecode: Optional[str]
+    source_hash: str
+    compiler: Optional[str] = None
+
+
+def source_hash(source: str) -> str:
+    """Skrót treści kontraktu, niezależny od CRLF/LF (checkout na Windows/Linux)."""
+    normalized = source.replace("\r\n", "\n")
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def source_path(name: str, contracts_dir: Path = CONTRACTS_DIR) -> Path:
+    return contracts_dir / f"{name}.sol"
+
+
+def artifact_path(name: str, digest: str, build_dir: Path = CONTRACT_BUILD_DIR) -> Path:
+    return Path(build_dir) / f"{name}-{digest[:16]}.json"
+
+
+def write_artifact(artifact: Artifact, build_dir: Path = CONTRACT_BUILD_DIR) -> Path:
+    path = artifact_path(artifact.name, artifact.source_hash, build_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "contractName": artifact.name,
+        "sourceHash": artifact.source_hash,
+        "compiler": artifact.compiler,
+        "abi": artifact.abi,
+        "bytecode": artifact.bytecode,
+    }
+    # zapis przez plik tymczasowy – równoległy proces nie przeczyta połowy JSON-a
+    tmp = path.with_suffix(".json.tmp")
+    tmp.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    tmp.replace(path)
+    return path
+
+
+def read_artifact(path: Path) -> Artifact:
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    return Artifact(
+        name=data["contractName"],
+        abi=data["abi"],
+        bytecode=data.get("bytecode"),
+        source_hash=data["sourceHash"],
+        compiler=data.get("compiler"),
+    )
+
+
+def compile_contract(name: str, contracts_dir: Path = CONTRACTS_DIR,
+                     build_dir: Path = CONTRACT_BUILD_DIR, solc_version: str = SOLC_VERSION) -> Artifact:
+    """Kompiluje <name>.sol (solc z py-solc-x) i zapisuje artefakt."""
+    # import dopiero tutaj – bez brakującego artefaktu solc nie jest potrzebny
+    from solcx import compile_standard, install_solc
+
+    source = source_path(name, contracts_dir).read_text(encoding="utf-8")
+    install_solc(solc_version)
+    compiled = compile_standard(
+        {
+            "language": "Solidity",
+            "sources": {f"{name}.sol": {"content": source}},
+            "settings": {"outputSelection": {"*": {"*": ["abi", "evm.bytecode.object"]}}},
+        },
+        solc_version=solc_version,
+    )
+    data = compiled["contracts"][f"{name}.sol"][name]
+    artifact = Artifact(
+        name=name,
+        abi=data["abi"],
+        bytecode=data["evm"]["bytecode"]["object"],
+        source_hash=source_hash(source),
+        compiler=solc_version,
+    )
+    write_artifact(artifact, build_dir)
+    return artifact
+
+
+def find_artifact(name: str, contracts_dir: Path = CONTRACTS_DIR,
+                  build_dir: Path = CONTRACT_BUILD_DIR) -> Optional[Artifact]:
+    """Artefakt dla bieżącej treści <name>.sol albo None."""
+    digest = source_hash(source_path(name, contracts_dir).read_text(encoding="utf-8"))
+    path = artifact_path(name, digest, build_dir)
+    if not path.exists():
+        return None
+    artifact = read_artifact(path)
+    if artifact.source_hash != digest:
+        raise ValueError(f"Artefakt {path} nie pasuje do źródła {name}.sol")
+    return artifact
+
+
+@lru_cache(maxsize=None)
+def load_artifact(name: str) -> Artifact:
+    """ABI + bytecode kontraktu; kompilacja tylko przy braku artefaktu (raz na proces)."""
+    artifact = find_artifact(name)
+    if artifact is not None:
+        return artifact
+    with _compile_lock:
+        artifact = find_artifact(name)
+        if artifact is None:
+            logger.warning("Brak artefaktu %s dla bieżącego źródła – kompiluję (solc %s)", name, SOLC_VERSION)
+            artifact = compile_contract(name)
+        return artifact
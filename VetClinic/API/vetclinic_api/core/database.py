@@ -1,20 +1,133 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
-from vetclinic_api.core.config import DATABASE_URL
+from vetclinic_api.core.config import (
+    DATABASE_URL,
+    DB_POOL_SIZE,
+    DB_MAX_OVERFLOW,
+    DB_POOL_TIMEOUT,
+    DB_POOL_RECYCLE,
+    DB_POOL_PRE_PING,
+    DB_STATEMENT_TIMEOUT_MS,
+    SQLITE_PROFILE,
+    SQLITE_SERIALIZE_WRITES,
+)
+from vetclinic_api.core.sqlite import SerializedWriter, install_sqlite_profile
 
-engine       = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+
+def engine_options(url: str) -> dict:
+    """
+    Zwraca argumenty dla create_engine zależne od backendu.
+    SQLite korzysta z domyślnej puli SQLAlchemy, serwery baz danych
+    (np. PostgreSQL) dostają skonfigurowaną pulę połączeń i timeout zapytań.
+    """
+    backend = make_url(url).get_backend_name()
+
+    if backend == "sqlite":
+        return {"connect_args": {"check_same_thread": False}}
+
+    options = {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+    if backend == "postgresql" and DB_STATEMENT_TIMEOUT_MS > 0:
+        options["connect_args"] = {
+            "options": f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}"
+        }
+    return options
+
+
+def build_engine(url: str = DATABASE_URL, sqlite_profile: bool = SQLITE_PROFILE, **overrides):
+    """
+    Tworzy silnik SQLAlchemy dla podanego URL z opcjami z konfiguracji
+    (overrides nadpisują pojedyncze opcje, np. pool_size).
+    Dla SQLite (przy włączonym profilu) każde połączenie dostaje PRAGMA z core.sqlite.
+    """
+    eng = create_engine(url, **{**engine_options(url), **overrides})
+    if sqlite_profile and eng.dialect.name == "sqlite":
+        install_sqlite_profile(eng)
+    return eng
+
+
+engine       = build_engine()
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base         = declarative_base()
 
-# Importujemy modele, by metadata zawierało ich definicje
+# Sterowniki asynchroniczne dla wspieranych backendów
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+
+def async_url(url: str) -> str:
+    """Zamienia URL synchroniczny (np. sqlite:///...) na wariant z async sterownikiem."""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"Brak asynchronicznego sterownika dla bazy {backend!r}")
+    return parsed.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+
+def build_async_engine(url: str = DATABASE_URL, sqlite_profile: bool = SQLITE_PROFILE, **overrides):
+    """
+    Tworzy AsyncEngine (aiosqlite / asyncpg) z tymi samymi ustawieniami puli
+    co build_engine. Profil PRAGMA dla SQLite podpinamy pod sync_engine.
+    """
+    options = engine_options(url)
+    backend = make_url(url).get_backend_name()
+    if backend == "sqlite":
+        options.pop("connect_args", None)
+    elif backend == "postgresql" and "connect_args" in options:
+        # asyncpg nie zna parametru "options" – timeout idzie przez server_settings
+        options["connect_args"] = {
+            "server_settings": {"statement_timeout": str(DB_STATEMENT_TIMEOUT_MS)}
+        }
+    eng = create_async_engine(async_url(url), **{**options, **overrides})
+    if sqlite_profile and backend == "sqlite":
+        install_sqlite_profile(eng.sync_engine)
+    return eng
+
+
+# Silnik async tworzymy leniwie – GUI i skrypty nie potrzebują aiosqlite/asyncpg
+_async_engine = None
+_AsyncSessionLocal = None
+
+
+def get_async_sessionmaker() -> async_sessionmaker:
+    """Zwraca (przy pierwszym wywołaniu tworzy) fabrykę AsyncSession."""
+    global _async_engine, _AsyncSessionLocal
+    if _AsyncSessionLocal is None:
+        _async_engine = build_async_engine()
+        _AsyncSessionLocal = async_sessionmaker(
+            bind=_async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+        )
+    return _AsyncSessionLocal
+
+
+# SQLite ma jednego pisarza naraz – kolejkujemy zapisy zamiast "database is locked"
+write_queue = None
+if engine.dialect.name == "sqlite" and SQLITE_SERIALIZE_WRITES:
+    write_queue = SerializedWriter()
+    write_queue.install(SessionLocal)
+
+# Importujemy modele, by metadata zawierało ich definicje (bez DDL)
 import vetclinic_api.models.animals
 import vetclinic_api.models.appointments
 import vetclinic_api.models.medical_records
 import vetclinic_api.models.users
 import vetclinic_api.models.facility
+import vetclinic_api.models.invoice
+import vetclinic_api.models.weight_logs
+import vetclinic_api.models.email_outbox
+import vetclinic_api.models.anchor_queue
+import vetclinic_api.models.anchor_batch
 
-# Tworzymy wszystkie tabele w produkcyjnej bazie
-Base.metadata.create_all(bind=engine)
+# Schematu nie tworzymy tutaj – służy do tego vetclinic_api.core.schema (bootstrap)
 
 def get_db():
     """Funkcja zależności, która tworzy sesję bazy danych i ją zamyka po wykorzystaniu."""
@@ -23,3 +136,9 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    """Asynchroniczny odpowiednik get_db – dla endpointów async (głównie odczyty)."""
+    async with get_async_sessionmaker()() as db:
+        yield db
@@ -0,0 +1,141 @@
+"""
+Kodowanie odpowiedzi list i negocjacja formatu (nagłówek Accept).
+
+- JSON (domyślnie) kodowany przez orjson – domyślna klasa odpowiedzi aplikacji,
+- MessagePack (application/msgpack) – zwarty format binarny; wymaga pakietu
+  msgpack, bez niego serwer po prostu go nie oferuje,
+- NDJSON (application/x-ndjson) – eksport całej listy strumieniem: wiersze
+  czytamy kursorem po stronie serwera (yield_per) i wysyłamy partiami,
+  więc zużycie pamięci nie zależy od liczby wierszy.
+"""
+
+from datetime import date, datetime, time
+from decimal import Decimal
+from enum import Enum
+from typing import Callable, Optional, Sequence
+
+import orjson
+from fastapi import Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from vetclinic_api.core.fields import pick
+from vetclinic_api.core.pagination import Page
+
+try:
+    import msgpack
+except ImportError:  # kodowanie opcjonalne
+    msgpack = None
+
+JSON = "application/json"
+MSGPACK = "application/msgpack"
+NDJSON = "application/x-ndjson"
+
+# Ile wierszy pobiera kursor serwera (i wysyłamy w jednym kawałku strumienia)
+STREAM_BATCH = 500
+
+
+def _default(value):
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        # jak Pydantic: Decimal jako tekst, bez utraty precyzji
+        return str(value)
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"Nie można zakodować {type(value).__name__}")
+
+
+def dumps(data, media_type: str = JSON) -> bytes:
+    """Koduje słowniki/listy do JSON (orjson) albo MessagePack."""
+    if media_type == MSGPACK:
+        return msgpack.packb(data, default=_default, use_bin_type=True)
+    return orjson.dumps(data, default=_default)
+
+
+def negotiate(request: Request, offered: Sequence[str] = (JSON, MSGPACK)) -> str:
+    """
+    Wybiera format z nagłówka Accept (z uwzględnieniem q=). Przy remisie
+    wygrywa kolejność offered; brak nagłówka lub nieobsługiwany typ -> JSON.
+    """
+    offered = [m for m in offered if m != MSGPACK or msgpack is not None]
+    accept = request.headers.get("accept")
+    if not accept:
+        return JSON
+
+    best, best_q = JSON, 0.0
+    for media_type in offered:
+        kind = media_type.split("/")[0]
+        q = 0.0
+        for part in accept.split(","):
+            mime, _, params = part.strip().partition(";")
+            mime = mime.strip().lower()
+            if mime not in (media_type, f"{kind}/*", "*/*"):
+                continue
+            weight = 1.0
+            for param in params.split(";"):
+                name, _, value = param.strip().partition("=")
+                if name == "q":
+                    try:
+                        weight = float(value)
+                    except ValueError:
+                        weight = 0.0
+            # dokładne dopasowanie jest ważniejsze niż */*
+            q = max(q, weight if mime == media_type else weight - 1e-3)
+        if q > best_q:
+            best, best_q = media_type, q
+    return best
+
+
+def encoded_response(page: Page, data: list, media_type: str = JSON) -> Response:
+    """
+    Odpowiedź z gotowych słowników, z pominięciem response_model.
+    Przenosi nagłówki stronicowania ustawione przez page.finish().
+    """
+    headers = {k: v for k, v in page.response.headers.items()
+               if k.lower() not in ("content-length", "content-type")}
+    headers["Vary"] = "Accept"
+    return Response(dumps(data, media_type), media_type=media_type, headers=headers)
+
+
+def respond(page: Page, data: list, schema: Optional[type[BaseModel]] = None,
+            fields: Sequence[str] = (), lean: bool = False):
+    """
+    Wspólne zakończenie endpointów listujących:
+    - JSON bez fields i lean: zwraca data – waliduje response_model, koduje orjson,
+    - fields (wiersze ORM -> pick), lean albo inny format niż JSON: koduje sam,
+      bez walidacji response_model; wiersze ORM serializuje raz schematem
+      schema, bez schema data muszą być gotowymi słownikami (np. z embed).
+    Listy ze schematem *Expanded przekazują lean=True – inaczej response_model
+    walidowałby każdy wiersz drugi raz (i sięgał po niezaładowane relacje).
+    """
+    media_type = negotiate(page.request)
+    lean = lean or bool(fields)
+    if media_type == JSON and not lean:
+        return data
+    if fields:
+        data = [pick(row, fields) for row in data]
+    elif schema is not None:
+        data = [schema.model_validate(row, from_attributes=True).model_dump() for row in data]
+    return encoded_response(page, data, media_type)
+
+
+def ndjson_response(db: AsyncSession, stmt, to_dict: Callable) -> StreamingResponse:
+    """
+    Strumień NDJSON z wyników zapytania stmt (kursor serwera, partie po
+    STREAM_BATCH wierszy); to_dict zamienia wiersz na słownik.
+
+    Sesja z zależności FastAPI jest zamykana przed wysłaniem odpowiedzi,
+    dlatego strumień otwiera własną sesję na tym samym silniku.
+    """
+    bind = db.bind
+    stmt = stmt.execution_options(yield_per=STREAM_BATCH)
+
+    async def body():
+        async with AsyncSession(bind, expire_on_commit=False) as session:
+            result = await session.stream_scalars(stmt)
+            async for batch in result.partitions():
+                yield b"".join(orjson.dumps(to_dict(row), default=_default) + b"\n" for row in batch)
+
+    return StreamingResponse(body(), media_type=NDJSON, headers={"Vary": "Accept"})
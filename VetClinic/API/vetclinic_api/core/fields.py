@@ -0,0 +1,58 @@
+"""
+Wybór pól w odpowiedziach list (?fields=id,first_name,last_name).
+
+- parse_fields: sprawdza nazwy względem schematu odpowiedzi (nieznane -> 400),
+- only: opcje load_only – SELECT pobiera tylko wybrane kolumny (plus klucz
+  sortowania i klucze obce potrzebne do ?include=),
+- pick: słowniki budowane prosto z atrybutów wiersza, bez walidacji modelem
+  Pydantic dla każdego wiersza (kodowanie odpowiedzi: core.encoding).
+
+Bez fields endpointy działają jak dotąd (pełny schemat odpowiedzi).
+Wartości w trybie fields są surowe z bazy (np. pusty backup_email zostaje "").
+"""
+
+from typing import Optional, Sequence
+
+from fastapi import HTTPException, status
+from pydantic import BaseModel
+from sqlalchemy import inspect
+from sqlalchemy.orm import load_only
+
+
+def parse_fields(fields: Optional[str], schema: type[BaseModel]) -> tuple[str, ...]:
+    """Zamienia "id, name" na krotkę nazw pól schematu; nieznane pola -> 400."""
+    if not fields:
+        return ()
+    names = tuple(dict.fromkeys(n.strip() for n in fields.split(",") if n.strip()))
+    unknown = [n for n in names if n not in schema.model_fields]
+    if unknown:
+        raise HTTPException(
+            status.HTTP_400_BAD_REQUEST,
+            f"Nieznane pola w fields: {', '.join(unknown)}. "
+            f"Dozwolone: {', '.join(schema.model_fields)}",
+        )
+    return names
+
+
+def only(model, names: Sequence[str], include: Sequence[str] = (), key: Sequence = ()) -> list:
+    """
+    Opcja load_only dla wybranych pól modelu. Dokłada kolumny klucza
+    paginacji (key) oraz kolumny, po których łączą się relacje z include –
+    inaczej dostęp do nich wywołałby dodatkowe zapytanie (lazy-load).
+    Pola schematu bez kolumny w modelu są pomijane (pick zwróci None).
+    """
+    if not names:
+        return []
+    mapper = inspect(model)
+    wanted = {n for n in names if n in mapper.column_attrs}
+    wanted.update(c.key for c in key)
+    for name in include:
+        wanted.update(mapper.get_property_by_column(c).key
+                      for c in mapper.relationships[name].local_columns)
+    return [load_only(*(getattr(model, n) for n in sorted(wanted)))]
+
+
+def pick(row, names: Sequence[str]) -> dict:
+    """Wybrane pola wiersza jako słownik – bez walidacji schematem."""
+    return {name: getattr(row, name, None) for name in names}
+
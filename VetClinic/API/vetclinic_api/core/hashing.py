@@ -0,0 +1,182 @@
+"""
+Haszowanie i weryfikacja haseł (bcrypt) poza wątkami obsługującymi żądania.
+
+bcrypt celowo zajmuje CPU przez dziesiątki milisekund. Liczony w puli wątków
+FastAPI przy burzy logowań (np. otwarcie przychodni) blokował wszystkie wątki
+i spowalniał niezwiązane endpointy. Dlatego:
+- obliczenia idą do ograniczonej puli procesów (PASSWORD_HASH_WORKERS),
+- liczba operacji w toku jest limitowana (workers + PASSWORD_HASH_QUEUE);
+  nadmiarowe od razu dostają HashingOverloaded (API: 503 + Retry-After),
+- pula uszkodzona przez śmierć procesu (OOM, kill) jest odtwarzana, a operacja
+  ponawiana raz – inaczej każde kolejne logowanie kończyłoby się błędem 500,
+- PasswordHasher.metrics() zwraca liczniki dla /metrics/hashing.
+"""
+
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+
+from passlib.context import CryptContext
+
+from vetclinic_api.core.config import (
+    PASSWORD_HASH_QUEUE,
+    PASSWORD_HASH_TIMEOUT,
+    PASSWORD_HASH_WORKERS,
+)
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+# Funkcje wykonywane w procesach puli (muszą być dostępne przez import)
+def _hash(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+def _verify(password: str, hashed: str) -> bool:
+    return pwd_context.verify(password, hashed)
+
+
+class HashingOverloaded(RuntimeError):
+    """Pula haszowania jest pełna albo nie odpowiedziała na czas."""
+
+
+class PasswordHasher:
+    """
+    Ograniczona pula procesów dla bcrypt z kontrolą przyjęć.
+
+    Slot (semafor) zajmujemy przed zleceniem i zwalniamy dopiero, gdy
+    proces skończy – także po przekroczeniu timeoutu, więc limit odpowiada
+    rzeczywistej liczbie operacji w puli. Procesy startują leniwie
+    (kontekst "spawn" – bez dziedziczenia wątków i połączeń z bazą).
+    """
+
+    def __init__(self, workers: int = PASSWORD_HASH_WORKERS, queue_limit: int = PASSWORD_HASH_QUEUE,
+                 timeout: float = PASSWORD_HASH_TIMEOUT):
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max(workers, 1) + queue_limit)
+        self._lock = threading.Lock()
+        self._executor = None
+        self._in_flight = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._timeouts = 0
+        self._total_seconds = 0.0
+        self._max_seconds = 0.0
+
+    def _pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    self.workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+    def _discard_pool(self, executor: ProcessPoolExecutor) -> None:
+        """Porzuca uszkodzoną pulę; następne zlecenie utworzy nową."""
+        with self._lock:
+            if self._executor is not executor:
+                return  # inny wątek już ją wymienił
+            self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _finish(self, started: float, failed: bool = False) -> None:
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self._in_flight -= 1
+            if failed:
+                self._failed += 1
+            else:
+                self._completed += 1
+                self._total_seconds += elapsed
+                self._max_seconds = max(self._max_seconds, elapsed)
+        self._slots.release()
+
+    def _run(self, fn, *args, retry: bool = True):
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            raise HashingOverloaded("Zbyt wiele równoczesnych operacji na hasłach – spróbuj ponownie")
+        started = time.perf_counter()
+        with self._lock:
+            self._in_flight += 1
+
+        if self.workers <= 0:
+            try:
+                result = fn(*args)
+            except BaseException:
+                self._finish(started, failed=True)
+                raise
+            self._finish(started)
+            return result
+
+        executor = self._pool()
+        try:
+            future = executor.submit(fn, *args)
+        except BaseException as exc:
+            self._finish(started, failed=True)
+            if not isinstance(exc, BrokenProcessPool):
+                raise
+            return self._retry_broken(executor, fn, args, retry)
+        future.add_done_callback(
+            lambda f: self._finish(started, failed=f.cancelled() or f.exception() is not None)
+        )
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeout:
+            with self._lock:
+                self._timeouts += 1
+            raise HashingOverloaded("Haszowanie hasła trwa zbyt długo – spróbuj ponownie")
+        except BrokenProcessPool:
+            return self._retry_broken(executor, fn, args, retry)
+
+    def _retry_broken(self, executor: ProcessPoolExecutor, fn, args: tuple, retry: bool):
+        # proces puli zginął – pula jest bezużyteczna, tworzymy nową i ponawiamy raz
+        self._discard_pool(executor)
+        if not retry:
+            raise HashingOverloaded("Pula haszowania jest uruchamiana ponownie – spróbuj ponownie")
+        return self._run(fn, *args, retry=False)
+
+    def hash(self, password: str) -> str:
+        return self._run(_hash, password)
+
+    def verify(self, password: str, hashed: str) -> bool:
+        return self._run(_verify, password, hashed)
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "capacity": max(self.workers, 1) + self.queue_limit,
+                "in_flight": self._in_flight,
+                "completed": self._completed,
+                "failed": self._failed,
+                "rejected": self._rejected,
+                "timeouts": self._timeouts,
+                "avg_ms": self._total_seconds / self._completed * 1000 if self._completed else 0.0,
+                "max_ms": self._max_seconds * 1000,
+            }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+hasher = PasswordHasher()
+
+
+def hash_password(password: str) -> str:
+    """Hash bcrypt hasła, liczony w puli procesów."""
+    return hasher.hash(password)
+
+
+def verify_password(password: str, hashed: str) -> bool:
+    """Sprawdza hasło względem hasha bcrypt, w puli procesów."""
+    return hasher.verify(password, hashed)
@@ -0,0 +1,55 @@
+"""
+Osadzanie powiązanych encji w odpowiedziach list (?include=doctor,owner,...).
+
+Relacje ładujemy przez selectinload: jedno dodatkowe zapytanie na relację
+(WHERE id IN (...)), więc strona kosztuje stałą liczbę zapytań niezależnie
+od liczby wierszy – bez N+1 po stronie serwera i klienta.
+"""
+
+from typing import Mapping, Optional, Sequence
+
+from fastapi import HTTPException, status
+from pydantic import BaseModel
+from sqlalchemy.orm import selectinload
+
+from vetclinic_api.core.fields import pick
+
+
+def parse_include(include: Optional[str], relations: Mapping[str, type[BaseModel]]) -> tuple[str, ...]:
+    """Zamienia "doctor, owner" na krotkę nazw; nieznane relacje -> 400."""
+    if not include:
+        return ()
+    names = tuple(dict.fromkeys(n.strip() for n in include.split(",") if n.strip()))
+    unknown = [n for n in names if n not in relations]
+    if unknown:
+        raise HTTPException(
+            status.HTTP_400_BAD_REQUEST,
+            f"Nieznane relacje w include: {', '.join(unknown)}. "
+            f"Dozwolone: {', '.join(relations)}",
+        )
+    return names
+
+
+def eager(model, names: Sequence[str]) -> list:
+    """Opcje selectinload dla podanych relacji modelu."""
+    return [selectinload(getattr(model, name)) for name in names]
+
+
+def embed(row, schema: type[BaseModel], relations: Mapping[str, type[BaseModel]],
+          names: Sequence[str], fields: Sequence[str] = ()) -> dict:
+    """
+    Serializuje wiersz schematem bazowym (albo tylko wybrane pola – fields)
+    i dokleja wybrane (już załadowane) relacje. Niewybranych relacji nie
+    dotykamy – nie wywołujemy lazy-load.
+    """
+    data = pick(row, fields) if fields else schema.model_validate(row).model_dump()
+    for name in names:
+        value = getattr(row, name)
+        related = relations[name]
+        if value is None:
+            data[name] = None
+        elif isinstance(value, list):
+            data[name] = [related.model_validate(v).model_dump() for v in value]
+        else:
+            data[name] = related.model_validate(value).model_dump()
+    return data
@@ -0,0 +1,118 @@
+"""
+Klucze podpisujące tokeny JWT, wspólne dla wszystkich procesów API.
+
+Klucze pochodzą z konfiguracji (JWT_KEYS_FILE albo JWT_KEYS – JSON),
+więc każdy worker uvicorna i każda replika podpisuje i weryfikuje tym samym
+zestawem. Format:
+
+    [{"kid": "2025-06", "secret": "...", "not_before": "2025-06-01T00:00:00Z",
+      "not_after": "2025-07-01T02:00:00Z"}, ...]
+
+- not_before: od kiedy klucz PODPISUJE nowe tokeny (brak = od zawsze);
+  z kilku aktywnych podpisuje ten z najpóźniejszym not_before,
+- not_after: do kiedy klucz jest akceptowany przy weryfikacji (brak = bez końca).
+
+Rotacja z zakładką: nowy klucz dodajemy wcześniej z przyszłym not_before,
+a staremu ustawiamy not_after co najmniej o czas życia tokenu później.
+Przez ten okres oba klucze weryfikują, a podpisuje już tylko nowy. Klucz
+spoza okna not_before nadal weryfikuje – procesy z przesuniętym zegarem
+mogą zacząć podpisywać nim chwilę wcześniej.
+
+Bez JWT_KEYS* używamy SECRET_KEY z konfiguracji jako jedynego klucza
+(kid "default"). Domyślny SECRET_KEY z repozytorium nigdy nie podpisuje
+tokenów – bez konfiguracji każdy proces losuje własny klucz (jak dawniej
+security.py), więc tokeny nie są wtedy wspólne dla workerów.
+"""
+
+import datetime
+import json
+import logging
+import secrets
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+from vetclinic_api.core import config
+
+logger = logging.getLogger(__name__)
+
+
+def _parse_time(value: Optional[str]) -> Optional[datetime.datetime]:
+    if value is None:
+        return None
+    moment = datetime.datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=datetime.timezone.utc)
+    return moment
+
+
+@dataclass(frozen=True)
+class SigningKey:
+    kid: str
+    secret: str
+    not_before: Optional[datetime.datetime] = None
+    not_after: Optional[datetime.datetime] = None
+
+    def verifies_at(self, now: datetime.datetime) -> bool:
+        return self.not_after is None or now < self.not_after
+
+    def signs_at(self, now: datetime.datetime) -> bool:
+        return (self.not_before is None or self.not_before <= now) and self.verifies_at(now)
+
+
+class KeyRing:
+    """Zestaw kluczy z identyfikatorami (kid) i oknami ważności."""
+
+    def __init__(self, keys: Iterable[SigningKey]):
+        self.keys = {}
+        for key in keys:
+            if not key.kid or not key.secret:
+                raise ValueError("Każdy klucz JWT musi mieć kid i secret")
+            if key.kid in self.keys:
+                raise ValueError(f"Powtórzony kid klucza JWT: {key.kid}")
+            self.keys[key.kid] = key
+        if not self.keys:
+            raise ValueError("Pusty zestaw kluczy JWT")
+
+    @classmethod
+    def from_json(cls, raw: str) -> "KeyRing":
+        entries = json.loads(raw)
+        if isinstance(entries, dict):
+            entries = entries.get("keys", [])
+        return cls(
+            SigningKey(
+                kid=str(e["kid"]),
+                secret=e["secret"],
+                not_before=_parse_time(e.get("not_before")),
+                not_after=_parse_time(e.get("not_after")),
+            )
+            for e in entries
+        )
+
+    def signing_key(self, now: Optional[datetime.datetime] = None) -> SigningKey:
+        """Klucz do podpisywania nowych tokenów w chwili now."""
+        now = now or datetime.datetime.now(datetime.timezone.utc)
+        active = [k for k in self.keys.values() if k.signs_at(now)]
+        if not active:
+            raise RuntimeError("Brak aktywnego klucza do podpisywania tokenów JWT")
+        return max(active, key=lambda k: k.not_before or datetime.datetime.min.replace(tzinfo=datetime.timezone.utc))
+
+    def verification_key(self, kid: Optional[str], now: Optional[datetime.datetime] = None) -> Optional[SigningKey]:
+        """Klucz o danym kid, jeśli wciąż jest akceptowany; inaczej None."""
+        key = self.keys.get(kid) if kid is not None else None
+        now = now or datetime.datetime.now(datetime.timezone.utc)
+        if key is None or not key.verifies_at(now):
+            return None
+        return key
+
+
+def load_keyring() -> KeyRing:
+    """Zestaw kluczy z JWT_KEYS_FILE, JWT_KEYS albo (awaryjnie) SECRET_KEY."""
+    if config.JWT_KEYS_FILE:
+        with open(config.JWT_KEYS_FILE, encoding="utf-8") as fh:
+            return KeyRing.from_json(fh.read())
+    if config.JWT_KEYS:
+        return KeyRing.from_json(config.JWT_KEYS)
+    if config.SECRET_KEY == config.DEFAULT_SECRET_KEY:
+        logger.warning("Brak JWT_KEYS i SECRET_KEY – tokeny JWT podpisuje losowy klucz tego procesu")
+        return KeyRing([SigningKey(kid="default", secret=secrets.token_hex(32))])
+    return KeyRing([SigningKey(kid="default", secret=config.SECRET_KEY)])
@@ -0,0 +1,66 @@
+"""
+Drzewo Merkle dla partii hashy rekordów (services.anchor_service, tryb "merkle").
+
+Zamiast jednej transakcji addRecord na wizytę/rekord zapisujemy on-chain
+tylko korzeń drzewa (MerkleAnchor.anchorRoot), a w bazie – dowód
+przynależności każdego liścia. Rekord da się zweryfikować offline:
+verify(leaf_hash(...), proof, root) i sprawdzenie, że root jest w kontrakcie.
+
+Schemat (zgodny z MerkleAnchor.verify):
+- liść:  keccak256(0x00 || "<kind>:<op>:<record_id>:<data_hash>"),
+- węzeł: keccak256(0x01 || min(a, b) || max(a, b)) – pary sortowane, więc
+  dowód to sama lista sąsiadów (bez kierunków),
+- nieparzysty ostatni węzeł poziomu przechodzi wyżej bez zmian.
+Różne prefiksy liścia i węzła wykluczają podszycie węzła pod liść.
+"""
+
+from typing import Optional, Sequence
+
+from eth_utils import keccak
+
+LEAF_PREFIX = b"\x00"
+NODE_PREFIX = b"\x01"
+
+
+def leaf_hash(kind: str, op: str, record_id: int, data_hash: Optional[str]) -> bytes:
+    return keccak(LEAF_PREFIX + f"{kind}:{op}:{record_id}:{data_hash or ''}".encode("utf-8"))
+
+
+def node_hash(a: bytes, b: bytes) -> bytes:
+    return keccak(NODE_PREFIX + min(a, b) + max(a, b))
+
+
+def build_levels(leaves: Sequence[bytes]) -> list[list[bytes]]:
+    """Poziomy drzewa od liści do korzenia (ostatni poziom ma jeden element)."""
+    if not leaves:
+        raise ValueError("Drzewo Merkle wymaga co najmniej jednego liścia")
+    levels = [list(leaves)]
+    while len(levels[-1]) > 1:
+        level = levels[-1]
+        parents = [node_hash(level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)]
+        if len(level) % 2:
+            parents.append(level[-1])
+        levels.append(parents)
+    return levels
+
+
+def root(levels: list[list[bytes]]) -> bytes:
+    return levels[-1][0]
+
+
+def proof(levels: list[list[bytes]], index: int) -> list[bytes]:
+    """Sąsiedzi liścia index na kolejnych poziomach."""
+    path = []
+    for level in levels[:-1]:
+        sibling = index ^ 1
+        if sibling < len(level):
+            path.append(level[sibling])
+        index //= 2
+    return path
+
+
+def verify(leaf: bytes, path: Sequence[bytes], expected_root: bytes) -> bool:
+    node = leaf
+    for sibling in path:
+        node = node_hash(node, sibling)
+    return node == expected_root
@@ -0,0 +1,123 @@
+"""
+Paginacja kursorowa (keyset) dla endpointów listujących.
+
+Zamiast OFFSET (koszt rośnie liniowo z numerem strony) filtrujemy po kluczu
+sortowania ostatniego wiersza poprzedniej strony:
+
+    WHERE (visit_datetime, id) > (:v, :id) ORDER BY visit_datetime, id LIMIT :n
+
+Klucz trafia do klienta jako nieprzezroczysty token w nagłówkach
+X-Next-Cursor i Link (rel="next"); treść odpowiedzi pozostaje listą.
+Parametr skip działa dalej (zgodność wsteczna), ale kursor ma pierwszeństwo.
+"""
+
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from typing import Optional, Sequence
+
+from fastapi import HTTPException, Query, Request, Response, status
+from sqlalchemy import bindparam, tuple_
+
+MAX_PAGE_SIZE = 1000
+
+
+class InvalidCursor(ValueError):
+    """Token kursora jest uszkodzony albo nie pasuje do klucza sortowania."""
+
+
+def encode_cursor(values: Sequence) -> str:
+    """Zamienia wartości klucza sortowania na token base64url."""
+    payload = [v.isoformat() if isinstance(v, (date, datetime)) else v for v in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token: str, columns: Sequence) -> tuple:
+    """Odtwarza wartości klucza z tokenu, sprawdzając typy względem kolumn."""
+    try:
+        raw = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+    except (binascii.Error, ValueError) as exc:
+        raise InvalidCursor("Nieprawidłowy kursor") from exc
+    if not isinstance(raw, list) or len(raw) != len(columns):
+        raise InvalidCursor("Kursor nie pasuje do tej listy")
+
+    values = []
+    for column, value in zip(columns, raw):
+        python_type = column.type.python_type
+        try:
+            if python_type in (datetime, date):
+                value = python_type.fromisoformat(value)
+            elif not isinstance(value, python_type):
+                raise TypeError
+        except (TypeError, ValueError) as exc:
+            raise InvalidCursor("Kursor nie pasuje do tej listy") from exc
+        values.append(value)
+    return tuple(values)
+
+
+def keyset(stmt, columns: Sequence, after: Optional[tuple] = None,
+           skip: int = 0, limit: Optional[int] = None):
+    """
+    Dokłada do zapytania stabilne sortowanie po columns oraz warunek
+    "za kursorem" (after) albo OFFSET (skip), a na końcu LIMIT.
+    """
+    stmt = stmt.order_by(*columns)
+    if after is not None:
+        if len(columns) == 1:
+            stmt = stmt.where(columns[0] > after[0])
+        else:
+            params = [bindparam(None, v, type_=c.type) for c, v in zip(columns, after)]
+            stmt = stmt.where(tuple_(*columns) > tuple_(*params))
+    elif skip:
+        stmt = stmt.offset(skip)
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return stmt
+
+
+class Page:
+    """
+    Zależność FastAPI z parametrami stronicowania. Router pobiera
+    fetch_limit wierszy (o jeden więcej niż limit), a finish() przycina
+    listę i ustawia nagłówki z tokenem następnej strony.
+    """
+
+    def __init__(
+        self,
+        request: Request,
+        response: Response,
+        cursor: Optional[str] = Query(None, description="Token z nagłówka X-Next-Cursor"),
+        skip: int = Query(0, ge=0, description="Przesunięcie (zamiast kursora)"),
+        limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    ):
+        self.request = request
+        self.response = response
+        self.cursor = cursor
+        self.skip = skip
+        self.limit = limit
+
+    @property
+    def fetch_limit(self) -> int:
+        return self.limit + 1
+
+    def after(self, columns: Sequence) -> Optional[tuple]:
+        if self.cursor is None:
+            return None
+        try:
+            return decode_cursor(self.cursor, columns)
+        except InvalidCursor as exc:
+            raise HTTPException(status.HTTP_400_BAD_REQUEST, str(exc))
+
+    def finish(self, rows: Sequence, columns: Sequence) -> list:
+        rows = list(rows)
+        if len(rows) > self.limit:
+            rows = rows[: self.limit]
+            token = encode_cursor([getattr(rows[-1], c.key) for c in columns])
+            next_url = self.request.url.remove_query_params("skip").include_query_params(
+                cursor=token, limit=self.limit
+            )
+            self.response.headers["X-Next-Cursor"] = token
+            self.response.headers["Link"] = f'<{next_url}>; rel="next"'
+        return rows
@@ -0,0 +1,213 @@
+"""
+Limity żądań dla kosztownych endpointów (token bucket, middleware ASGI).
+
+Każda grupa tras ma własny budżet: pojemność (burst) i tempo uzupełniania
+(rate, żetonów na sekundę). Budżet liczymy osobno dla każdego klienta
+(adres IP), kluczem jest "grupa:klient". Gdy żetonów brak, middleware od
+razu odpowiada 429 z nagłówkiem Retry-After – żądanie nie dochodzi do
+bcrypt, blockchaina ani bramki płatności.
+
+Backendy:
+- memory: słownik w procesie; operacje wykonujemy w pętli zdarzeń bez
+  żadnego await pomiędzy odczytem a zapisem, więc nie potrzeba blokad,
+- sqlite: plik wspólny dla wszystkich workerów na jednej maszynie
+  (RATE_LIMIT_DB); pobranie żetonu to jedna krótka transakcja
+  BEGIN IMMEDIATE, wykonywana poza pętlą zdarzeń.
+
+Grupy i ich budżety: DEFAULT_GROUPS, nadpisywane przez RATE_LIMITS (JSON),
+np. {"login": {"rate": 1, "burst": 5}}.
+"""
+
+import json
+import math
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, replace
+from typing import Optional, Sequence
+
+import anyio
+import orjson
+
+from vetclinic_api.core.config import (
+    RATE_LIMIT_BACKEND,
+    RATE_LIMIT_DB,
+    RATE_LIMIT_ENABLED,
+    RATE_LIMIT_MAX_KEYS,
+    RATE_LIMITS,
+)
+
+
+@dataclass(frozen=True)
+class RouteGroup:
+    name: str
+    pattern: str
+    rate: float
+    burst: float
+    methods: Optional[frozenset] = None  # None = każda metoda
+
+    def matches(self, method: str, path: str) -> bool:
+        return (self.methods is None or method in self.methods) and re.match(self.pattern, path) is not None
+
+
+DEFAULT_GROUPS = (
+    # bcrypt przy każdej próbie
+    RouteGroup("login", r"^/users/login/?$", rate=0.5, burst=10, methods=frozenset({"POST"})),
+    # wizyta = faktura + zapis w blockchainie
+    RouteGroup("appointments_create", r"^/appointments/?$", rate=1, burst=20, methods=frozenset({"POST"})),
+    # jedno wywołanie kontraktu na każdy rekord właściciela
+    RouteGroup("blockchain_owner", r"^/blockchain/records-by-owner/", rate=1, burst=10,
+               methods=frozenset({"GET"})),
+    # wychodzące żądania HTTP do Stripe/PayU
+    RouteGroup("payments", r"^/payments/", rate=0.5, burst=10),
+)
+
+
+def configured_groups(groups: Sequence[RouteGroup] = DEFAULT_GROUPS,
+                      overrides: Optional[str] = RATE_LIMITS) -> tuple[RouteGroup, ...]:
+    """Grupy z budżetami nadpisanymi przez JSON z konfiguracji."""
+    budgets = json.loads(overrides) if overrides else {}
+    return tuple(
+        replace(g, **{k: float(v) for k, v in budgets.get(g.name, {}).items() if k in ("rate", "burst")})
+        for g in groups
+    )
+
+
+def _refill(tokens: float, updated: float, now: float, rate: float, burst: float) -> float:
+    return min(burst, tokens + max(0.0, now - updated) * rate)
+
+
+def _retry_after(tokens: float, rate: float) -> float:
+    return (1 - tokens) / rate if rate > 0 else math.inf
+
+
+class MemoryBackend:
+    """Kubełki w pamięci procesu; wywołania tylko z pętli zdarzeń."""
+
+    def __init__(self, max_keys: int = RATE_LIMIT_MAX_KEYS, clock=time.monotonic):
+        self.max_keys = max_keys
+        self.clock = clock
+        self._buckets: dict[str, list] = {}
+
+    async def take(self, key: str, rate: float, burst: float) -> float:
+        """Pobiera żeton; zwraca 0, albo ile sekund czekać na następny."""
+        now = self.clock()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if len(self._buckets) >= self.max_keys:
+                # najdawniej utworzony kubełek (słownik zachowuje kolejność)
+                del self._buckets[next(iter(self._buckets))]
+            bucket = self._buckets[key] = [float(burst), now]
+        tokens = _refill(bucket[0], bucket[1], now, rate, burst)
+        if tokens < 1:
+            bucket[0], bucket[1] = tokens, now
+            return _retry_after(tokens, rate)
+        bucket[0], bucket[1] = tokens - 1, now
+        return 0.0
+
+    def reset(self) -> None:
+        self._buckets.clear()
+
+
+class SQLiteBackend:
+    """Kubełki we wspólnym pliku SQLite – jeden budżet dla wielu workerów."""
+
+    def __init__(self, path: str = RATE_LIMIT_DB, clock=time.time):
+        self.path = path
+        self.clock = clock
+        self._local = threading.local()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=OFF")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS rate_buckets "
+                "(key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+            )
+            self._local.conn = conn
+        return conn
+
+    def take_sync(self, key: str, rate: float, burst: float) -> float:
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            now = self.clock()
+            row = conn.execute("SELECT tokens, updated FROM rate_buckets WHERE key = ?", (key,)).fetchone()
+            tokens = _refill(*row, now, rate, burst) if row else float(burst)
+            wait = 0.0 if tokens >= 1 else _retry_after(tokens, rate)
+            if not wait:
+                tokens -= 1
+            conn.execute(
+                "INSERT INTO rate_buckets (key, tokens, updated) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET tokens = excluded.tokens, updated = excluded.updated",
+                (key, tokens, now),
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return wait
+
+    async def take(self, key: str, rate: float, burst: float) -> float:
+        return await anyio.to_thread.run_sync(self.take_sync, key, rate, burst)
+
+    def reset(self) -> None:
+        self._conn().execute("DELETE FROM rate_buckets")
+
+
+def make_backend(name: str = RATE_LIMIT_BACKEND):
+    if name == "sqlite":
+        return SQLiteBackend()
+    if name == "memory":
+        return MemoryBackend()
+    raise ValueError(f"Nieznany backend limitów żądań: {name}")
+
+
+backend = make_backend()
+
+
+class RateLimitMiddleware:
+    """Middleware ASGI: 429 + Retry-After po wyczerpaniu budżetu grupy tras."""
+
+    def __init__(self, app, groups: Optional[Sequence[RouteGroup]] = None, backend=None,
+                 enabled: bool = RATE_LIMIT_ENABLED):
+        self.app = app
+        self.groups = tuple(groups) if groups is not None else configured_groups()
+        self._backend = backend
+        self.enabled = enabled
+
+    @property
+    def backend(self):
+        # domyślnie backend modułu – testy i skrypty mogą go podmienić
+        return self._backend if self._backend is not None else backend
+
+    async def __call__(self, scope, receive, send):
+        if not self.enabled or scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        method, path = scope["method"], scope["path"]
+        group = next((g for g in self.groups if g.matches(method, path)), None)
+        if group is None:
+            return await self.app(scope, receive, send)
+
+        client = scope.get("client")
+        key = f"{group.name}:{client[0] if client else ''}"
+        wait = await self.backend.take(key, group.rate, group.burst)
+        if not wait:
+            return await self.app(scope, receive, send)
+
+        retry = str(max(1, math.ceil(wait))) if math.isfinite(wait) else "3600"
+        body = orjson.dumps({"detail": "Zbyt wiele żądań – spróbuj ponownie później"})
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", retry.encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,107 @@
+"""
+Jawne zarządzanie schematem bazy danych.
+
+Aplikacja nie wykonuje już DDL przy imporcie ani przy starcie:
+- bootstrap_schema: tworzy nową bazę z modeli i oznacza ją rewizją head
+  Alembica albo podnosi istniejącą bazę migracjami (uruchamiane ręcznie),
+- verify_schema: jedno zapytanie do alembic_version przy starcie API/GUI.
+
+Użycie (z katalogu VetClinic/API):
+    python -m vetclinic_api.core.schema bootstrap
+    python -m vetclinic_api.core.schema verify
+"""
+
+import sys
+from functools import lru_cache
+
+from alembic import command
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import inspect
+
+from vetclinic_api.core.config import BASE_DIR
+from vetclinic_api.core.database import Base, engine as default_engine
+
+ALEMBIC_INI = BASE_DIR / "alembic.ini"
+ALEMBIC_DIR = BASE_DIR / "alembic"
+
+
+class SchemaMismatchError(RuntimeError):
+    """Rewizja schematu w bazie nie zgadza się z head migracji Alembica."""
+
+
+def alembic_config(connection=None) -> Config:
+    """Konfiguracja Alembica niezależna od bieżącego katalogu roboczego."""
+    cfg = Config(str(ALEMBIC_INI))
+    cfg.set_main_option("script_location", str(ALEMBIC_DIR))
+    if connection is not None:
+        # env.py użyje tego połączenia zamiast tworzyć własny silnik
+        cfg.attributes["connection"] = connection
+    return cfg
+
+
+@lru_cache(maxsize=1)
+def head_revision() -> str:
+    """Rewizja head z katalogu migracji (liczona raz na proces)."""
+    return ScriptDirectory.from_config(alembic_config()).get_current_head()
+
+
+def current_revision(engine=default_engine) -> str | None:
+    """Rewizja zapisana w tabeli alembic_version (None dla pustej bazy)."""
+    with engine.connect() as conn:
+        return MigrationContext.configure(conn).get_current_revision()
+
+
+def verify_schema(engine=default_engine) -> str:
+    """
+    Sprawdza, czy baza jest na rewizji head. Nie wykonuje żadnego DDL.
+    Rzuca SchemaMismatchError z instrukcją, co uruchomić.
+    """
+    current = current_revision(engine)
+    expected = head_revision()
+    if current != expected:
+        raise SchemaMismatchError(
+            f"Schemat bazy ma rewizję {current!r}, oczekiwano {expected!r}. "
+            "Uruchom: python -m vetclinic_api.core.schema bootstrap"
+        )
+    return current
+
+
+def bootstrap_schema(engine=default_engine) -> str:
+    """
+    Przygotowuje schemat bazy:
+    - pusta baza: tworzy tabele z modeli i stempluje ją rewizją head,
+    - baza z historią Alembica: wykonuje brakujące migracje.
+    Zwraca rewizję, na której jest baza po operacji.
+    """
+    with engine.begin() as conn:
+        cfg = alembic_config(conn)
+        tables = set(inspect(conn).get_table_names())
+        if not tables - {"alembic_version"}:
+            Base.metadata.create_all(bind=conn)
+            command.stamp(cfg, "head")
+        else:
+            command.upgrade(cfg, "head")
+    return current_revision(engine)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = sys.argv[1:] if argv is None else argv
+    action = args[0] if args else "verify"
+    if action == "bootstrap":
+        print(f"Schemat gotowy, rewizja: {bootstrap_schema()}")
+        return 0
+    if action == "verify":
+        try:
+            print(f"Schemat aktualny, rewizja: {verify_schema()}")
+        except SchemaMismatchError as exc:
+            print(exc, file=sys.stderr)
+            return 1
+        return 0
+    print("Użycie: python -m vetclinic_api.core.schema [bootstrap|verify]", file=sys.stderr)
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
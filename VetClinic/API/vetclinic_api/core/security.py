@@ -1,38 +1,54 @@
 import jwt
 import datetime
+import io
 import pyotp
 import qrcode
 import os
-from passlib.context import CryptContext
+from functools import lru_cache
+from sqlalchemy import String, bindparam, select
 from sqlalchemy.orm import Session
-from jwt import encode 
-import secrets
+from vetclinic_api.core import hashing
+from vetclinic_api.core.config import TOTP_CACHE_SIZE
+from vetclinic_api.core.keyring import load_keyring
 from vetclinic_api.models.users import Client, Doctor, Consultant
 
-# Ustawienia do JWT
-SECRET_KEY = secrets.token_hex(32)
+# Ustawienia do JWT – klucze z konfiguracji, wspólne dla wszystkich procesów
+keyring = load_keyring()
 ALGORITHM = "HS256"
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
+# bcrypt liczony w ograniczonej puli procesów (core.hashing)
 def get_password_hash(plain_password: str) -> str:
-    return pwd_context.hash(plain_password)
+    return hashing.hash_password(plain_password)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return hashing.verify_password(plain_password, hashed_password)
+
+def _user_by_email_stmt():
+    """
+    Jedno zapytanie o użytkownika dowolnej roli: e-mail jako jednowierszowa
+    tabela, do której dołączamy (LEFT JOIN po unikalnych indeksach email)
+    klientów, lekarzy i konsultantów. Wiersz zawiera (Client, Doctor, Consultant),
+    brak dopasowania w danej tabeli to None.
+    """
+    probe = select(bindparam("email", type_=String).label("email")).subquery("probe")
+    return (
+        select(Client, Doctor, Consultant)
+        .select_from(probe)
+        .outerjoin(Client, Client.email == probe.c.email)
+        .outerjoin(Doctor, Doctor.email == probe.c.email)
+        .outerjoin(Consultant, Consultant.email == probe.c.email)
+    )
+
+# Budowane raz – przy każdym logowaniu podstawiamy tylko parametr
+USER_BY_EMAIL = _user_by_email_stmt()
 
 def get_user_by_email(db: Session, email: str):
-    # Przeszukujemy wszystkie tabele, aż znajdziemy użytkownika o danym emailu
-    user = db.query(Client).filter(Client.email == email).first()
-    if user:
-        return user
-    user = db.query(Doctor).filter(Doctor.email == email).first()
-    if user:
-        return user
-    user = db.query(Consultant).filter(Consultant.email == email).first()
-    if user:
-        return user
-    return None
+    # Jedno zapytanie zamiast trzech kolejnych; pierwszeństwo jak dotąd:
+    # klient, lekarz, konsultant
+    row = db.execute(USER_BY_EMAIL, {"email": email}).first()
+    if row is None:
+        return None
+    return next((user for user in row if user is not None), None)
 
 def create_access_token(data: dict, expires_delta: datetime.timedelta = None):
     to_encode = data.copy()
@@ -42,18 +58,45 @@ def create_access_token(data: dict, expires_delta: datetime.timedelta = None):
     else:
         expire = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(hours=1)
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    key = keyring.signing_key()
+    encoded_jwt = jwt.encode(to_encode, key.secret, algorithm=ALGORITHM, headers={"kid": key.kid})
     return encoded_jwt
 
+def decode_access_token(token: str) -> tuple[dict, float]:
+    """
+    Weryfikuje token kluczem wskazanym w nagłówku (kid). Zwraca claims oraz
+    chwilę (timestamp), do której wynik jest ważny: exp tokenu, ale nie
+    później niż koniec akceptacji klucza. Błędy: jwt.InvalidTokenError.
+    """
+    kid = jwt.get_unverified_header(token).get("kid")
+    key = keyring.verification_key(kid)
+    if key is None:
+        raise jwt.InvalidTokenError(f"Nieznany lub wycofany klucz: {kid}")
+    claims = jwt.decode(token, key.secret, algorithms=[ALGORITHM], options={"require": ["exp"]})
+    valid_until = claims["exp"]
+    if key.not_after is not None:
+        valid_until = min(valid_until, key.not_after.timestamp())
+    return claims, valid_until
+
 def generate_totp_secret() -> str:
     """Generuje 16-znakowy secret TOTP."""
     return pyotp.random_base32()
 
+# URI i obraz QR zależą tylko od (e-mail, secret) – dopóki secret się nie
+# zmieni, kolejne logowania z niepotwierdzonym TOTP biorą je z pamięci
+@lru_cache(maxsize=TOTP_CACHE_SIZE)
 def get_totp_provisioning_uri(email: str, secret: str, issuer: str = "VetClinic") -> str:
     """Generuje URI, które można przekazać do Google Authenticator."""
     totp = pyotp.TOTP(secret)
     return totp.provisioning_uri(name=email, issuer_name=issuer)
 
+@lru_cache(maxsize=TOTP_CACHE_SIZE)
+def totp_qr_png(uri: str) -> bytes:
+    """Kod QR dla URI jako PNG w pamięci (bez zapisu na dysk)."""
+    buf = io.BytesIO()
+    qrcode.make(uri).save(buf)
+    return buf.getvalue()
+
 def generate_qr_code(uri: str, filename: str = "qrcode.png") -> None:
     """Generuje i zapisuje QR kod na podstawie URI."""
     img = qrcode.make(uri)
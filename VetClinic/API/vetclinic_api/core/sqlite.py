@@ -0,0 +1,106 @@
+"""
+Profil wydajnościowy dla SQLite.
+
+- apply_sqlite_pragmas: ustawia PRAGMA (WAL, synchronous, cache, mmap,
+  busy_timeout, foreign_keys) na każdym nowym połączeniu,
+- SerializedWriter: kolejkuje zapisy w obrębie procesu, tak aby równoległe
+  żądania czekały na swoją kolej zamiast dostawać "database is locked".
+"""
+
+import threading
+
+from sqlalchemy import event
+
+from vetclinic_api.core.config import (
+    SQLITE_JOURNAL_MODE,
+    SQLITE_SYNCHRONOUS,
+    SQLITE_CACHE_SIZE,
+    SQLITE_MMAP_SIZE,
+    SQLITE_BUSY_TIMEOUT_MS,
+    SQLITE_FOREIGN_KEYS,
+    SQLITE_WRITE_QUEUE_TIMEOUT,
+)
+
+
+def sqlite_pragmas() -> dict:
+    """Zwraca słownik PRAGMA -> wartość wynikający z konfiguracji."""
+    return {
+        "journal_mode": SQLITE_JOURNAL_MODE,
+        "synchronous": SQLITE_SYNCHRONOUS,
+        "cache_size": SQLITE_CACHE_SIZE,
+        "mmap_size": SQLITE_MMAP_SIZE,
+        "busy_timeout": SQLITE_BUSY_TIMEOUT_MS,
+        "foreign_keys": "ON" if SQLITE_FOREIGN_KEYS else "OFF",
+    }
+
+
+def apply_sqlite_pragmas(dbapi_connection, connection_record=None) -> None:
+    """Listener zdarzenia "connect" – ustawia PRAGMA na surowym połączeniu."""
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in sqlite_pragmas().items():
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+
+def install_sqlite_profile(engine) -> None:
+    """Rejestruje apply_sqlite_pragmas dla wszystkich połączeń silnika."""
+    event.listen(engine, "connect", apply_sqlite_pragmas)
+
+
+class WriteQueueTimeout(RuntimeError):
+    """Zapis nie doczekał się swojej kolejki w zadanym czasie."""
+
+
+class SerializedWriter:
+    """
+    Jeden pisarz na proces: sesja przejmuje blokadę przy pierwszym zapisie
+    (flush lub masowy UPDATE/DELETE) i oddaje ją po zakończeniu transakcji.
+
+    Używamy semafora zamiast Lock, bo FastAPI może zamknąć sesję (rollback)
+    w innym wątku niż ten, który wykonał zapis.
+    """
+
+    _KEY = "_vetclinic_write_slot"
+
+    def __init__(self, timeout: float = SQLITE_WRITE_QUEUE_TIMEOUT):
+        self.timeout = timeout
+        self._slot = threading.BoundedSemaphore(1)
+
+    def acquire(self, session) -> None:
+        if session.info.get(self._KEY):
+            return
+        # Blokadę zwalnia koniec transakcji, więc musi ona istnieć
+        if not session.in_transaction():
+            session.begin()
+        if not self._slot.acquire(timeout=self.timeout):
+            raise WriteQueueTimeout(
+                f"Zapis czekał dłużej niż {self.timeout}s na dostęp do bazy"
+            )
+        session.info[self._KEY] = True
+
+    def release(self, session) -> None:
+        if session.info.pop(self._KEY, False):
+            self._slot.release()
+
+    def install(self, session_factory) -> None:
+        """Podpina kolejkę pod sesje tworzone przez session_factory."""
+
+        @event.listens_for(session_factory, "before_flush")
+        def _before_flush(session, flush_context, instances):
+            self.acquire(session)
+
+        @event.listens_for(session_factory, "do_orm_execute")
+        def _before_bulk_write(orm_execute_state):
+            if (
+                orm_execute_state.is_insert
+                or orm_execute_state.is_update
+                or orm_execute_state.is_delete
+            ):
+                self.acquire(orm_execute_state.session)
+
+        @event.listens_for(session_factory, "after_transaction_end")
+        def _after_transaction_end(session, transaction):
+            if transaction.parent is None:
+                self.release(session)
@@ -0,0 +1,171 @@
+"""
+Ograniczanie prób logowania w pamięci procesu (okno przesuwne).
+
+Dotąd każda nieudana próba logowania zmieniała wiersz użytkownika
+(failed_login_attempts, locked_until) i robiła commit – zgadywanie haseł
+zamieniało się w lawinę zapisów do bazy. Teraz:
+- nieudane próby liczymy w pamięci dla pary (email, IP); dla każdej pary
+  pamiętamy tylko czasy ostatnich LOGIN_MAX_FAILS porażek (deque z maxlen –
+  bufor cykliczny),
+- LOGIN_MAX_FAILS porażek w oknie LOGIN_FAIL_WINDOW blokuje parę na
+  LOGIN_BLOCK_PERIOD; zablokowana para dostaje 429 jeszcze przed bcrypt,
+- blokady trafiają do bazy (locked_until) partiami, co
+  LOGIN_LOCKOUT_FLUSH_INTERVAL sekund i przy zamknięciu aplikacji – dzięki
+  temu przetrwają restart i widzą je inne procesy.
+"""
+
+import asyncio
+import datetime
+import logging
+import threading
+import time
+from collections import deque
+from typing import Optional
+
+from sqlalchemy import bindparam, update
+from sqlalchemy.orm import Session
+
+from vetclinic_api.core.config import (
+    LOGIN_BLOCK_PERIOD,
+    LOGIN_FAIL_WINDOW,
+    LOGIN_LOCKOUT_FLUSH_INTERVAL,
+    LOGIN_MAX_FAILS,
+    LOGIN_THROTTLE_MAX_KEYS,
+)
+from vetclinic_api.core.database import SessionLocal
+from vetclinic_api.models.users import Client, Consultant, Doctor
+
+logger = logging.getLogger(__name__)
+
+
+class LoginThrottle:
+    """Licznik nieudanych logowań per (email, IP) z blokadą czasową."""
+
+    def __init__(self, max_fails: int = LOGIN_MAX_FAILS, window: float = LOGIN_FAIL_WINDOW,
+                 block_period: float = LOGIN_BLOCK_PERIOD, max_keys: int = LOGIN_THROTTLE_MAX_KEYS):
+        self.max_fails = max_fails
+        self.window = window
+        self.block_period = block_period
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        # (email, ip) -> czasy ostatnich porażek (time.monotonic)
+        self._failures: dict[tuple[str, str], deque] = {}
+        # (email, ip) -> koniec blokady (time.monotonic)
+        self._blocked: dict[tuple[str, str], float] = {}
+        # email -> locked_until (UTC) czekające na zapis do bazy
+        self._pending: dict[str, datetime.datetime] = {}
+
+    @staticmethod
+    def _key(email: str, ip: str) -> tuple[str, str]:
+        return email.strip().lower(), ip or ""
+
+    def retry_after(self, email: str, ip: str, now: Optional[float] = None) -> float:
+        """Ile sekund para musi jeszcze czekać (0 = może próbować)."""
+        now = time.monotonic() if now is None else now
+        key = self._key(email, ip)
+        with self._lock:
+            until = self._blocked.get(key)
+            if until is None:
+                return 0.0
+            if until <= now:
+                del self._blocked[key]
+                return 0.0
+            return until - now
+
+    def record_failure(self, email: str, ip: str, now: Optional[float] = None) -> bool:
+        """Zapisuje porażkę; True, jeśli właśnie nałożyła blokadę."""
+        now = time.monotonic() if now is None else now
+        key = self._key(email, ip)
+        with self._lock:
+            failures = self._failures.get(key)
+            if failures is None:
+                if len(self._failures) >= self.max_keys:
+                    self._evict(now)
+                failures = self._failures[key] = deque(maxlen=self.max_fails)
+            failures.append(now)
+            if len(failures) < self.max_fails or now - failures[0] > self.window:
+                return False
+            del self._failures[key]
+            self._blocked[key] = now + self.block_period
+            locked_until = datetime.datetime.utcnow() + datetime.timedelta(seconds=self.block_period)
+            # w bazie e-mail jest porównywany dokładnie – zapisujemy taki, jak podano
+            self._pending[email] = max(locked_until, self._pending.get(email, locked_until))
+            return True
+
+    def record_success(self, email: str, ip: str) -> None:
+        key = self._key(email, ip)
+        with self._lock:
+            self._failures.pop(key, None)
+            self._blocked.pop(key, None)
+
+    def _evict(self, now: float) -> None:
+        # najpierw wpisy, których porażki wypadły już z okna; jeśli to za mało –
+        # najstarsze (słownik zachowuje kolejność wstawiania)
+        stale = [k for k, f in self._failures.items() if now - f[-1] > self.window]
+        for key in stale:
+            del self._failures[key]
+        while len(self._failures) >= self.max_keys:
+            del self._failures[next(iter(self._failures))]
+        for key in [k for k, until in self._blocked.items() if until <= now]:
+            del self._blocked[key]
+
+    def drain_lockouts(self) -> dict[str, datetime.datetime]:
+        """Blokady do zapisania w bazie (i wyczyszczenie kolejki)."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        return pending
+
+    def requeue(self, lockouts: dict[str, datetime.datetime]) -> None:
+        """Przywraca blokady, których nie udało się zapisać."""
+        with self._lock:
+            for email, until in lockouts.items():
+                self._pending[email] = max(until, self._pending.get(email, until))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._failures.clear()
+            self._blocked.clear()
+            self._pending.clear()
+
+
+login_throttle = LoginThrottle()
+
+
+def persist_lockouts(db: Session, lockouts: dict[str, datetime.datetime]) -> None:
+    """Jedna transakcja: locked_until dla wszystkich ról (executemany po tabeli)."""
+    if not lockouts:
+        return
+    params = [{"b_email": email, "b_until": until} for email, until in lockouts.items()]
+    for model in (Client, Doctor, Consultant):
+        table = model.__table__
+        db.execute(
+            update(table)
+            .where(table.c.email == bindparam("b_email"))
+            .values(locked_until=bindparam("b_until")),
+            params,
+        )
+    db.commit()
+
+
+def flush_lockouts(throttle: LoginThrottle = login_throttle, session_factory=SessionLocal) -> int:
+    """Zapisuje zaległe blokady w bazie; zwraca ich liczbę."""
+    lockouts = throttle.drain_lockouts()
+    if not lockouts:
+        return 0
+    try:
+        with session_factory() as db:
+            persist_lockouts(db, lockouts)
+    except Exception:
+        throttle.requeue(lockouts)
+        raise
+    return len(lockouts)
+
+
+async def flush_periodically(interval: float = LOGIN_LOCKOUT_FLUSH_INTERVAL) -> None:
+    """Zadanie w tle (lifespan API): co interval sekund zapis partii blokad."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await asyncio.to_thread(flush_lockouts)
+        except Exception:
+            logger.exception("Nie udało się zapisać blokad logowania")
@@ -0,0 +1,84 @@
+"""
+Generowanie unikalnych adresów e-mail pracowników (lekarze, konsultanci).
+
+Dawniej każdy kandydat (j.kowalski, jkowalski, jakowalski, ..., jkowalski1,
+jkowalski2, ...) był osobnym zapytaniem – przy popularnych nazwiskach
+dziesiątki zapytań na jedno konto. Teraz:
+- jedno zapytanie pobiera wszystkie zajęte adresy, które mogą kolidować
+  z kandydatami (zakres na unikalnym indeksie email + LIKE),
+- pierwszy wolny kandydat wybierany jest w pamięci,
+- wyścig z równoległym zakładaniem konta kończy się IntegrityError na
+  unikalnym indeksie – wtedy wycofujemy transakcję i wybieramy ponownie.
+"""
+
+from typing import Callable, Iterable, Iterator, TypeVar
+
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+T = TypeVar("T")
+
+# Ile razy ponawiamy wybór adresu po kolizji z równoległym zapisem
+MAX_ATTEMPTS = 5
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _upper_bound(prefix: str) -> str:
+    """Najmniejszy napis większy od wszystkich zaczynających się od prefix."""
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+def taken_emails_stmt(column, prefix: str, contains: str, domain: str):
+    """
+    Adresy postaci <prefix>...<contains>...@<domain>. Warunek zakresowy
+    (prefix) korzysta z indeksu na email, LIKE zawęża wynik.
+    """
+    pattern = f"{_escape_like(prefix)}%{_escape_like(contains)}%@{_escape_like(domain)}"
+    return select(column).where(
+        column >= prefix,
+        column < _upper_bound(prefix),
+        column.like(pattern, escape="\\"),
+    )
+
+
+def taken_emails(db: Session, column, prefix: str, contains: str, domain: str) -> set[str]:
+    """Zajęte adresy, które mogą kolidować z kandydatami – jedno zapytanie."""
+    return set(db.scalars(taken_emails_stmt(column, prefix, contains, domain)))
+
+
+def first_free(local_parts: Iterable[str], domain: str, taken: set[str]) -> str:
+    """Pierwszy kandydat spoza taken (local_parts może być nieskończone)."""
+    for local in local_parts:
+        email = f"{local}@{domain}"
+        if email not in taken:
+            return email
+    raise ValueError("Brak wolnego adresu e-mail wśród kandydatów")
+
+
+def create_with_unique_email(
+    db: Session,
+    column,
+    local_parts: Callable[[], Iterator[str]],
+    prefix: str,
+    contains: str,
+    domain: str,
+    create: Callable[[str], T],
+) -> T:
+    """
+    Wybiera wolny adres i wywołuje create(email), które zapisuje konto
+    (z commitem). Kolizja na email z równoległym zapisem -> rollback
+    i ponowny wybór; IntegrityError z innego powodu przekazujemy dalej.
+    """
+    for attempt in range(1, MAX_ATTEMPTS + 1):
+        taken = taken_emails(db, column, prefix, contains, domain)
+        email = first_free(local_parts(), domain, taken)
+        try:
+            return create(email)
+        except IntegrityError:
+            db.rollback()
+            if attempt == MAX_ATTEMPTS or db.scalar(select(column).where(column == email)) is None:
+                raise
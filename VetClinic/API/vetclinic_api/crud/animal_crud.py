@@ -1,8 +1,22 @@
+from typing import Iterable, Sequence
+
+from sqlalchemy import delete, or_, select
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from vetclinic_api.core.fields import only
+from vetclinic_api.core.includes import eager
+from vetclinic_api.core.pagination import keyset
 from vetclinic_api.models.animals import Animal as AnimalModel
+from vetclinic_api.models.appointments import Appointment
+from vetclinic_api.models.medical_records import MedicalRecord
+from vetclinic_api.models.weight_logs import WeightLog
 from vetclinic_api.schemas.animal import AnimalCreate, AnimalUpdate
+from vetclinic_api.services import anchor_service
 from vetclinic_api.validators.animal_chip_validator import validate_animal_chip
 
+# Stabilny klucz sortowania dla paginacji kursorowej
+PAGE_KEY = (AnimalModel.id,)
+
 def create_animal(db: Session, animal: AnimalCreate):
     # Jeśli numer mikroczipa jest podany, walidujemy go.
     if animal.microchip_number:
@@ -34,13 +48,57 @@ def update_animal(db: Session, animal_id: int, animal: AnimalUpdate):
 def get_animal(db: Session, animal_id: int):
     return db.query(AnimalModel).filter(AnimalModel.id == animal_id).first()
 
-def get_animals(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(AnimalModel).offset(skip).limit(limit).all()
+def _animals_stmt(skip: int, limit: int | None, after: tuple | None = None, owner_id: int | None = None,
+                  include: Sequence[str] = (), fields: Sequence[str] = ()):
+    stmt = select(AnimalModel).options(
+        *eager(AnimalModel, include), *only(AnimalModel, fields, include, PAGE_KEY)
+    )
+    if owner_id is not None:
+        stmt = stmt.where(AnimalModel.owner_id == owner_id)
+    return keyset(stmt, PAGE_KEY, after, skip, limit)
+
+def get_animals(db: Session, skip: int = 0, limit: int | None = 100, after: tuple | None = None,
+                owner_id: int | None = None, include: Sequence[str] = (), fields: Sequence[str] = ()):
+    return db.scalars(_animals_stmt(skip, limit, after, owner_id, include, fields)).all()
+
+async def get_animals_async(db: AsyncSession, skip: int = 0, limit: int | None = 100, after: tuple | None = None,
+                            owner_id: int | None = None, include: Sequence[str] = (),
+                            fields: Sequence[str] = ()):
+    return (await db.scalars(_animals_stmt(skip, limit, after, owner_id, include, fields))).all()
 
 def delete_animal(db: Session, animal_id: int):
     db_animal = get_animal(db, animal_id)
     if not db_animal:
         return None
+    # dokumentację usuwa kaskada ORM – oznaczamy ją jako usuniętą także on-chain
+    anchor_service.enqueue_record_deletes(db, MedicalRecord.animal_id == animal_id)
     db.delete(db_animal)
     db.commit()
     return db_animal
+
+def purge_animals(db: Session, animal_ids) -> None:
+    """
+    Usuwa zwierzęta (lista ID albo podzapytanie) razem z ich wizytami,
+    dokumentacją i pomiarami wagi – bez commitu, w transakcji wywołującego.
+    Usuwaną dokumentację kolejkujemy do oznaczenia jako usuniętej on-chain.
+    """
+    visits = select(Appointment.id).where(Appointment.animal_id.in_(animal_ids))
+    records = or_(MedicalRecord.animal_id.in_(animal_ids), MedicalRecord.appointment_id.in_(visits))
+    anchor_service.enqueue_record_deletes(db, records)
+    for stmt in (
+        delete(MedicalRecord).where(records),
+        delete(WeightLog).where(WeightLog.animal_id.in_(animal_ids)),
+        delete(Appointment).where(Appointment.animal_id.in_(animal_ids)),
+        delete(AnimalModel).where(AnimalModel.id.in_(animal_ids)),
+    ):
+        db.execute(stmt)
+
+def delete_animals(db: Session, animal_ids: Iterable[int]) -> list[int]:
+    """Usuwa wiele zwierząt w jednej transakcji; zwraca ID faktycznie usuniętych."""
+    found = db.scalars(
+        select(AnimalModel.id).where(AnimalModel.id.in_(set(animal_ids))).order_by(AnimalModel.id)
+    ).all()
+    if found:
+        purge_animals(db, found)
+        db.commit()
+    return list(found)
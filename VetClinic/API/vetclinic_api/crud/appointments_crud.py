@@ -1,18 +1,28 @@
-from typing import List, Optional
+from typing import Iterable, List, Optional, Sequence
 from decimal import Decimal
+from datetime import date, datetime, time
 
+from sqlalchemy import delete, select
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from web3 import Web3
 
+from vetclinic_api.core.fields import only
+from vetclinic_api.core.includes import eager
+from vetclinic_api.core.pagination import keyset
 from vetclinic_api.models.appointments import Appointment as AppointmentModel
+from vetclinic_api.models.medical_records import MedicalRecord
 from vetclinic_api.schemas.appointment import AppointmentCreate, AppointmentUpdate
 
 # CRUD do faktur
 from vetclinic_api.crud.invoice_crud import create_invoice
 from vetclinic_api.schemas.invoice import InvoiceCreate
 
-# CRUD do blockchaina
-from vetclinic_api.crud.blockchain_crud import add_record as blockchain_add_record
+# Kotwiczenie on-chain przez kolejkę (worker w tle)
+from vetclinic_api.services import anchor_service
+
+# Stabilny klucz sortowania dla paginacji kursorowej: termin wizyty, potem id
+PAGE_KEY = (AppointmentModel.visit_datetime, AppointmentModel.id)
 
 
 def get_appointment(db: Session, appointment_id: int) -> Optional[AppointmentModel]:
@@ -20,20 +30,97 @@ def get_appointment(db: Session, appointment_id: int) -> Optional[AppointmentMod
     return db.query(AppointmentModel).filter(AppointmentModel.id == appointment_id).first()
 
 
-def get_appointments(db: Session, skip: int = 0, limit: int = 100) -> List[AppointmentModel]:
-    """Zwraca listę wizyt z paginacją."""
-    return db.query(AppointmentModel).offset(skip).limit(limit).all()
+def appointments_stmt(
+    skip: int = 0,
+    limit: Optional[int] = 100,
+    after: Optional[tuple] = None,
+    *,
+    doctor_id: Optional[int] = None,
+    facility_id: Optional[int] = None,
+    owner_id: Optional[int] = None,
+    animal_id: Optional[int] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    priority: Optional[str] = None,
+    include: Sequence[str] = (),
+    fields: Sequence[str] = (),
+):
+    """
+    Zapytanie o wizyty z filtrami (każdy opcjonalny, łączone przez AND).
+    Zakres dat jest półotwarty: date_from <= visit_datetime < date_to.
+    include: relacje ładowane z wyprzedzeniem (selectinload),
+    fields: pobierane kolumny (load_only); puste – wszystkie.
+    """
+    stmt = select(AppointmentModel).options(
+        *eager(AppointmentModel, include),
+        *only(AppointmentModel, fields, include, PAGE_KEY),
+    )
+    if doctor_id is not None:
+        stmt = stmt.where(AppointmentModel.doctor_id == doctor_id)
+    if facility_id is not None:
+        stmt = stmt.where(AppointmentModel.facility_id == facility_id)
+    if owner_id is not None:
+        stmt = stmt.where(AppointmentModel.owner_id == owner_id)
+    if animal_id is not None:
+        stmt = stmt.where(AppointmentModel.animal_id == animal_id)
+    if date_from is not None:
+        stmt = stmt.where(AppointmentModel.visit_datetime >= date_from)
+    if date_to is not None:
+        stmt = stmt.where(AppointmentModel.visit_datetime < date_to)
+    if priority is not None:
+        stmt = stmt.where(AppointmentModel.priority == priority)
+    return keyset(stmt, PAGE_KEY, after, skip, limit)
+
+
+def get_appointments(
+    db: Session, skip: int = 0, limit: Optional[int] = 100, after: Optional[tuple] = None, **filters
+) -> List[AppointmentModel]:
+    """Zwraca listę wizyt posortowaną po (visit_datetime, id) – offset albo kursor (after)."""
+    return db.scalars(appointments_stmt(skip, limit, after, **filters)).all()
+
+
+async def get_appointments_async(
+    db: AsyncSession, skip: int = 0, limit: Optional[int] = 100, after: Optional[tuple] = None, **filters
+) -> List[AppointmentModel]:
+    """Asynchroniczny wariant get_appointments."""
+    return (await db.scalars(appointments_stmt(skip, limit, after, **filters))).all()
+
+
+def _doctor_visit_times_stmt(doctor_id: int, day: date):
+    """Godziny wizyt lekarza w danym dniu (00:00:00–23:59:59) – tylko jedna kolumna."""
+    start_of_day = datetime.combine(day, time(hour=0, minute=0, second=0))
+    end_of_day = datetime.combine(day, time(hour=23, minute=59, second=59))
+    return select(AppointmentModel.visit_datetime).where(
+        AppointmentModel.doctor_id == doctor_id,
+        AppointmentModel.visit_datetime >= start_of_day,
+        AppointmentModel.visit_datetime <= end_of_day,
+    )
+
+
+def get_doctor_visit_times(db: Session, doctor_id: int, day: date) -> List[datetime]:
+    """Zwraca godziny wszystkich wizyt lekarza w danym dniu."""
+    return db.scalars(_doctor_visit_times_stmt(doctor_id, day)).all()
+
+
+async def get_doctor_visit_times_async(db: AsyncSession, doctor_id: int, day: date) -> List[datetime]:
+    """Asynchroniczny wariant get_doctor_visit_times."""
+    return (await db.scalars(_doctor_visit_times_stmt(doctor_id, day))).all()
 
 
 def create_appointment(db: Session, appt_in: AppointmentCreate) -> AppointmentModel:
     """
-    Tworzy wizytę, generuje fakturę i zapisuje rekord on‐chain.
-    Zwraca encję Appointment z wypełnionym tx_hash.
+    Tworzy wizytę, generuje fakturę i kolejkuje zapis rekordu on‐chain.
+    tx_hash uzupełni worker kotwiczenia (services.anchor_service) po potwierdzeniu transakcji.
     """
-    # 1. Utworzenie i zapis wizyty w bazie
+    # 1. Zapis wizyty i zadania kotwiczenia w jednej transakcji
     data = appt_in.model_dump()
     db_appointment = AppointmentModel(**data)
     db.add(db_appointment)
+    db.flush()
+    # hashujemy np. "id-timestamp"
+    payload = f"{db_appointment.id}-{db_appointment.visit_datetime.isoformat()}"
+    data_hash = Web3.to_hex(Web3.keccak(text=payload))
+    anchor_service.enqueue(db, anchor_service.APPOINTMENT, "add", db_appointment.id, data_hash)
     db.commit()
     db.refresh(db_appointment)
 
@@ -45,21 +132,6 @@ def create_appointment(db: Session, appt_in: AppointmentCreate) -> AppointmentMo
     )
     create_invoice(db, inv_in)
 
-    # 3. Przygotowanie danych do blockchaina i wysłanie transakcji
-    try:
-        # hashujemy np. "id-timestamp"
-        payload = f"{db_appointment.id}-{db_appointment.visit_datetime.isoformat()}"
-        data_hash = Web3.to_hex(Web3.keccak(text=payload))
-        tx_hash = blockchain_add_record(db_appointment.id, data_hash)
-        # zapisujemy tx_hash w kolumnie Appointment.tx_hash (dodaj ją w modelu!)
-        db_appointment.tx_hash = tx_hash
-        db.commit()
-        db.refresh(db_appointment)
-    except Exception as e:
-        # jeśli blockchain nie odpowiada, logujemy i zwracamy encję bez tx_hash
-        # (możesz zmienić na raise, jeśli chcesz przerywać w takim wypadku)
-        print(f"⚠️  Ostrzeżenie: nie udało się zapisać wizyty on‐chain: {e}")
-
     return db_appointment
 
 
@@ -84,11 +156,7 @@ def update_appointment(
 
 def get_appointments_by_owner(db: Session, owner_id: int) -> List[AppointmentModel]:
     """Zwraca wszystkie wizyty klienta o danym owner_id."""
-    return (
-        db.query(AppointmentModel)
-          .filter(AppointmentModel.owner_id == owner_id)
-          .all()
-    )
+    return get_appointments(db, limit=None, owner_id=owner_id)
 
 
 def delete_appointment(db: Session, appointment_id: int) -> Optional[AppointmentModel]:
@@ -96,6 +164,29 @@ def delete_appointment(db: Session, appointment_id: int) -> Optional[Appointment
     db_appointment = get_appointment(db, appointment_id)
     if not db_appointment:
         return None
+    # dokumentację usuwa kaskada ORM – oznaczamy ją jako usuniętą także on-chain
+    anchor_service.enqueue_record_deletes(db, MedicalRecord.appointment_id == appointment_id)
     db.delete(db_appointment)
     db.commit()
     return db_appointment
+
+
+def delete_appointments(db: Session, appointment_ids: Iterable[int]) -> list[int]:
+    """
+    Usuwa wiele wizyt (z ich dokumentacją) w jednej transakcji; zwraca ID usuniętych.
+    Usuwana dokumentacja trafia do kolejki kotwiczenia jako "delete".
+    """
+    found = db.scalars(
+        select(AppointmentModel.id)
+        .where(AppointmentModel.id.in_(set(appointment_ids)))
+        .order_by(AppointmentModel.id)
+    ).all()
+    if found:
+        anchor_service.enqueue_record_deletes(db, MedicalRecord.appointment_id.in_(found))
+        for stmt in (
+            delete(MedicalRecord).where(MedicalRecord.appointment_id.in_(found)),
+            delete(AppointmentModel).where(AppointmentModel.id.in_(found)),
+        ):
+            db.execute(stmt)
+        db.commit()
+    return list(found)
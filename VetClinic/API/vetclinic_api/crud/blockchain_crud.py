@@ -1,7 +1,9 @@
-from vetclinic_api.core.blockchain import BlockchainProvider
+from web3.exceptions import TransactionNotFound
 
-# Provider singleton for blockchain connection and contract
-_provider = BlockchainProvider()
+from vetclinic_api.core.blockchain import get_provider
+
+# Wspólny provider procesu (ten sam co w crud.medical_records)
+_provider = get_provider()
 
 
 def add_record(record_id: int, data_hash: str) -> str:
@@ -52,3 +54,49 @@ def get_records_by_owner(owner: str) -> list[int]:
     """
     contract, _, _ = _provider.get()
     return contract.functions.getRecordsByOwner(owner).call()
+
+
+def send_record_tx(op: str, record_id: int, data_hash: str | None = None) -> str:
+    """
+    Wysyła transakcję add/update/delete bez czekania na receipt
+    (używa services.anchor_service). Zwraca hash transakcji (0x...).
+    """
+    contract, account, w3 = _provider.get()
+    if op == "add":
+        call = contract.functions.addRecord(record_id, data_hash)
+    elif op == "update":
+        call = contract.functions.updateRecord(record_id, data_hash)
+    elif op == "delete":
+        call = contract.functions.deleteRecord(record_id)
+    else:
+        raise ValueError(f"Nieznana operacja on-chain: {op}")
+    return w3.to_hex(call.transact({'from': account}))
+
+
+def send_root_tx(root: bytes, leaf_count: int) -> str:
+    """
+    Zapisuje korzeń partii Merkle (MerkleAnchor.anchorRoot) bez czekania
+    na receipt. Zwraca hash transakcji (0x...).
+    """
+    contract, account, w3 = _provider.get_contract("MerkleAnchor")
+    return w3.to_hex(contract.functions.anchorRoot(root, leaf_count).transact({'from': account}))
+
+
+def get_root(root: bytes):
+    """Zwraca (timestamp, leafCount, submitter) korzenia; timestamp 0 = brak on-chain."""
+    contract, _, _ = _provider.get_contract("MerkleAnchor")
+    return contract.functions.getRoot(root).call()
+
+
+def wait_for_receipt(tx_hash: str, timeout: float):
+    _, _, w3 = _provider.get()
+    return w3.eth.wait_for_transaction_receipt(tx_hash, timeout=timeout)
+
+
+def find_receipt(tx_hash: str):
+    """Receipt wysłanej wcześniej transakcji albo None, jeśli węzeł jej nie zna (jeszcze)."""
+    _, _, w3 = _provider.get()
+    try:
+        return w3.eth.get_transaction_receipt(tx_hash)
+    except TransactionNotFound:
+        return None
@@ -1,18 +1,31 @@
 # vetclinic_api/crud/consultants.py
 
+from itertools import count
+from typing import Iterator, Sequence
+
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from passlib.context import CryptContext
 import secrets
 
+from vetclinic_api.core.auth import forget_user
+from vetclinic_api.core.fields import only
+from vetclinic_api.core.pagination import keyset
+from vetclinic_api.core.security import get_password_hash
+from vetclinic_api.core.unique_email import create_with_unique_email
 from vetclinic_api.models.users import Consultant
 from vetclinic_api.schemas.users import ConsultantCreate, UserUpdate
 from vetclinic_api.services.email_service import EmailService
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Stabilny klucz sortowania dla paginacji kursorowej
+PAGE_KEY = (Consultant.id,)
+
+CONSULTANT_EMAIL_DOMAIN = "consultant.vetclinic.com"
 
 
-def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+def consultant_local_parts(base: str) -> Iterator[str]:
+    yield base
+    for i in count(1):
+        yield f"{base}{i}"
 
 
 def create_consultant(
@@ -29,43 +42,40 @@ def create_consultant(
     raw_password = secrets.token_urlsafe(16)
     hashed       = get_password_hash(raw_password)
 
-    # jeśli nie podano emaila, budujemy domyślny
-    if not cons_in.email:
-        base = f"{cons_in.first_name[0].lower()}.{cons_in.last_name.lower()}"
-        email = f"{base}@consultant.vetclinic.com"
-        i = 1
-        while db.query(Consultant).filter_by(email=email).first():
-            email = f"{base}{i}@consultant.vetclinic.com"
-            i += 1
-    else:
-        email = cons_in.email
-
-    consultant = Consultant(
-        first_name           = cons_in.first_name,
-        last_name            = cons_in.last_name,
-        email                = email,
-        password_hash        = hashed,
-        facility_id          = cons_in.facility_id,
-        backup_email         = cons_in.backup_email,
-        must_change_password = True,
+    def create(email: str) -> Consultant:
+        consultant = Consultant(
+            first_name           = cons_in.first_name,
+            last_name            = cons_in.last_name,
+            email                = email,
+            password_hash        = hashed,
+            facility_id          = cons_in.facility_id,
+            backup_email         = cons_in.backup_email,
+            must_change_password = True,
+        )
+        db.add(consultant)
+        # mail z tymczasowym hasłem trafia do outbox (wyśle go nadawca w tle)
+        EmailService.queue_temporary_password(db, consultant.backup_email, raw_password)
+        db.commit()
+        db.refresh(consultant)
+        return consultant
+
+    if cons_in.email:
+        return create(cons_in.email)
+
+    # jeśli nie podano emaila, budujemy domyślny: j.kowalski, j.kowalski1, ...
+    base = f"{cons_in.first_name[0].lower()}.{cons_in.last_name.lower()}"
+    return create_with_unique_email(
+        db, Consultant.email, lambda: consultant_local_parts(base),
+        prefix=base, contains="", domain=CONSULTANT_EMAIL_DOMAIN, create=create,
     )
-    db.add(consultant)
-    db.commit()
-    db.refresh(consultant)
-
-    # wyślij maila z tymczasowym hasłem
-    EmailService.send_temporary_password(consultant.backup_email, raw_password)
-    return consultant
 
 
-def list_consultants(db: Session, skip: int = 0, limit: int = 100) -> list[Consultant]:
-    return (
-        db.query(Consultant)
-          .order_by(Consultant.id)
-          .offset(skip)
-          .limit(limit)
-          .all()
-    )
+def list_consultants(
+    db: Session, skip: int = 0, limit: int = 100, after: tuple | None = None,
+    fields: Sequence[str] = (),
+) -> list[Consultant]:
+    stmt = select(Consultant).options(*only(Consultant, fields, key=PAGE_KEY))
+    return db.scalars(keyset(stmt, PAGE_KEY, after, skip, limit)).all()
 
 def get_consultant(
     db: Session,
@@ -101,6 +111,7 @@ def update_consultant(
         setattr(consultant, field, value)
 
     db.commit()
+    forget_user(consultant.role, cons_id)
     db.refresh(consultant)
     return consultant
 
@@ -117,4 +128,5 @@ def delete_consultant(
         return False
     db.delete(consultant)
     db.commit()
+    forget_user(consultant.role, cons_id)
     return True
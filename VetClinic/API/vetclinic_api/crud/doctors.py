@@ -1,15 +1,20 @@
+from typing import Iterable, Sequence
+
+from sqlalchemy import delete, select
 from sqlalchemy.orm import Session
-from passlib.context import CryptContext
 import secrets
 
+from vetclinic_api.core.auth import forget_user
+from vetclinic_api.core.fields import only
+from vetclinic_api.core.pagination import keyset
+from vetclinic_api.core.security import get_password_hash
+from vetclinic_api.models.appointments import Appointment
 from vetclinic_api.models.users import Doctor
 from vetclinic_api.schemas.users import DoctorCreate, UserUpdate
 from vetclinic_api.services.email_service import EmailService
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+# Stabilny klucz sortowania dla paginacji kursorowej
+PAGE_KEY = (Doctor.id,)
 
 def create_doctor(db: Session, doc_in: DoctorCreate) -> tuple[str, Doctor]:
     raw_password = secrets.token_urlsafe(16)
@@ -26,14 +31,18 @@ def create_doctor(db: Session, doc_in: DoctorCreate) -> tuple[str, Doctor]:
         must_change_password = True,
     )
     db.add(doctor)
+    EmailService.queue_temporary_password(db, doctor.backup_email, raw_password)
     db.commit()
     db.refresh(doctor)
-
-    EmailService.send_temporary_password(doctor.backup_email, raw_password)
     return raw_password, doctor
 
-def list_doctors(db: Session) -> list[Doctor]:
-    return db.query(Doctor).all()
+def list_doctors(
+    db: Session, skip: int = 0, limit: int | None = None, after: tuple | None = None,
+    fields: Sequence[str] = (),
+) -> list[Doctor]:
+    """Lekarze posortowani po id; limit=None zwraca wszystkich (np. listy w GUI)."""
+    stmt = select(Doctor).options(*only(Doctor, fields, key=PAGE_KEY))
+    return db.scalars(keyset(stmt, PAGE_KEY, after, skip, limit)).all()
 
 def get_doctor(db: Session, doctor_id: int) -> Doctor | None:
     return db.get(Doctor, doctor_id)
@@ -69,6 +78,7 @@ def update_doctor(db: Session, doctor_id: int, data_in: UserUpdate) -> Doctor |
             setattr(doctor, attr, data[attr])
 
     db.commit()
+    forget_user(doctor.role, doctor_id)
     db.refresh(doctor)
     return doctor
 
@@ -78,4 +88,27 @@ def delete_doctor(db: Session, doctor_id: int) -> bool:
         return False
     db.delete(doctor)
     db.commit()
+    forget_user(doctor.role, doctor_id)
     return True
+
+def delete_doctors(db: Session, doctor_ids: Iterable[int]) -> tuple[list[int], list[int]]:
+    """
+    Usuwa wielu lekarzy w jednej transakcji. Lekarzy z wizytami nie
+    usuwamy (historia leczenia zwierząt) – wracają jako drugi element.
+    Zwraca (usunięci, z wizytami).
+    """
+    found = db.scalars(
+        select(Doctor.id).where(Doctor.id.in_(set(doctor_ids))).order_by(Doctor.id)
+    ).all()
+    if not found:
+        return [], []
+    busy = set(db.scalars(
+        select(Appointment.doctor_id).where(Appointment.doctor_id.in_(found)).distinct()
+    ))
+    deleted = [i for i in found if i not in busy]
+    if deleted:
+        db.execute(delete(Doctor).where(Doctor.id.in_(deleted)))
+        db.commit()
+        for doctor_id in deleted:
+            forget_user("lekarz", doctor_id)
+    return deleted, sorted(busy)
@@ -1,9 +1,19 @@
+from typing import Sequence
+
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from vetclinic_api.core.fields import only
+from vetclinic_api.core.pagination import keyset
 from vetclinic_api.models.facility import Facility
 from vetclinic_api.schemas.facility import FacilityCreate, FacilityUpdate
 
-def get_facilities(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(Facility).offset(skip).limit(limit).all()
+# Stabilny klucz sortowania dla paginacji kursorowej
+PAGE_KEY = (Facility.id,)
+
+def get_facilities(db: Session, skip: int = 0, limit: int = 100, after: tuple | None = None,
+                   fields: Sequence[str] = ()):
+    stmt = select(Facility).options(*only(Facility, fields, key=PAGE_KEY))
+    return db.scalars(keyset(stmt, PAGE_KEY, after, skip, limit)).all()
 
 def get_facility(db: Session, facility_id: int):
     return db.query(Facility).filter(Facility.id == facility_id).first()
@@ -1,7 +1,16 @@
+from typing import Sequence
+
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from vetclinic_api.core.fields import only
+from vetclinic_api.core.pagination import keyset
 from vetclinic_api.models.invoice import Invoice as InvoiceModel
 from vetclinic_api.schemas.invoice import InvoiceCreate
 
+# Stabilny klucz sortowania dla paginacji kursorowej
+PAGE_KEY = (InvoiceModel.id,)
+
 def create_invoice(db: Session, inv: InvoiceCreate) -> InvoiceModel:
     db_inv = InvoiceModel(client_id=inv.client_id, amount=inv.amount)
     db.add(db_inv)
@@ -12,8 +21,24 @@ def create_invoice(db: Session, inv: InvoiceCreate) -> InvoiceModel:
 def get_invoice(db: Session, invoice_id: int) -> InvoiceModel | None:
     return db.query(InvoiceModel).filter(InvoiceModel.id == invoice_id).first()
 
-def list_invoices(db: Session, skip: int = 0, limit: int = 100) -> list[InvoiceModel]:
-    return db.query(InvoiceModel).offset(skip).limit(limit).all()
+def invoices_stmt(skip: int, limit: int | None, after: tuple | None = None,
+                   client_id: int | None = None, status: str | None = None, fields: Sequence[str] = ()):
+    stmt = select(InvoiceModel).options(*only(InvoiceModel, fields, key=PAGE_KEY))
+    if client_id is not None:
+        stmt = stmt.where(InvoiceModel.client_id == client_id)
+    if status is not None:
+        stmt = stmt.where(InvoiceModel.status == status)
+    return keyset(stmt, PAGE_KEY, after, skip, limit)
+
+def list_invoices(db: Session, skip: int = 0, limit: int | None = 100, after: tuple | None = None,
+                  client_id: int | None = None, status: str | None = None,
+                  fields: Sequence[str] = ()) -> list[InvoiceModel]:
+    return db.scalars(invoices_stmt(skip, limit, after, client_id, status, fields)).all()
+
+async def list_invoices_async(db: AsyncSession, skip: int = 0, limit: int | None = 100, after: tuple | None = None,
+                              client_id: int | None = None, status: str | None = None,
+                              fields: Sequence[str] = ()) -> list[InvoiceModel]:
+    return (await db.scalars(invoices_stmt(skip, limit, after, client_id, status, fields))).all()
 
 def update_invoice_status(db: Session, invoice_id: int, new_status: str) -> InvoiceModel | None:
     inv = get_invoice(db, invoice_id)
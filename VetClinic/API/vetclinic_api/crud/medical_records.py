@@ -1,21 +1,39 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Sequence
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
 
 from vetclinic_api.crud.appointments_crud import get_appointment
 from vetclinic_api.crud.animal_crud import get_animal
+from vetclinic_api.core.fields import only
+from vetclinic_api.core.includes import eager
+from vetclinic_api.core.pagination import keyset
 from vetclinic_api.models.medical_records import MedicalRecord as MRModel
 from vetclinic_api.schemas.medical_records import MedicalRecordCreate, MedicalRecordUpdate
-from vetclinic_api.crud import blockchain_crud
-from vetclinic_api.core.blockchain import BlockchainProvider
+from vetclinic_api.core.blockchain import get_provider
+from vetclinic_api.services import anchor_service
 
 import hashlib
 import json
 
-provider = BlockchainProvider()
+provider = get_provider()
 
-def list_medical_records(db: Session, skip: int = 0, limit: int = 100) -> List[MRModel]:
-    return db.query(MRModel).offset(skip).limit(limit).all()
+# Stabilny klucz sortowania dla paginacji kursorowej
+PAGE_KEY = (MRModel.id,)
+
+def _medical_records_stmt(skip: int, limit: int, after: tuple | None = None, include: Sequence[str] = (),
+                          fields: Sequence[str] = ()):
+    stmt = select(MRModel).options(*eager(MRModel, include), *only(MRModel, fields, include, PAGE_KEY))
+    return keyset(stmt, PAGE_KEY, after, skip, limit)
+
+def list_medical_records(db: Session, skip: int = 0, limit: int = 100, after: tuple | None = None,
+                         include: Sequence[str] = (), fields: Sequence[str] = ()) -> List[MRModel]:
+    return db.scalars(_medical_records_stmt(skip, limit, after, include, fields)).all()
+
+async def list_medical_records_async(db: AsyncSession, skip: int = 0, limit: int = 100, after: tuple | None = None,
+                                     include: Sequence[str] = (), fields: Sequence[str] = ()) -> List[MRModel]:
+    return (await db.scalars(_medical_records_stmt(skip, limit, after, include, fields))).all()
 
 def list_medical_records_by_appointment(db: Session, appointment_id: int) -> List[MRModel]:
     return (
@@ -55,6 +73,27 @@ def _compute_hash_and_payload(db_record: MRModel) -> Dict[str, Any]:
     return {"record_dict": record_dict, "data_hash": data_hash}
 
 
+def _anchor(db: Session, db_record: MRModel, op: str) -> Dict[str, Any]:
+    """Liczy hash rekordu (po flush) i kolejkuje jego zapis on-chain w bieżącej transakcji."""
+    db.flush()
+    db.refresh(db_record)
+    payload = _compute_hash_and_payload(db_record)
+    db_record.data_hash = payload["data_hash"]
+    db_record.blockchain_tx = None
+    db_record.anchor_status = "pending"
+    anchor_service.enqueue(db, anchor_service.MEDICAL_RECORD, op, db_record.id, payload["data_hash"])
+    return payload
+
+
+def _response(db_record: MRModel, payload: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        **payload["record_dict"],
+        "data_hash": payload["data_hash"],
+        "blockchain_tx": db_record.blockchain_tx,
+        "anchor_status": db_record.anchor_status,
+    }
+
+
 def create_medical_record(
     db: Session,
     data: MedicalRecordCreate
@@ -63,28 +102,19 @@ def create_medical_record(
     get_appointment(db, data.appointment_id)
     get_animal(db, data.animal_id)
 
-    # 1) Zapis do DB
+    # 1) Zapis do DB + zadanie kotwiczenia (hash) w jednej transakcji;
+    #    transakcję on-chain wyśle worker (services.anchor_service)
     db_record = MRModel(
         description=data.description,
         appointment_id=data.appointment_id,
         animal_id=data.animal_id,
     )
     db.add(db_record)
+    payload = _anchor(db, db_record, "add")
     db.commit()
-    db.refresh(db_record)
 
-    # 2) Hash + payload
-    payload = _compute_hash_and_payload(db_record)
-
-    # 3) Zapis na blockchainie
-    tx_hash = blockchain_crud.add_record(db_record.id, payload["data_hash"])
-
-    # 4) Zwrócenie pełnych danych
-    return {
-        **payload["record_dict"],
-        "data_hash": payload["data_hash"],
-        "blockchain_tx": tx_hash
-    }
+    # 2) Zwrócenie pełnych danych (blockchain_tx uzupełni worker)
+    return _response(db_record, payload)
 
 
 def update_medical_record(
@@ -104,30 +134,17 @@ def update_medical_record(
     if rec_update.description is not None:
         db_rec.description = rec_update.description
 
+    # Nowy hash + kolejkowana aktualizacja on-chain
+    payload = _anchor(db, db_rec, "update")
     db.commit()
-    db.refresh(db_rec)
-
-    # Nowy hash + payload
-    payload = _compute_hash_and_payload(db_rec)
 
-    # Aktualizacja on-chain
-    tx_hash = blockchain_crud.update_record(db_rec.id, payload["data_hash"])
+    return _response(db_rec, payload)
 
-    return {
-        **payload["record_dict"],
-        "data_hash": payload["data_hash"],
-        "blockchain_tx": tx_hash
-    }
 
-
-def delete_medical_record(db: Session, record_id: int) -> str:
-    # 1) Oznacz rekord jako usunięty on-chain
-    #    (wymaga, aby kontrakt miał funkcję deleteRecord)
-    tx_hash = blockchain_crud.delete_record(record_id)
-
-    # 2) Usuń z DB
+def delete_medical_record(db: Session, record_id: int) -> None:
+    # Usuwamy z DB i kolejkujemy oznaczenie rekordu jako usuniętego on-chain
+    # (wymaga, aby kontrakt miał funkcję deleteRecord)
     db_rec = get_medical_record(db, record_id)
+    anchor_service.enqueue(db, anchor_service.MEDICAL_RECORD, "delete", record_id)
     db.delete(db_rec)
     db.commit()
-
-    return tx_hash
@@ -1,17 +1,25 @@
+from typing import Iterable, Sequence
+
+from sqlalchemy import delete, select
 from sqlalchemy.orm import Session
-from passlib.context import CryptContext
 import secrets
 
+from vetclinic_api.core.auth import forget_user
+from vetclinic_api.core.fields import only
+from vetclinic_api.core.pagination import keyset
+from vetclinic_api.core.security import get_password_hash
+from vetclinic_api.crud.animal_crud import purge_animals
 from vetclinic_api.models.users import Client
 from vetclinic_api.models.animals import Animal
 from vetclinic_api.models.appointments import Appointment
+from vetclinic_api.models.invoice import Invoice
+from vetclinic_api.models.medical_records import MedicalRecord
 from vetclinic_api.schemas.users import ClientCreate, UserUpdate
+from vetclinic_api.services import anchor_service
 from vetclinic_api.services.email_service import EmailService
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+# Stabilny klucz sortowania dla paginacji kursorowej
+PAGE_KEY = (Client.id,)
 
 def create_client(db: Session, cli_in: ClientCreate) -> Client:
     raw_password = secrets.token_urlsafe(16)
@@ -29,14 +37,19 @@ def create_client(db: Session, cli_in: ClientCreate) -> Client:
         wallet_address       = cli_in.wallet_address,
     )
     db.add(client)
+    # hasło tymczasowe wyśle nadawca outbox – zapis w tej samej transakcji co konto
+    EmailService.queue_temporary_password(db, client.email, raw_password)
     db.commit()
     db.refresh(client)
-
-    EmailService.send_temporary_password(client.email, raw_password)
     return client
 
-def list_clients(db: Session) -> list[Client]:
-    return db.query(Client).all()
+def list_clients(
+    db: Session, skip: int = 0, limit: int | None = None, after: tuple | None = None,
+    fields: Sequence[str] = (),
+) -> list[Client]:
+    """Klienci posortowani po id; limit=None zwraca wszystkich (np. listy w GUI)."""
+    stmt = select(Client).options(*only(Client, fields, key=PAGE_KEY))
+    return db.scalars(keyset(stmt, PAGE_KEY, after, skip, limit)).all()
 
 def get_client(db: Session, client_id: int) -> Client | None:
     return db.get(Client, client_id)
@@ -56,15 +69,40 @@ def update_client(db: Session, client_id: int, data_in: UserUpdate) -> Client |
             setattr(client, attr, data[attr])
 
     db.commit()
+    forget_user(client.role, client_id)
     db.refresh(client)
     return client
 
 def delete_client(db: Session, client_id: int) -> bool:
-    client = get_client(db, client_id)
-    if not client:
-        return False
-    db.query(Appointment).filter(Appointment.owner_id == client_id).delete(synchronize_session=False)
-    db.query(Animal).filter(Animal.owner_id == client_id).delete(synchronize_session=False)
-    db.delete(client)
+    return bool(delete_clients(db, [client_id]))
+
+def delete_clients(db: Session, client_ids: Iterable[int]) -> list[int]:
+    """
+    Usuwa wielu klientów w jednej transakcji (jeden commit): ich wizyty,
+    zwierzęta (z dokumentacją i wagą) i faktury. Zwraca ID usuniętych.
+    Usuwana dokumentacja trafia do kolejki kotwiczenia jako "delete".
+    """
+    found = db.scalars(
+        select(Client.id).where(Client.id.in_(set(client_ids))).order_by(Client.id)
+    ).all()
+    if not found:
+        return []
+    # przy włączonych kluczach obcych najpierw historia leczenia z wizyt klientów;
+    # domyślne synchronize_session usuwa skasowane obiekty także z sesji
+    visits = select(Appointment.id).where(Appointment.owner_id.in_(found))
+    anchor_service.enqueue_record_deletes(db, MedicalRecord.appointment_id.in_(visits))
+    for stmt in (
+        delete(MedicalRecord).where(MedicalRecord.appointment_id.in_(visits)),
+        delete(Appointment).where(Appointment.owner_id.in_(found)),
+    ):
+        db.execute(stmt)
+    purge_animals(db, select(Animal.id).where(Animal.owner_id.in_(found)))
+    for stmt in (
+        delete(Invoice).where(Invoice.client_id.in_(found)),
+        delete(Client).where(Client.id.in_(found)),
+    ):
+        db.execute(stmt)
     db.commit()
-    return True
+    for client_id in found:
+        forget_user("klient", client_id)
+    return list(found)
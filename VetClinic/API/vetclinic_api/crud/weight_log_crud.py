@@ -1,11 +1,30 @@
 # vetclinic_api/crud/weight_log_crud.py
 
+from datetime import datetime
+from typing import Sequence
+
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from vetclinic_api.core.fields import only
+from vetclinic_api.core.pagination import keyset
 from vetclinic_api.models.weight_logs import WeightLog as WeightLogModel
 from vetclinic_api.schemas.weight_logs import WeightLogCreate
 
-def list_weight_logs(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(WeightLogModel).offset(skip).limit(limit).all()
+# Stabilny klucz sortowania dla paginacji kursorowej
+PAGE_KEY = (WeightLogModel.id,)
+
+def list_weight_logs(db: Session, skip: int = 0, limit: int | None = 100, after: tuple | None = None,
+                     animal_id: int | None = None, date_from: datetime | None = None,
+                     date_to: datetime | None = None, fields: Sequence[str] = ()):
+    # zakres półotwarty: date_from <= recorded_at < date_to
+    stmt = select(WeightLogModel).options(*only(WeightLogModel, fields, key=PAGE_KEY))
+    if animal_id is not None:
+        stmt = stmt.where(WeightLogModel.animal_id == animal_id)
+    if date_from is not None:
+        stmt = stmt.where(WeightLogModel.recorded_at >= date_from)
+    if date_to is not None:
+        stmt = stmt.where(WeightLogModel.recorded_at < date_to)
+    return db.scalars(keyset(stmt, PAGE_KEY, after, skip, limit)).all()
 
 def get_weight_log(db: Session, log_id: int):
     return db.query(WeightLogModel).filter(WeightLogModel.id == log_id).first()
@@ -1,9 +1,13 @@
 """
 Główny punkt wejścia aplikacji FastAPI.
-Importuje wszystkie moduły, rejestruje routery, konfiguruje bazę danych.
+Importuje wszystkie moduły, rejestruje routery, sprawdza rewizję schematu bazy.
 """
 
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request, status
+from fastapi.responses import ORJSONResponse
 from dotenv import load_dotenv
 load_dotenv()
 import uvicorn
@@ -11,16 +15,63 @@ import uvicorn
 from vetclinic_api.routers import (
     users, doctors, appointments, animals,
     weight_logs, medical_records, invoices,
-    consultants, facilities, blockchain, payments
+    consultants, facilities, blockchain, payments, metrics
 )
-from vetclinic_api.core.database import engine, Base
+from vetclinic_api.core import hashing, throttle
+from vetclinic_api.core.config import ANCHOR_QUEUE_ENABLED, EMAIL_OUTBOX_ENABLED, SCHEMA_CHECK
+from vetclinic_api.core.ratelimit import RateLimitMiddleware
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Jedno zapytanie o rewizję Alembica przy starcie – bez create_all/DDL.
+    # Schemat przygotowuje: python -m vetclinic_api.core.schema bootstrap
+    if SCHEMA_CHECK == "verify":
+        from vetclinic_api.core.schema import verify_schema
+        verify_schema()
+    # blokady logowania zapisujemy do bazy partiami (core.throttle)
+    flusher = asyncio.create_task(throttle.flush_periodically())
+    # e-maile z outbox wysyła nadawca w tle (services.email_service)
+    mailer = None
+    if EMAIL_OUTBOX_ENABLED:
+        from vetclinic_api.services.email_service import OutboxSender
+        mailer = asyncio.create_task(OutboxSender().run())
+    # zapisy on-chain z kolejki wysyła worker w tle (services.anchor_service)
+    anchorer = None
+    if ANCHOR_QUEUE_ENABLED:
+        from vetclinic_api.services.anchor_service import anchor_worker
+        anchorer = asyncio.create_task(anchor_worker().run())
+    yield
+    tasks = [task for task in (flusher, mailer, anchorer) if task is not None]
+    for task in tasks:
+        task.cancel()
+    # zadania kończą bieżącą partię (i zamykają połączenia) przed resztą sprzątania
+    await asyncio.gather(*tasks, return_exceptions=True)
+    await asyncio.to_thread(throttle.flush_lockouts)
+    hashing.hasher.shutdown()
+
 
 app = FastAPI(
     title="System Zarządzania Kliniką Weterynaryjną",
     description="Aplikacja wykorzystująca FastAPI, SQLAlchemy oraz defensywne programowanie.",
     version="1.0.0",
+    lifespan=lifespan,
+    # orjson zamiast json.dumps – główny koszt CPU przy dużych listach
+    default_response_class=ORJSONResponse,
 )
 
+@app.exception_handler(hashing.HashingOverloaded)
+async def hashing_overloaded(request: Request, exc: hashing.HashingOverloaded):
+    # Pula bcrypt pełna – szybka odmowa zamiast blokowania wątków serwera
+    return ORJSONResponse(
+        {"detail": str(exc)},
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        headers={"Retry-After": "1"},
+    )
+
+# Budżety żądań dla logowania, tworzenia wizyt, blockchaina i płatności
+app.add_middleware(RateLimitMiddleware)
+
 # Rejestracja routerów
 app.include_router(users.router)
 app.include_router(doctors.router)
@@ -34,10 +85,7 @@ app.include_router(weight_logs.router)
 app.include_router(blockchain.router)
 app.include_router(invoices.router)
 app.include_router(payments.router)
- 
-
-# Tworzenie tabel w bazie danych (jeśli nie istnieją)
-Base.metadata.create_all(bind=engine)
+app.include_router(metrics.router)
 
 if __name__ == "__main__":
     uvicorn.run("app.main:app", host="127.0.0.1", port=8000, reload=True)
\ No newline at end of file
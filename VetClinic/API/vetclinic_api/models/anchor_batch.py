@@ -0,0 +1,25 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index
+from vetclinic_api.core.database import Base
+import datetime
+
+class AnchorBatch(Base):
+    """Partia zadań anchor_queue zapisana on-chain jako jeden korzeń drzewa Merkle."""
+    __tablename__ = "anchor_batches"
+    __table_args__ = (
+        # Worker wybiera partie do wysłania: status + termin kolejnej próby
+        Index("ix_anchor_batches_status_next_attempt_at", "status", "next_attempt_at"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    # korzeń drzewa (0x + 64 znaki hex), core.merkle
+    root = Column(String(66), nullable=True, unique=True)
+    leaf_count = Column(Integer, default=0, nullable=False)
+    # pending -> anchored, albo failed po ANCHOR_MAX_ATTEMPTS nieudanych próbach
+    status = Column(String(20), default="pending", nullable=False)
+    attempts = Column(Integer, default=0, nullable=False)
+    next_attempt_at = Column(DateTime, default=datetime.datetime.utcnow, nullable=False)
+    locked_by = Column(String(36), nullable=True)
+    tx_hash = Column(String, nullable=True)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.datetime.utcnow, nullable=False)
+    anchored_at = Column(DateTime, nullable=True)
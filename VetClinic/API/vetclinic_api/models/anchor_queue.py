@@ -0,0 +1,37 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index
+from vetclinic_api.core.database import Base
+import datetime
+
+class AnchorJob(Base):
+    """Zapis hasha wizyty/rekordu on-chain czekający na services.anchor_service.AnchorWorker."""
+    __tablename__ = "anchor_queue"
+    __table_args__ = (
+        # Worker wybiera zadania do wysłania: status + termin kolejnej próby
+        Index("ix_anchor_queue_status_next_attempt_at", "status", "next_attempt_at"),
+        # Kolejność operacji na tym samym rekordzie (add -> update -> delete)
+        Index("ix_anchor_queue_kind_record_id", "kind", "record_id"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    # "appointment" albo "medical_record"
+    kind = Column(String(20), nullable=False)
+    # "add", "update" albo "delete" (funkcje kontraktu MedicalRecord)
+    op = Column(String(10), nullable=False)
+    record_id = Column(Integer, nullable=False)
+    data_hash = Column(String, nullable=True)
+    # pending -> anchored, albo failed po ANCHOR_MAX_ATTEMPTS nieudanych próbach
+    status = Column(String(20), default="pending", nullable=False)
+    attempts = Column(Integer, default=0, nullable=False)
+    next_attempt_at = Column(DateTime, default=datetime.datetime.utcnow, nullable=False)
+    # worker, który zarezerwował zadanie (do next_attempt_at)
+    locked_by = Column(String(36), nullable=True)
+    # hash wysłanej transakcji – po restarcie workera sprawdzamy jej receipt zamiast wysyłać ponownie
+    tx_hash = Column(String, nullable=True)
+    last_error = Column(Text, nullable=True)
+    # Tryb "merkle": partia (anchor_batches), pozycja liścia i dowód przynależności
+    # (JSON: lista sąsiadów 0x...), core.merkle
+    batch_id = Column(Integer, nullable=True, index=True)
+    leaf_index = Column(Integer, nullable=True)
+    merkle_proof = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.datetime.utcnow, nullable=False)
+    anchored_at = Column(DateTime, nullable=True)
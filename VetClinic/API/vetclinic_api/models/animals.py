@@ -10,7 +10,7 @@ class Animal(Base):
     __tablename__ = "animals"
 
     id = Column(Integer, primary_key=True, index=True)
-    owner_id = Column(Integer, ForeignKey("clients.id"), nullable=False, comment="ID właściciela zwierzęcia")
+    owner_id = Column(Integer, ForeignKey("clients.id"), nullable=False, index=True, comment="ID właściciela zwierzęcia")
     name = Column(String, nullable=False, index=True, comment="Imię zwierzęcia")
     species = Column(String, nullable=False, index=True, comment="Gatunek zwierzęcia, np. pies, kot")
     breed = Column(String, nullable=True, comment="Rasa zwierzęcia, może być pusta w przypadku zwierząt mieszanych")
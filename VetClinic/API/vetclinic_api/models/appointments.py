@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Float, UniqueConstraint
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Float, UniqueConstraint, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from vetclinic_api.core.database import Base
@@ -9,12 +9,18 @@ class Appointment(Base):
     __table_args__ = (
         # Blokada: jeden lekarz nie może mieć dwóch wizyt w tej samej sekundzie
         UniqueConstraint('doctor_id', 'visit_datetime', name='uq_doctor_visit_datetime'),
+        # Historia wizyt zwierzęcia (filtr + sortowanie po dacie)
+        Index('ix_appointments_animal_id_visit_datetime', 'animal_id', 'visit_datetime'),
+        # Paginacja kursorowa listy wizyt: ORDER BY visit_datetime, id
+        Index('ix_appointments_visit_datetime_id', 'visit_datetime', 'id'),
+        # Filtr wizyt placówki w zakresie dat (?facility_id=&from=&to=)
+        Index('ix_appointments_facility_id_visit_datetime', 'facility_id', 'visit_datetime'),
     )
 
     id             = Column(Integer, primary_key=True, index=True)
     doctor_id      = Column(Integer, ForeignKey("doctors.id"), nullable=False)
     animal_id      = Column(Integer, ForeignKey("animals.id"), nullable=False)
-    owner_id       = Column(Integer, ForeignKey("clients.id"), nullable=False)
+    owner_id       = Column(Integer, ForeignKey("clients.id"), nullable=False, index=True)
     facility_id    = Column(Integer, ForeignKey("facilities.id"), nullable=False)
     visit_datetime = Column(DateTime, nullable=False)
     reason         = Column(Text,   nullable=True, comment="Powód wizyty lub rodzaj usługi")
@@ -0,0 +1,25 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index
+from vetclinic_api.core.database import Base
+import datetime
+
+class EmailOutbox(Base):
+    """Wiadomość e-mail czekająca na wysłanie przez services.email_service.OutboxSender."""
+    __tablename__ = "email_outbox"
+    __table_args__ = (
+        # Nadawca wybiera wiadomości do wysłania: status + termin kolejnej próby
+        Index("ix_email_outbox_status_next_attempt_at", "status", "next_attempt_at"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    to_address = Column(String, nullable=False)
+    subject = Column(String, nullable=False)
+    body = Column(Text, nullable=False)
+    # pending -> sent, albo failed po EMAIL_MAX_ATTEMPTS nieudanych próbach
+    status = Column(String(20), default="pending", nullable=False)
+    attempts = Column(Integer, default=0, nullable=False)
+    next_attempt_at = Column(DateTime, default=datetime.datetime.utcnow, nullable=False)
+    # nadawca, który zarezerwował wiadomość (do next_attempt_at)
+    locked_by = Column(String(36), nullable=True)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.datetime.utcnow, nullable=False)
+    sent_at = Column(DateTime, nullable=True)
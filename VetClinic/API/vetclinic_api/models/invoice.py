@@ -1,12 +1,16 @@
-from sqlalchemy import Column, Integer, String, Numeric, DateTime
+from sqlalchemy import Column, Integer, String, Numeric, DateTime, Index
 from vetclinic_api.core.database import Base
 import datetime
 
 class Invoice(Base):
     __tablename__ = "invoices"
+    __table_args__ = (
+        # Faktury klienta (opcjonalnie z filtrem statusu) – zastępuje indeks na samym client_id
+        Index("ix_invoices_client_id_status", "client_id", "status"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    client_id = Column(Integer, nullable=False, index=True)
+    client_id = Column(Integer, nullable=False)
     amount = Column(Numeric(10, 2), nullable=False)
     status = Column(String(20), default="pending", nullable=False)
     created_at = Column(DateTime, default=datetime.datetime.utcnow, nullable=False)
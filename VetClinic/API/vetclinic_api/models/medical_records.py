@@ -8,12 +8,17 @@ class MedicalRecord(Base):
     __tablename__ = "medical_records"
 
     id = Column(Integer, primary_key=True, index=True)
-    animal_id = Column(Integer, ForeignKey("animals.id", ondelete="CASCADE"), nullable=False)
-    appointment_id = Column(Integer, ForeignKey("appointments.id"), nullable=False)
+    animal_id = Column(Integer, ForeignKey("animals.id", ondelete="CASCADE"), nullable=False, index=True)
+    appointment_id = Column(Integer, ForeignKey("appointments.id"), nullable=False, index=True)
     description = Column(Text, nullable=False)
     diagnosis = Column(Text, nullable=True)
     treatment = Column(Text, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Kotwiczenie on-chain (services.anchor_service): hash bieżącej treści,
+    # transakcja, która go zapisała, i stan: pending / anchored / failed
+    data_hash = Column(String(64), nullable=True)
+    blockchain_tx = Column(String, nullable=True)
+    anchor_status = Column(String(20), nullable=True)
 
     animal = relationship("Animal", back_populates="medical_records")
     appointment = relationship("Appointment", back_populates="medical_records")
\ No newline at end of file
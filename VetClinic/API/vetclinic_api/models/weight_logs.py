@@ -1,9 +1,13 @@
-from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey, func
+from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey, Index, func
 from vetclinic_api.core.database import Base
 from sqlalchemy.orm import relationship
 
 class WeightLog(Base):
     __tablename__ = "weight_logs"
+    __table_args__ = (
+        # Wykres wagi zwierzęcia: filtr po animal_id, zakres/sortowanie po dacie
+        Index("ix_weight_logs_animal_id_recorded_at", "animal_id", "recorded_at"),
+    )
     id = Column(Integer, primary_key=True)
     animal_id = Column(Integer, ForeignKey("animals.id", ondelete="CASCADE"), nullable=False)
     recorded_at = Column(DateTime(timezone=True), server_default=func.now(), comment="Kiedy zmierzono wagę")
@@ -1,9 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
 from vetclinic_api.schemas.animal import Animal, AnimalCreate, AnimalUpdate
+from vetclinic_api.schemas.bulk import BulkDeleteResult
+from vetclinic_api.schemas.includes import ANIMAL_RELATIONS, AnimalExpanded
 from vetclinic_api.crud import animal_crud
-from vetclinic_api.core.database import get_db 
+from vetclinic_api.core.database import get_db, get_async_db
+from vetclinic_api.core.encoding import respond
+from vetclinic_api.core.fields import parse_fields
+from vetclinic_api.core.includes import embed, parse_include
+from vetclinic_api.core.pagination import Page
 
 router = APIRouter(
     prefix="/animals",
@@ -14,10 +21,25 @@ router = APIRouter(
 def create_animal(animal: AnimalCreate, db: Session = Depends(get_db)):
     return animal_crud.create_animal(db, animal)
 
-@router.get("/", response_model=List[Animal])
-def read_animals(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    animals = animal_crud.get_animals(db, skip=skip, limit=limit)
-    return animals
+@router.get("/", response_model=List[AnimalExpanded], response_model_exclude_unset=True)
+async def read_animals(
+    page: Page = Depends(),
+    owner_id: Optional[int] = None,
+    include: Optional[str] = Query(None, description="Np. owner,medical_records,weight_logs"),
+    fields: Optional[str] = Query(None, description="Np. id,name"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    names = parse_include(include, ANIMAL_RELATIONS)
+    cols = parse_fields(fields, Animal)
+    animals = await animal_crud.get_animals_async(
+        db, skip=page.skip, limit=page.fetch_limit, after=page.after(animal_crud.PAGE_KEY),
+        owner_id=owner_id, include=names, fields=cols,
+    )
+    animals = page.finish(animals, animal_crud.PAGE_KEY)
+    if not names:
+        return respond(page, animals, Animal, fields=cols, lean=True)
+    data = [embed(a, Animal, ANIMAL_RELATIONS, names, cols) for a in animals]
+    return respond(page, data, lean=True)
 
 @router.get("/{animal_id}", response_model=Animal)
 def read_animal(animal_id: int, db: Session = Depends(get_db)):
@@ -39,3 +61,9 @@ def delete_animal(animal_id: int, db: Session = Depends(get_db)):
     if db_animal is None:
         raise HTTPException(status_code=404, detail="Animal not found")
     return db_animal
+
+@router.delete("/", response_model=BulkDeleteResult)
+def delete_animals(animal_ids: List[int] = Body(...), db: Session = Depends(get_db)):
+    # jedna transakcja: wizyty, dokumentacja i pomiary wagi usuwanych zwierząt
+    deleted = animal_crud.delete_animals(db, animal_ids)
+    return BulkDeleteResult(deleted=deleted, not_found=sorted(set(animal_ids) - set(deleted)))
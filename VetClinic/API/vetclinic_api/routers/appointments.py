@@ -1,14 +1,20 @@
 # VetClinic/API/vetclinic_api/routers/appointments.py
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Body, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
 from datetime import date, datetime, time, timedelta
 
 from vetclinic_api.schemas.appointment import Appointment, AppointmentCreate, AppointmentUpdate
+from vetclinic_api.schemas.bulk import BulkDeleteResult
+from vetclinic_api.schemas.includes import APPOINTMENT_RELATIONS, AppointmentExpanded
 from vetclinic_api.crud import appointments_crud
-from vetclinic_api.core.database import get_db
-from vetclinic_api.models.appointments import Appointment as AppointmentModel
+from vetclinic_api.core.database import get_db, get_async_db
+from vetclinic_api.core.encoding import JSON, MSGPACK, NDJSON, ndjson_response, negotiate, respond
+from vetclinic_api.core.fields import parse_fields
+from vetclinic_api.core.includes import embed, parse_include
+from vetclinic_api.core.pagination import Page
 
 router = APIRouter(
     prefix="/appointments",
@@ -19,9 +25,39 @@ router = APIRouter(
 def create_appointment(appointment: AppointmentCreate, db: Session = Depends(get_db)):
     return appointments_crud.create_appointment(db, appointment)
 
-@router.get("/", response_model=List[Appointment])
-def read_appointments(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return appointments_crud.get_appointments(db, skip=skip, limit=limit)
+@router.get("/", response_model=List[AppointmentExpanded], response_model_exclude_unset=True)
+async def read_appointments(
+    page: Page = Depends(),
+    doctor_id: Optional[int] = None,
+    facility_id: Optional[int] = None,
+    owner_id: Optional[int] = None,
+    animal_id: Optional[int] = None,
+    date_from: Optional[datetime] = Query(None, alias="from", description="Od (włącznie)"),
+    date_to: Optional[datetime] = Query(None, alias="to", description="Do (wyłącznie)"),
+    priority: Optional[str] = None,
+    include: Optional[str] = Query(None, description="Np. doctor,owner,animal,facility,medical_records"),
+    fields: Optional[str] = Query(None, description="Np. id,visit_datetime,reason"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    names = parse_include(include, APPOINTMENT_RELATIONS)
+    cols = parse_fields(fields, Appointment)
+    filters = dict(
+        doctor_id=doctor_id, facility_id=facility_id, owner_id=owner_id, animal_id=animal_id,
+        date_from=date_from, date_to=date_to, priority=priority, include=names, fields=cols,
+    )
+    after = page.after(appointments_crud.PAGE_KEY)
+    if negotiate(page.request, (JSON, MSGPACK, NDJSON)) == NDJSON:
+        # eksport całej listy (od kursora/skip), bez limitu strony
+        stmt = appointments_crud.appointments_stmt(page.skip, None, after, **filters)
+        return ndjson_response(db, stmt, lambda r: embed(r, Appointment, APPOINTMENT_RELATIONS, names, cols))
+    rows = await appointments_crud.get_appointments_async(
+        db, skip=page.skip, limit=page.fetch_limit, after=after, **filters
+    )
+    rows = page.finish(rows, appointments_crud.PAGE_KEY)
+    if not names:
+        return respond(page, rows, Appointment, fields=cols, lean=True)
+    data = [embed(r, Appointment, APPOINTMENT_RELATIONS, names, cols) for r in rows]
+    return respond(page, data, lean=True)
 
 @router.get("/{appointment_id}", response_model=Appointment)
 def read_appointment(appointment_id: int, db: Session = Depends(get_db)):
@@ -44,20 +80,25 @@ def delete_appointment(appointment_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Appointment not found")
     return db_appointment
 
+@router.delete("/", response_model=BulkDeleteResult)
+def delete_appointments(appointment_ids: List[int] = Body(...), db: Session = Depends(get_db)):
+    deleted = appointments_crud.delete_appointments(db, appointment_ids)
+    return BulkDeleteResult(deleted=deleted, not_found=sorted(set(appointment_ids) - set(deleted)))
+
 @router.get(
     "/free_slots/",
     response_model=List[str],
     summary="Zwraca wolne kwadransowe sloty (HH:MM) dla lekarza w zadanym dniu"
 )
-def get_free_slots(
+async def get_free_slots(
     doctor_id: int = Query(..., description="ID lekarza"),
     date: date = Query(..., description="Data wizyty w formacie YYYY-MM-DD"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     1. Jeśli dzień tygodnia to niedziela (weekday()==6), zwraca [].
     2. Generuje wszystkie kwadransy od 08:00 do 18:45.
-    3. Pobiera z bazy wszystkie istniejące wizyty (Appointment) dla doctor_id w tym dniu.
+    3. Pobiera z bazy godziny istniejących wizyt (Appointment) dla doctor_id w tym dniu.
     4. Filtruje out te godziny (HH:MM), które są już zajęte.
     5. Zwraca posortowaną listę wolnych godzin jako ["HH:MM", ...].
     """
@@ -73,25 +114,12 @@ def get_free_slots(
         all_slots.append(current.strftime("%H:%M"))
         current += timedelta(minutes=15)
 
-    # 3) Ustalamy granice całego dnia (00:00:00–23:59:59)
-    start_of_day = datetime.combine(date, time(hour=0, minute=0, second=0))
-    end_of_day = datetime.combine(date, time(hour=23, minute=59, second=59))
-
-    # 4) Pobieramy z bazy wszystkie wizyty lekarza w tym dniu
-    appointments = (
-        db
-        .query(AppointmentModel)
-        .filter(
-            AppointmentModel.doctor_id == doctor_id,
-            AppointmentModel.visit_datetime >= start_of_day,
-            AppointmentModel.visit_datetime <= end_of_day
-        )
-        .all()
-    )
+    # 3) Pobieramy z bazy godziny wszystkich wizyt lekarza w tym dniu (00:00:00–23:59:59)
+    visit_times = await appointments_crud.get_doctor_visit_times_async(db, doctor_id, date)
 
-    # 5) Wyciągamy zestaw zajętych kwadransów w formacie "HH:MM"
-    busy_slots = {app.visit_datetime.strftime("%H:%M") for app in appointments}
+    # 4) Wyciągamy zestaw zajętych kwadransów w formacie "HH:MM"
+    busy_slots = {visit.strftime("%H:%M") for visit in visit_times}
 
-    # 6) Tworzymy listę wolnych slotów
+    # 5) Tworzymy listę wolnych slotów
     free_slots = [slot for slot in all_slots if slot not in busy_slots]
     return free_slots
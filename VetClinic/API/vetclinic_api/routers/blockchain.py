@@ -1,5 +1,6 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Response
 from pydantic import BaseModel
+from vetclinic_api.core.blockchain import get_provider
 from vetclinic_api.crud import blockchain_crud
 
 router = APIRouter()
@@ -8,6 +9,16 @@ class BlockchainRecord(BaseModel):
     id: int
     data_hash: str
 
+@router.get("/blockchain/health")
+def blockchain_health(response: Response):
+    """
+    Sonda stanu węzła i kontraktu: 200 gdy blockchain jest dostępny, 503 w przeciwnym razie.
+    """
+    health = get_provider().health()
+    if not health["ok"]:
+        response.status_code = 503
+    return health
+
 @router.post("/blockchain/record")
 def add_blockchain_record(record: BlockchainRecord):
     try:
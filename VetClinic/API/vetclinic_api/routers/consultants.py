@@ -1,9 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from typing import List, Optional
 from sqlalchemy.orm import Session
 
 from vetclinic_api.core.database import get_db
+from vetclinic_api.core.encoding import respond
+from vetclinic_api.core.fields import parse_fields
+from vetclinic_api.core.pagination import Page
 from vetclinic_api.crud.consultants import (
+    PAGE_KEY,
     create_consultant, list_consultants,
     get_consultant, update_consultant, delete_consultant
 )
@@ -12,8 +16,15 @@ from vetclinic_api.schemas.users import ConsultantCreate, ConsultantOut, UserUpd
 router = APIRouter(prefix="/consultants", tags=["consultants"])
 
 @router.get("/", response_model=List[ConsultantOut])
-def read_consultants(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return list_consultants(db, skip=skip, limit=limit)
+def read_consultants(
+    page: Page = Depends(),
+    fields: Optional[str] = Query(None, description="Np. id,first_name,last_name"),
+    db: Session = Depends(get_db),
+):
+    cols = parse_fields(fields, ConsultantOut)
+    rows = list_consultants(db, skip=page.skip, limit=page.fetch_limit, after=page.after(PAGE_KEY), fields=cols)
+    rows = page.finish(rows, PAGE_KEY)
+    return respond(page, rows, ConsultantOut, cols)
 
 
 @router.post("/", response_model=ConsultantOut, status_code=status.HTTP_201_CREATED)
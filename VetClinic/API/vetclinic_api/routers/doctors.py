@@ -1,22 +1,48 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, status
+from itertools import count
+from typing import Iterator, List, Optional
 from sqlalchemy.orm import Session
 
 from vetclinic_api.core.database import get_db
+from vetclinic_api.core.encoding import respond
+from vetclinic_api.core.fields import parse_fields
+from vetclinic_api.core.pagination import Page
+from vetclinic_api.core.unique_email import create_with_unique_email
 from vetclinic_api.crud.doctors import (
+    PAGE_KEY,
     create_doctor, list_doctors, get_doctor,
-    update_doctor, delete_doctor
+    update_doctor, delete_doctor, delete_doctors
 )
 from vetclinic_api.models.users import Doctor
+from vetclinic_api.schemas.bulk import BulkDeleteResult
 from vetclinic_api.schemas.users import DoctorCreate, DoctorOut, UserUpdate
 
 router = APIRouter(prefix="/doctors", tags=["doctors"])
 
+DOCTOR_EMAIL_DOMAIN = "lekarz.vetclinic.com"
+
 
 @router.get("/", response_model=List[DoctorOut])
-def read_doctors(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    docs = list_doctors(db)
-    return docs[skip : skip + limit]
+def read_doctors(
+    page: Page = Depends(),
+    fields: Optional[str] = Query(None, description="Np. id,first_name,last_name"),
+    db: Session = Depends(get_db),
+):
+    cols = parse_fields(fields, DoctorOut)
+    docs = list_doctors(db, skip=page.skip, limit=page.fetch_limit, after=page.after(PAGE_KEY), fields=cols)
+    docs = page.finish(docs, PAGE_KEY)
+    return respond(page, docs, DoctorOut, cols)
+
+
+def doctor_local_parts(first: str, last: str) -> Iterator[str]:
+    """Kandydaci na część lokalną adresu lekarza, w kolejności preferencji."""
+    yield f"{first[0]}.{last}"
+    yield f"{first[0]}{last}"
+    for i in range(2, len(first) + 1):
+        yield f"{first[:i]}{last}"
+    # ostateczny suffix
+    for suffix in count(1):
+        yield f"{first[0]}{last}{suffix}"
 
 
 @router.post("/", response_model=DoctorOut, status_code=status.HTTP_201_CREATED)
@@ -25,41 +51,16 @@ def create_doctor_endpoint(data: DoctorCreate, db: Session = Depends(get_db)):
     first = data.first_name.strip().lower()
     last  = data.last_name.strip().lower()
 
-    # 2) generowanie unikatowego emaila
-    base  = f"{first[0]}.{last}"
-    email = f"{base}@lekarz.vetclinic.com"
-    if db.query(Doctor).filter_by(email=email).first():
-        base = f"{first[0]}{last}"
-        email = f"{base}@lekarz.vetclinic.com"
-        if db.query(Doctor).filter_by(email=email).first():
-            i = 2
-            while i <= len(first):
-                prefix = first[:i]
-                tmp    = f"{prefix}{last}@lekarz.vetclinic.com"
-                if not db.query(Doctor).filter_by(email=tmp).first():
-                    email = tmp
-                    break
-                i += 1
-            else:
-                # ostateczny suffix
-                suffix = 1
-                base0  = f"{first[0]}{last}"
-                while True:
-                    tmp = f"{base0}{suffix}@lekarz.vetclinic.com"
-                    if not db.query(Doctor).filter_by(email=tmp).first():
-                        email = tmp
-                        break
-                    suffix += 1
-
-    # 3) podmień w danych
-    data_dict = data.model_dump()
-    data_dict["email"] = email
-
-    # 4) wywołaj CRUD (który sam wygeneruje hasło i wyśle je na backup_email)
-    raw_password, doctor = create_doctor(db, DoctorCreate(**data_dict))
-
-    # 5) zwróć od razu utworzony obiekt
-    return doctor
+    # 2) CRUD sam wygeneruje hasło i zakolejkuje je na backup_email
+    def create(email: str):
+        raw_password, doctor = create_doctor(db, DoctorCreate(**{**data.model_dump(), "email": email}))
+        return doctor
+
+    # 3) unikatowy email: jedno zapytanie o zajęte adresy, ponowienie przy wyścigu
+    return create_with_unique_email(
+        db, Doctor.email, lambda: doctor_local_parts(first, last),
+        prefix=first[0], contains=last, domain=DOCTOR_EMAIL_DOMAIN, create=create,
+    )
 
 
 @router.get("/{doctor_id}", response_model=DoctorOut)
@@ -83,3 +84,13 @@ def delete_doctor_endpoint(doctor_id: int, db: Session = Depends(get_db)):
     ok = delete_doctor(db, doctor_id)
     if not ok:
         raise HTTPException(status.HTTP_404_NOT_FOUND, "Doctor not found")
+
+
+@router.delete("/", response_model=BulkDeleteResult)
+def delete_many_doctors(doctor_ids: List[int] = Body(...), db: Session = Depends(get_db)):
+    # lekarze z wizytami zostają (conflict) – pozostali w jednej transakcji
+    deleted, conflict = delete_doctors(db, doctor_ids)
+    return BulkDeleteResult(
+        deleted=deleted, conflict=conflict,
+        not_found=sorted(set(doctor_ids) - set(deleted) - set(conflict)),
+    )
@@ -1,19 +1,30 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from typing import List, Optional
 from sqlalchemy.orm import Session
 
 from vetclinic_api.schemas.facility import FacilityCreate, FacilityRead, FacilityUpdate
 from vetclinic_api.crud.facility_crud import (
+    PAGE_KEY,
     get_facilities, get_facility, create_facility,
     update_facility, delete_facility
 )
 from vetclinic_api.core.database import get_db
+from vetclinic_api.core.encoding import respond
+from vetclinic_api.core.fields import parse_fields
+from vetclinic_api.core.pagination import Page
 
 router = APIRouter(prefix="/facilities", tags=["facilities"])
 
 @router.get("/", response_model=List[FacilityRead])
-def list_facilities(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return get_facilities(db, skip, limit)
+def list_facilities(
+    page: Page = Depends(),
+    fields: Optional[str] = Query(None, description="Np. id,name"),
+    db: Session = Depends(get_db),
+):
+    cols = parse_fields(fields, FacilityRead)
+    rows = get_facilities(db, page.skip, page.fetch_limit, page.after(PAGE_KEY), fields=cols)
+    rows = page.finish(rows, PAGE_KEY)
+    return respond(page, rows, FacilityRead, cols)
 
 @router.post("/", response_model=FacilityRead, status_code=status.HTTP_201_CREATED)
 def add_facility(f: FacilityCreate, db: Session = Depends(get_db)):
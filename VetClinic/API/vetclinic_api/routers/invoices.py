@@ -1,10 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from typing import List, Optional
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from vetclinic_api.schemas.invoice import InvoiceCreate, InvoiceRead
-from vetclinic_api.crud.invoice_crud import create_invoice, get_invoice, list_invoices, update_invoice_status
-from vetclinic_api.core.database import get_db
+from vetclinic_api.crud.invoice_crud import (
+    PAGE_KEY, create_invoice, get_invoice, invoices_stmt, list_invoices_async, update_invoice_status
+)
+from vetclinic_api.core.database import get_db, get_async_db
+from vetclinic_api.core.encoding import JSON, MSGPACK, NDJSON, ndjson_response, negotiate, respond
+from vetclinic_api.core.fields import parse_fields, pick
+from vetclinic_api.core.pagination import Page
 
 router = APIRouter(prefix="/invoices", tags=["invoices"])
 
@@ -13,8 +19,25 @@ def api_create_invoice(inv: InvoiceCreate, db: Session = Depends(get_db)):
     return create_invoice(db, inv)
 
 @router.get("/", response_model=List[InvoiceRead])
-def api_list_invoices(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return list_invoices(db, skip, limit)
+async def api_list_invoices(
+    page: Page = Depends(),
+    client_id: Optional[int] = None,
+    status: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Np. id,amount,status"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    cols = parse_fields(fields, InvoiceRead)
+    if negotiate(page.request, (JSON, MSGPACK, NDJSON)) == NDJSON:
+        # eksport całej listy (od kursora/skip), bez limitu strony
+        stmt = invoices_stmt(page.skip, None, page.after(PAGE_KEY), client_id, status, cols)
+        def to_dict(r):
+            return pick(r, cols) if cols else InvoiceRead.model_validate(r, from_attributes=True).model_dump()
+        return ndjson_response(db, stmt, to_dict)
+    rows = await list_invoices_async(
+        db, page.skip, page.fetch_limit, page.after(PAGE_KEY), client_id=client_id, status=status, fields=cols
+    )
+    rows = page.finish(rows, PAGE_KEY)
+    return respond(page, rows, InvoiceRead, cols)
 
 @router.get("/{invoice_id}", response_model=InvoiceRead)
 def api_get_invoice(invoice_id: int, db: Session = Depends(get_db)):
@@ -1,15 +1,23 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from vetclinic_api.schemas.medical_records import (
     MedicalRecordCreate,
     MedicalRecordUpdate,
     MedicalRecord
 )
-from vetclinic_api.core.database import get_db
+from vetclinic_api.schemas.includes import MEDICAL_RECORD_RELATIONS, MedicalRecordExpanded
+from vetclinic_api.core.encoding import respond
+from vetclinic_api.core.fields import parse_fields
+from vetclinic_api.core.includes import embed, parse_include
+from vetclinic_api.core.database import get_db, get_async_db
+from vetclinic_api.core.pagination import Page
+from vetclinic_api.services import anchor_service
 from vetclinic_api.crud.medical_records import (
-    list_medical_records,
+    PAGE_KEY,
+    list_medical_records_async,
     list_medical_records_by_appointment,
     get_medical_record,
     create_medical_record,
@@ -22,14 +30,36 @@ router = APIRouter(
     tags=["medical_records"]
 )
 
-@router.get("/", response_model=List[MedicalRecord])
-def read_medical_records(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return list_medical_records(db, skip=skip, limit=limit)
+@router.get("/", response_model=List[MedicalRecordExpanded], response_model_exclude_unset=True)
+async def read_medical_records(
+    page: Page = Depends(),
+    include: Optional[str] = Query(None, description="Np. animal,appointment"),
+    fields: Optional[str] = Query(None, description="Np. id,description"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    names = parse_include(include, MEDICAL_RECORD_RELATIONS)
+    cols = parse_fields(fields, MedicalRecord)
+    rows = await list_medical_records_async(
+        db, skip=page.skip, limit=page.fetch_limit, after=page.after(PAGE_KEY), include=names, fields=cols
+    )
+    rows = page.finish(rows, PAGE_KEY)
+    if not names:
+        return respond(page, rows, MedicalRecord, fields=cols, lean=True)
+    data = [embed(r, MedicalRecord, MEDICAL_RECORD_RELATIONS, names, cols) for r in rows]
+    return respond(page, data, lean=True)
 
 @router.get("/appointment/{appointment_id}", response_model=List[MedicalRecord])
 def read_by_appointment(appointment_id: int, db: Session = Depends(get_db)):
     return list_medical_records_by_appointment(db, appointment_id)
 
+@router.get("/{record_id}/proof", summary="Dowód Merkle zakotwiczenia rekordu (weryfikacja offline)")
+def read_medical_record_proof(record_id: int, db: Session = Depends(get_db)):
+    proof = anchor_service.inclusion_proof(db, anchor_service.MEDICAL_RECORD, record_id)
+    if proof is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
+                            detail="Record not anchored in a Merkle batch")
+    return proof
+
 @router.get("/{record_id}", response_model=MedicalRecord)
 def read_medical_record(record_id: int, db: Session = Depends(get_db)):
     return get_medical_record(db, record_id)
@@ -0,0 +1,18 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+
+from vetclinic_api.core import hashing
+from vetclinic_api.core.database import get_db
+from vetclinic_api.services import anchor_service
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+
+@router.get("/hashing", summary="Stan puli haszowania haseł (bcrypt)")
+def hashing_metrics():
+    return hashing.hasher.metrics()
+
+
+@router.get("/anchoring", summary="Głębokość i opóźnienie kolejki kotwiczenia on-chain")
+def anchoring_metrics(db: Session = Depends(get_db)):
+    return anchor_service.queue_metrics(db)
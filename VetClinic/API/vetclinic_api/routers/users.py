@@ -1,32 +1,36 @@
+import base64
 import datetime
 import pyotp
 from datetime import timedelta
 from typing import List, Optional
-from qrcode import make as generate_qr_code
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Body
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Query, Body
+from fastapi.responses import JSONResponse, Response
 from sqlalchemy.orm import Session
 
 from vetclinic_api.crud.users_crud import (
+    PAGE_KEY,
     create_client, list_clients, get_client,
-    update_client, delete_client
+    update_client, delete_client, delete_clients
 )
+from vetclinic_api.schemas.bulk import BulkDeleteResult
 from vetclinic_api.schemas.users import (
     ClientCreate, ClientOut, UserUpdate,
-    UserLogin, ConfirmTOTP, PasswordReset
+    UserLogin, ConfirmTOTP, PasswordReset, CurrentUser
 )
+from vetclinic_api.core.auth import get_current_user
 from vetclinic_api.core.database import get_db
+from vetclinic_api.core.encoding import JSON, negotiate, respond
+from vetclinic_api.core.fields import parse_fields
+from vetclinic_api.core.pagination import Page
 from vetclinic_api.core.security import (
-    get_user_by_email, verify_password, create_access_token, get_password_hash
+    get_user_by_email, verify_password, create_access_token, get_password_hash,
+    get_totp_provisioning_uri, totp_qr_png
 )
+from vetclinic_api.core.throttle import login_throttle
 
 router = APIRouter(prefix="/users", tags=["users"])
 
-MAX_FAILS    = 5
-BLOCK_PERIOD = timedelta(minutes=15)
-
-
 @router.post("/register", response_model=ClientOut, status_code=status.HTTP_201_CREATED)
 def register_client(user: ClientCreate, db: Session = Depends(get_db)):
     if user.role != "klient":
@@ -36,9 +40,21 @@ def register_client(user: ClientCreate, db: Session = Depends(get_db)):
 
 
 @router.get("/", response_model=list[ClientOut])
-def read_users(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    users = list_clients(db)
-    return users[skip : skip + limit]
+def read_users(
+    page: Page = Depends(),
+    fields: Optional[str] = Query(None, description="Np. id,first_name,last_name"),
+    db: Session = Depends(get_db),
+):
+    cols = parse_fields(fields, ClientOut)
+    users = list_clients(db, skip=page.skip, limit=page.fetch_limit, after=page.after(PAGE_KEY), fields=cols)
+    users = page.finish(users, PAGE_KEY)
+    return respond(page, users, ClientOut, cols)
+
+
+@router.get("/me", response_model=CurrentUser)
+async def read_current_user(user: CurrentUser = Depends(get_current_user)):
+    """Zalogowany użytkownik (dowolna rola) na podstawie tokenu Bearer."""
+    return user
 
 
 @router.get("/{user_id}", response_model=ClientOut)
@@ -64,11 +80,11 @@ def delete_user_endpoint(user_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status.HTTP_404_NOT_FOUND, "Client not found")
 
 
-@router.delete("/", status_code=status.HTTP_204_NO_CONTENT)
+@router.delete("/", response_model=BulkDeleteResult)
 def delete_many_users(user_ids: List[int] = Body(...), db: Session = Depends(get_db)):
-    for user_id in user_ids:
-        delete_client(db, user_id)
-    return
+    # jedna transakcja dla całego zbioru zamiast commitu na każdego klienta
+    deleted = delete_clients(db, user_ids)
+    return BulkDeleteResult(deleted=deleted, not_found=sorted(set(user_ids) - set(deleted)))
 
 
 # ----- NOWY ENDPOINT: zmiana hasła (opcjonalnie z resetem TOTP) -----
@@ -98,9 +114,7 @@ def change_password(data: PasswordReset, db: Session = Depends(get_db)):
     if data.reset_totp:
         user.totp_secret = pyotp.random_base32()
         user.totp_confirmed = False
-        new_uri = pyotp.TOTP(user.totp_secret).provisioning_uri(
-            name=user.email, issuer_name="VetClinic"
-        )
+        new_uri = get_totp_provisioning_uri(user.email, user.totp_secret)
 
     db.commit()
 
@@ -115,13 +129,25 @@ def change_password(data: PasswordReset, db: Session = Depends(get_db)):
 @router.post("/login")
 def login(
     creds: UserLogin,
+    request: Request,
     force_provision: bool = Query(False, description="Force TOTP reprovision"),
     db: Session = Depends(get_db)
 ):
     now = datetime.datetime.utcnow()
+    ip = request.client.host if request.client else ""
+
+    # 0) Za dużo porażek z tej pary (email, IP) – odmowa przed bazą i bcrypt
+    wait = login_throttle.retry_after(creds.email, ip)
+    if wait:
+        raise HTTPException(
+            status.HTTP_429_TOO_MANY_REQUESTS,
+            f"Zbyt wiele nieudanych prób – spróbuj za {int(wait // 60) + 1} min.",
+            headers={"Retry-After": str(int(wait) + 1)},
+        )
+
     user = get_user_by_email(db, creds.email)
 
-    # 1) Blokada konta
+    # 1) Blokada konta (zapisana w bazie przez core.throttle)
     if user and user.locked_until and user.locked_until > now:
         mins = int((user.locked_until - now).total_seconds() // 60) + 1
         raise HTTPException(
@@ -129,15 +155,12 @@ def login(
             f"Konto zablokowane – spróbuj za {mins} min."
         )
 
-    # 2) Weryfikacja hasła (jednorazowego lub stałego)
+    # 2) Weryfikacja hasła (jednorazowego lub stałego); porażki liczymy
+    # w pamięci, bez zapisu do bazy przy każdej próbie
     if not user or not verify_password(creds.password, user.password_hash):
-        if user:
-            user.failed_login_attempts += 1
-            if user.failed_login_attempts >= MAX_FAILS:
-                user.locked_until = now + BLOCK_PERIOD
-                user.failed_login_attempts = 0
-            db.commit()
+        login_throttle.record_failure(creds.email, ip)
         raise HTTPException(status.HTTP_400_BAD_REQUEST, "Nieprawidłowy email lub hasło")
+    login_throttle.record_success(creds.email, ip)
 
     # 3) Pierwsze logowanie? (jednorazowa flaga)
     if getattr(user, "is_temporary", False):
@@ -161,9 +184,7 @@ def login(
     # 6) Jeżeli TOTP niepotwierdzone lub kod niepodany → zwracamy URI + user_id
     if not creds.totp_code or not user.totp_confirmed:
         if not user.totp_confirmed:
-            uri = pyotp.TOTP(user.totp_secret).provisioning_uri(
-                name=user.email, issuer_name="VetClinic"
-            )
+            uri = get_totp_provisioning_uri(user.email, user.totp_secret)
             return JSONResponse(
                 status_code=status.HTTP_201_CREATED,
                 content={
@@ -193,8 +214,16 @@ def login(
 
 # ----- Istniejące endpointy TOTP (opcjonalne) -----
 
+PNG = "image/png"
+
+
 @router.post("/setup-totp")
-def setup_totp(email: str, db: Session = Depends(get_db)):
+def setup_totp(email: str, request: Request, db: Session = Depends(get_db)):
+    """
+    Nowy secret TOTP. Kod QR powstaje w pamięci: przy Accept: image/png
+    wysyłamy sam obraz (URI w nagłówku X-TOTP-URI), domyślnie JSON
+    z obrazem jako data URI (base64).
+    """
     user = get_user_by_email(db, email)
     if not user:
         raise HTTPException(404, "User not found")
@@ -202,12 +231,12 @@ def setup_totp(email: str, db: Session = Depends(get_db)):
     user.totp_confirmed = False
     db.commit()
 
-    uri = pyotp.TOTP(user.totp_secret).provisioning_uri(
-        name=user.email, issuer_name="VetClinic"
-    )
-    qr_fn = f"{email}_qrcode.png"
-    generate_qr_code(uri).save(qr_fn)
-    return {"totp_uri": uri, "qr_code": qr_fn}
+    uri = get_totp_provisioning_uri(user.email, user.totp_secret)
+    png = totp_qr_png(uri)
+    if negotiate(request, (JSON, PNG)) == PNG:
+        return Response(png, media_type=PNG,
+                        headers={"X-TOTP-URI": uri, "Cache-Control": "no-store", "Vary": "Accept"})
+    return {"totp_uri": uri, "qr_code": "data:image/png;base64," + base64.b64encode(png).decode()}
 
 
 @router.post("/confirm-totp")
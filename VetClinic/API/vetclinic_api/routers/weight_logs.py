@@ -1,11 +1,18 @@
 # vetclinic_api/routers/weight_logs.py
 
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 
 from vetclinic_api.core.database import get_db
+from vetclinic_api.core.encoding import respond
+from vetclinic_api.core.fields import parse_fields
+from vetclinic_api.core.pagination import Page
 from vetclinic_api.schemas.weight_logs import WeightLogCreate, WeightLogOut
 from vetclinic_api.crud.weight_log_crud import (
+    PAGE_KEY,
     list_weight_logs,
     get_weight_log,
     create_weight_log,
@@ -15,8 +22,21 @@ from vetclinic_api.crud.weight_log_crud import (
 router = APIRouter(prefix="/weight-logs", tags=["weight-logs"])
 
 @router.get("/", response_model=list[WeightLogOut])
-def read_logs(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return list_weight_logs(db, skip, limit)
+def read_logs(
+    page: Page = Depends(),
+    animal_id: Optional[int] = None,
+    date_from: Optional[datetime] = Query(None, alias="from", description="Od (włącznie)"),
+    date_to: Optional[datetime] = Query(None, alias="to", description="Do (wyłącznie)"),
+    fields: Optional[str] = Query(None, description="Np. recorded_at,weight"),
+    db: Session = Depends(get_db),
+):
+    cols = parse_fields(fields, WeightLogOut)
+    rows = list_weight_logs(
+        db, page.skip, page.fetch_limit, page.after(PAGE_KEY),
+        animal_id=animal_id, date_from=date_from, date_to=date_to, fields=cols,
+    )
+    rows = page.finish(rows, PAGE_KEY)
+    return respond(page, rows, WeightLogOut, cols)
 
 @router.post("/", response_model=WeightLogOut)
 def add_log(schema: WeightLogCreate, db: Session = Depends(get_db)):
@@ -0,0 +1,10 @@
+from pydantic import BaseModel
+from typing import List
+
+
+class BulkDeleteResult(BaseModel):
+    """Wynik usuwania wielu rekordów – każde ID z żądania trafia do jednej listy."""
+    deleted: List[int] = []
+    not_found: List[int] = []
+    # rekordy, których nie można usunąć (np. lekarz z wizytami)
+    conflict: List[int] = []
@@ -0,0 +1,57 @@
+"""
+Schematy odpowiedzi z osadzonymi relacjami (?include=...).
+
+Trzymamy je osobno, bo wizyta osadza dokumentację medyczną, a dokumentacja
+wizytę – import w schemas/appointment.py i schemas/medical_records.py
+tworzyłby cykl. Pola relacji są opcjonalne i pojawiają się w odpowiedzi
+tylko wtedy, gdy klient o nie poprosił (response_model_exclude_unset).
+"""
+
+from typing import List, Optional
+
+from vetclinic_api.schemas.animal import Animal
+from vetclinic_api.schemas.appointment import Appointment
+from vetclinic_api.schemas.facility import FacilityRead
+from vetclinic_api.schemas.medical_records import MedicalRecord
+from vetclinic_api.schemas.users import ClientOut, DoctorOut
+from vetclinic_api.schemas.weight_logs import WeightLogOut
+
+
+class AppointmentExpanded(Appointment):
+    doctor: Optional[DoctorOut] = None
+    owner: Optional[ClientOut] = None
+    animal: Optional[Animal] = None
+    facility: Optional[FacilityRead] = None
+    medical_records: Optional[List[MedicalRecord]] = None
+
+
+class AnimalExpanded(Animal):
+    owner: Optional[ClientOut] = None
+    medical_records: Optional[List[MedicalRecord]] = None
+    weight_logs: Optional[List[WeightLogOut]] = None
+
+
+class MedicalRecordExpanded(MedicalRecord):
+    animal: Optional[Animal] = None
+    appointment: Optional[Appointment] = None
+
+
+# nazwa relacji -> schemat osadzanej encji
+APPOINTMENT_RELATIONS = {
+    "doctor": DoctorOut,
+    "owner": ClientOut,
+    "animal": Animal,
+    "facility": FacilityRead,
+    "medical_records": MedicalRecord,
+}
+
+ANIMAL_RELATIONS = {
+    "owner": ClientOut,
+    "medical_records": MedicalRecord,
+    "weight_logs": WeightLogOut,
+}
+
+MEDICAL_RECORD_RELATIONS = {
+    "animal": Animal,
+    "appointment": Appointment,
+}
@@ -18,7 +18,10 @@ class MedicalRecord(MedicalRecordBase):
     created_at: datetime
     appointment_id: int
     animal_id: int
-    data_hash: str
-    blockchain_tx: str
+    # kotwiczenie w blockchainie jest opcjonalne – rekord może go jeszcze nie mieć
+    data_hash: str | None = None
+    blockchain_tx: str | None = None
+    # pending (w kolejce), anchored albo failed
+    anchor_status: str | None = None
 
     model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
@@ -168,6 +168,18 @@ class ConsultantOut(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+# Zalogowany użytkownik (dowolna rola) – wynik zależności get_current_user
+class CurrentUser(BaseModel):
+    id: int
+    role: str
+    email: str
+    first_name: str
+    last_name: str
+    facility_id: Optional[int] = None
+
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+
+
 # Schemat do logowania użytkownika
 class UserLogin(BaseModel):
     email: EmailStr
@@ -0,0 +1,390 @@
+"""
+Kotwiczenie wizyt i dokumentacji medycznej on-chain przez kolejkę.
+
+create_appointment / create_medical_record / update_medical_record /
+delete_medical_record (oraz masowe usuwanie klientów, zwierząt i wizyt –
+enqueue_record_deletes) nie czekają już na blok: enqueue dodaje wiersz
+anchor_queue (record_id, data_hash) w tej samej transakcji co zmiana
+w bazie i żądanie od razu się kończy. Transakcje wysyła w tle AnchorWorker
+(lifespan API albo python -m vetclinic_api.services.anchor_service):
+- partie po ANCHOR_BATCH_SIZE: najpierw wysyłka wszystkich transakcji,
+  potem oczekiwanie na receipty (jeden czas bloku na partię, nie na zapis),
+- partia rezerwowana na ANCHOR_LEASE_SECONDS (wspólna pętla z nadawcą e-maili:
+  services.leased_queue.LeasedQueueWorker); hash wysłanej transakcji
+  zapisujemy przed czekaniem na receipt, więc po restarcie workera
+  sprawdzamy receipt zamiast wysyłać transakcję drugi raz,
+- operacje na tym samym rekordzie wykonujemy w kolejności (add -> update
+  -> delete); zadanie czeka, dopóki wcześniejsze dla rekordu jest w toku,
+- nieudane zadanie wraca z opóźnieniem ANCHOR_RETRY_BASE * 2^(próba-1)
+  (do ANCHOR_RETRY_MAX); po ANCHOR_MAX_ATTEMPTS próbach ma status "failed",
+- po potwierdzeniu uzupełniamy Appointment.tx_hash albo
+  MedicalRecord.blockchain_tx / anchor_status.
+Stan kolejki (głębokość, opóźnienie) zwraca queue_metrics – GET /metrics/anchoring.
+
+Tryb ANCHOR_MODE=merkle (MerkleAnchorWorker): zamiast transakcji na zadanie
+zbieramy oczekujące zadania w partię (ANCHOR_MERKLE_MAX_LEAVES albo po
+ANCHOR_MERKLE_WINDOW sekundach), budujemy drzewo Merkle (core.merkle)
+i zapisujemy on-chain tylko korzeń – MerkleAnchor.anchorRoot. Dowód
+przynależności każdego zadania trafia do bazy przed wysłaniem korzenia,
+więc rekord można zweryfikować offline (inclusion_proof).
+"""
+
+import asyncio
+import datetime
+import json
+import logging
+from typing import Optional
+
+from sqlalchemy import exists, func, select, update
+from sqlalchemy.orm import Session, aliased
+from web3 import Web3
+
+from vetclinic_api.core import merkle
+from vetclinic_api.core.config import (
+    ANCHOR_BATCH_SIZE, ANCHOR_LEASE_SECONDS, ANCHOR_MAX_ATTEMPTS, ANCHOR_MERKLE_MAX_LEAVES,
+    ANCHOR_MERKLE_WINDOW, ANCHOR_MODE, ANCHOR_POLL_INTERVAL, ANCHOR_RECEIPT_TIMEOUT,
+    ANCHOR_RETRY_BASE, ANCHOR_RETRY_MAX,
+)
+from vetclinic_api.core.database import SessionLocal
+from vetclinic_api.crud import blockchain_crud
+from vetclinic_api.models.anchor_batch import AnchorBatch
+from vetclinic_api.models.anchor_queue import AnchorJob
+from vetclinic_api.models.appointments import Appointment
+from vetclinic_api.models.medical_records import MedicalRecord
+from vetclinic_api.services.leased_queue import LeasedQueueWorker
+
+logger = logging.getLogger(__name__)
+
+APPOINTMENT = "appointment"
+MEDICAL_RECORD = "medical_record"
+
+
+def enqueue(db: Session, kind: str, op: str, record_id: int, data_hash: Optional[str] = None) -> AnchorJob:
+    """Dodaje zadanie do kolejki; zapisze je commit wywołującego."""
+    job = AnchorJob(kind=kind, op=op, record_id=record_id, data_hash=data_hash,
+                    status="pending", attempts=0, next_attempt_at=datetime.datetime.utcnow())
+    db.add(job)
+    return job
+
+
+def enqueue_record_deletes(db: Session, condition) -> list[int]:
+    """
+    Zadania "delete" dla dokumentacji spełniającej condition (warunek na
+    MedicalRecord), usuwanej masowo albo kaskadą – wywołać przed DELETE,
+    w tej samej transakcji. Zwraca ID rekordów.
+    """
+    record_ids = db.scalars(select(MedicalRecord.id).where(condition).order_by(MedicalRecord.id)).all()
+    for record_id in record_ids:
+        enqueue(db, MEDICAL_RECORD, "delete", record_id)
+    return list(record_ids)
+
+
+def queue_metrics(db: Session, now: Optional[datetime.datetime] = None) -> dict:
+    """Głębokość kolejki i opóźnienie (wiek najstarszego oczekującego zadania)."""
+    now = now or datetime.datetime.utcnow()
+    rows = db.execute(
+        select(AnchorJob.status, func.count(), func.min(AnchorJob.created_at))
+        .where(AnchorJob.status.in_(("pending", "failed")))
+        .group_by(AnchorJob.status)
+    ).all()
+    stats = {status: (count, oldest) for status, count, oldest in rows}
+    pending, oldest = stats.get("pending", (0, None))
+    return {
+        "pending": pending,
+        "failed": stats.get("failed", (0, None))[0],
+        "lag_seconds": round((now - oldest).total_seconds(), 1) if oldest else 0.0,
+        # tryb merkle: partie czekające na zapis korzenia
+        "batches_pending": db.scalar(
+            select(func.count()).select_from(AnchorBatch).where(AnchorBatch.status == "pending")
+        ),
+    }
+
+
+def inclusion_proof(db: Session, kind: str, record_id: int) -> Optional[dict]:
+    """
+    Dane do weryfikacji offline ostatniego zakotwiczonego w partii Merkle stanu
+    rekordu: liść, dowód, korzeń i transakcja anchorRoot. None, jeśli brak.
+    """
+    row = db.execute(
+        select(AnchorJob, AnchorBatch)
+        .join(AnchorBatch, AnchorBatch.id == AnchorJob.batch_id)
+        .where(AnchorJob.kind == kind, AnchorJob.record_id == record_id, AnchorJob.status == "anchored")
+        .order_by(AnchorJob.id.desc())
+        .limit(1)
+    ).first()
+    if row is None:
+        return None
+    job, batch = row
+    leaf = merkle.leaf_hash(job.kind, job.op, job.record_id, job.data_hash)
+    path = json.loads(job.merkle_proof)
+    return {
+        "kind": job.kind,
+        "op": job.op,
+        "record_id": job.record_id,
+        "data_hash": job.data_hash,
+        "leaf": Web3.to_hex(leaf),
+        "leaf_index": job.leaf_index,
+        "proof": path,
+        "root": batch.root,
+        "tx_hash": batch.tx_hash,
+        "verified": merkle.verify(leaf, [Web3.to_bytes(hexstr=p) for p in path],
+                                  Web3.to_bytes(hexstr=batch.root)),
+    }
+
+
+class AnchorWorker(LeasedQueueWorker):
+    """Wysyła zadania z anchor_queue partiami, z ponowieniami."""
+
+    error_message = "Błąd workera kotwiczenia on-chain"
+    poll_interval = ANCHOR_POLL_INTERVAL
+
+    def __init__(self, session_factory=SessionLocal, batch_size: int = ANCHOR_BATCH_SIZE,
+                 max_attempts: int = ANCHOR_MAX_ATTEMPTS, retry_base: float = ANCHOR_RETRY_BASE,
+                 retry_max: float = ANCHOR_RETRY_MAX, lease: float = ANCHOR_LEASE_SECONDS,
+                 receipt_timeout: float = ANCHOR_RECEIPT_TIMEOUT):
+        super().__init__(session_factory, batch_size, max_attempts, retry_base, retry_max, lease)
+        self.receipt_timeout = receipt_timeout
+
+    def _claim(self, db: Session, now: datetime.datetime) -> list[AnchorJob]:
+        due = ((AnchorJob.status == "pending") & (AnchorJob.next_attempt_at <= now)
+               & AnchorJob.batch_id.is_(None))
+        # wcześniejsze zadanie tego rekordu czeka na ponowienie albo jest w toku u innego workera
+        prior = aliased(AnchorJob)
+        blocked = exists().where(
+            prior.kind == AnchorJob.kind,
+            prior.record_id == AnchorJob.record_id,
+            prior.id < AnchorJob.id,
+            prior.status == "pending",
+            prior.next_attempt_at > now,
+        )
+        ids = db.scalars(
+            select(AnchorJob.id).where(due, ~blocked).order_by(AnchorJob.id).limit(self.batch_size)
+        ).all()
+        return self._lease(db, AnchorJob, ids, due, now)
+
+    def _backfill(self, db: Session, job: AnchorJob, status: str) -> None:
+        if job.kind == APPOINTMENT and job.op == "add" and status == "anchored":
+            db.execute(
+                update(Appointment).where(Appointment.id == job.record_id).values(tx_hash=job.tx_hash)
+                .execution_options(synchronize_session=False)
+            )
+        elif job.kind == MEDICAL_RECORD and job.op in ("add", "update"):
+            # tylko jeśli rekord nie zmienił się od czasu dodania zadania
+            values = {"anchor_status": status}
+            if status == "anchored":
+                values["blockchain_tx"] = job.tx_hash
+            db.execute(
+                update(MedicalRecord)
+                .where(MedicalRecord.id == job.record_id, MedicalRecord.data_hash == job.data_hash)
+                .values(**values)
+                .execution_options(synchronize_session=False)
+            )
+
+    def _fail(self, db: Session, job: AnchorJob, error: str, now: datetime.datetime) -> None:
+        if self._retry_or_fail(job, error, now):
+            self._backfill(db, job, "failed")
+            logger.error("Zadanie kotwiczenia %s (%s %s #%s) nieudane: %s",
+                         job.id, job.op, job.kind, job.record_id, error)
+
+    def _finish(self, db: Session, job: AnchorJob, receipt, now: datetime.datetime) -> None:
+        if receipt["status"] != 1:
+            # transakcja odrzucona przez kontrakt – przy ponowieniu wysyłamy nową
+            job.tx_hash = None
+            self._fail(db, job, "Transakcja odrzucona przez kontrakt (revert)", now)
+            return
+        job.status = "anchored"
+        job.attempts += 1
+        job.locked_by = None
+        job.last_error = None
+        job.anchored_at = datetime.datetime.utcnow()
+        self._backfill(db, job, "anchored")
+
+    def _settle(self, db: Session, outcomes: list, now: datetime.datetime, finish, fail) -> None:
+        """
+        Zapisuje wyniki (obiekt, receipt, błąd) zebrane bez dostępu do bazy
+        w jednej krótkiej transakcji – nie trzymamy blokady zapisu (SQLite:
+        SerializedWriter) podczas czekania na węzeł.
+        """
+        for item, receipt, error in outcomes:
+            if error is None:
+                finish(db, item, receipt, now)
+            else:
+                fail(db, item, error, now)
+        db.commit()
+
+    def process_batch(self) -> int:
+        """
+        Jedna partia: rezerwacja, wysyłka transakcji (commit ich hashy),
+        oczekiwanie na receipty, commit wyników. Wywołania węzła odbywają się
+        między transakcjami, zapisy – po zebraniu wyników. Zwraca liczbę
+        pobranych zadań.
+        """
+        with self.session_factory() as db:
+            now = datetime.datetime.utcnow()
+            batch = self._claim(db, now)
+            failed_keys = set()
+            submitted = []
+            outcomes = []
+            for job in batch:
+                key = (job.kind, job.record_id)
+                if key in failed_keys:
+                    # wcześniejsza operacja na rekordzie nie przeszła – ta poczeka na nią
+                    job.locked_by = None
+                    job.next_attempt_at = now
+                    continue
+                if job.tx_hash:
+                    # wysłana przed awarią/restartem – sprawdzamy, czy weszła do bloku
+                    receipt = blockchain_crud.find_receipt(job.tx_hash)
+                    if receipt is not None:
+                        outcomes.append((job, receipt, None))
+                        if receipt["status"] != 1:
+                            failed_keys.add(key)
+                        continue
+                try:
+                    job.tx_hash = blockchain_crud.send_record_tx(job.op, job.record_id, job.data_hash)
+                    submitted.append(job)
+                except Exception as exc:
+                    outcomes.append((job, None, f"{type(exc).__name__}: {exc}"))
+                    failed_keys.add(key)
+            if batch:
+                self._settle(db, outcomes, now, self._finish, self._fail)
+
+            outcomes = []
+            for job in submitted:
+                try:
+                    receipt = blockchain_crud.wait_for_receipt(job.tx_hash, self.receipt_timeout)
+                except Exception as exc:
+                    # tx_hash zostaje – przy ponowieniu najpierw sprawdzimy receipt
+                    outcomes.append((job, None, f"{type(exc).__name__}: {exc}"))
+                else:
+                    outcomes.append((job, receipt, None))
+            if submitted:
+                self._settle(db, outcomes, now, self._finish, self._fail)
+            return len(batch)
+
+
+class MerkleAnchorWorker(AnchorWorker):
+    """Tryb "merkle": partia zadań -> drzewo Merkle -> jedna transakcja anchorRoot."""
+
+    def __init__(self, session_factory=SessionLocal, max_leaves: int = ANCHOR_MERKLE_MAX_LEAVES,
+                 window: float = ANCHOR_MERKLE_WINDOW, **kwargs):
+        # drain() przetwarza kolejne partie, dopóki są pełne
+        super().__init__(session_factory, batch_size=max_leaves, **kwargs)
+        self.max_leaves = max_leaves
+        self.window = window
+
+    def _build_batch(self, db: Session, now: datetime.datetime) -> Optional[AnchorBatch]:
+        """Zamyka okno: tworzy partię z wolnych zadań i zapisuje dowody (commit)."""
+        free = (AnchorJob.status == "pending") & AnchorJob.batch_id.is_(None)
+        rows = db.execute(
+            select(AnchorJob.id, AnchorJob.created_at).where(free).order_by(AnchorJob.id).limit(self.max_leaves)
+        ).all()
+        if not rows:
+            return None
+        oldest = min(created_at for _, created_at in rows)
+        if len(rows) < self.max_leaves and now - oldest < datetime.timedelta(seconds=self.window):
+            return None  # okno jeszcze otwarte
+
+        batch = AnchorBatch(status="pending", attempts=0, leaf_count=0, next_attempt_at=now)
+        db.add(batch)
+        db.flush()
+        # warunek "free" powtórzony: inny worker mógł już wziąć część zadań do swojej partii
+        db.execute(
+            update(AnchorJob)
+            .where(AnchorJob.id.in_([job_id for job_id, _ in rows]), free)
+            .values(batch_id=batch.id)
+            .execution_options(synchronize_session=False)
+        )
+        jobs = db.scalars(select(AnchorJob).where(AnchorJob.batch_id == batch.id).order_by(AnchorJob.id)).all()
+        if not jobs:
+            db.rollback()
+            return None
+
+        levels = merkle.build_levels([merkle.leaf_hash(j.kind, j.op, j.record_id, j.data_hash) for j in jobs])
+        for index, job in enumerate(jobs):
+            job.leaf_index = index
+            job.merkle_proof = json.dumps([Web3.to_hex(node) for node in merkle.proof(levels, index)])
+        batch.root = Web3.to_hex(merkle.root(levels))
+        batch.leaf_count = len(jobs)
+        db.commit()
+        return batch
+
+    def _settle_jobs(self, db: Session, batch: AnchorBatch, status: str) -> None:
+        jobs = db.scalars(select(AnchorJob).where(AnchorJob.batch_id == batch.id)).all()
+        for job in jobs:
+            job.status = status
+            job.attempts = batch.attempts
+            job.last_error = batch.last_error
+            if status == "anchored":
+                job.tx_hash = batch.tx_hash
+                job.anchored_at = batch.anchored_at
+            self._backfill(db, job, status)
+
+    def _fail_batch(self, db: Session, batch: AnchorBatch, error: str, now: datetime.datetime) -> None:
+        if self._retry_or_fail(batch, error, now):
+            self._settle_jobs(db, batch, "failed")
+            logger.error("Partia Merkle %s (%s liści) nieudana: %s", batch.id, batch.leaf_count, error)
+
+    def _finish_batch(self, db: Session, batch: AnchorBatch, receipt, now: datetime.datetime) -> None:
+        if receipt["status"] != 1:
+            batch.tx_hash = None
+            self._fail_batch(db, batch, "Transakcja odrzucona przez kontrakt (revert)", now)
+            return
+        batch.status = "anchored"
+        batch.attempts += 1
+        batch.locked_by = None
+        batch.last_error = None
+        batch.anchored_at = datetime.datetime.utcnow()
+        self._settle_jobs(db, batch, "anchored")
+
+    def process_batch(self) -> int:
+        """
+        Zamyka okno (nowa partia z dowodami), wysyła korzenie partii do zapisu,
+        czeka na receipty; wyniki zapisujemy po ich zebraniu (jak AnchorWorker).
+        Zwraca liczbę liści w przetworzonych partiach.
+        """
+        with self.session_factory() as db:
+            now = datetime.datetime.utcnow()
+            self._build_batch(db, now)
+            due = (AnchorBatch.status == "pending") & (AnchorBatch.next_attempt_at <= now)
+            ids = db.scalars(select(AnchorBatch.id).where(due).order_by(AnchorBatch.id)).all()
+            batches = self._lease(db, AnchorBatch, ids, due, now)
+            submitted = []
+            outcomes = []
+            for batch in batches:
+                if batch.tx_hash:
+                    # wysłana przed awarią/restartem – sprawdzamy, czy weszła do bloku
+                    receipt = blockchain_crud.find_receipt(batch.tx_hash)
+                    if receipt is not None:
+                        outcomes.append((batch, receipt, None))
+                        continue
+                try:
+                    batch.tx_hash = blockchain_crud.send_root_tx(Web3.to_bytes(hexstr=batch.root), batch.leaf_count)
+                    submitted.append(batch)
+                except Exception as exc:
+                    outcomes.append((batch, None, f"{type(exc).__name__}: {exc}"))
+            if batches:
+                self._settle(db, outcomes, now, self._finish_batch, self._fail_batch)
+
+            outcomes = []
+            for batch in submitted:
+                try:
+                    receipt = blockchain_crud.wait_for_receipt(batch.tx_hash, self.receipt_timeout)
+                except Exception as exc:
+                    outcomes.append((batch, None, f"{type(exc).__name__}: {exc}"))
+                else:
+                    outcomes.append((batch, receipt, None))
+            if submitted:
+                self._settle(db, outcomes, now, self._finish_batch, self._fail_batch)
+            return sum(batch.leaf_count for batch in batches)
+
+
+def anchor_worker(**kwargs) -> AnchorWorker:
+    """Worker dla bieżącego ANCHOR_MODE ("tx" albo "merkle")."""
+    return MerkleAnchorWorker(**kwargs) if ANCHOR_MODE == "merkle" else AnchorWorker(**kwargs)
+
+
+if __name__ == "__main__":
+    # Samodzielny worker, np. gdy zapisy wykonuje tylko GUI (bez procesu API)
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(anchor_worker().run())
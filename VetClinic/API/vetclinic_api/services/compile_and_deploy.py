@@ -3,9 +3,11 @@ import os
 import json
 from pathlib import Path
 from dotenv import load_dotenv
-from solcx import install_solc, compile_standard
 from web3 import Web3
 
+from vetclinic_api.core.contract_registry import registry_key, save_cached_address
+from vetclinic_api.core.contracts import CONTRACTS_DIR, artifact_path, compile_contract
+
 # 1) Load environment variables
 load_dotenv()
 # pobieramy BLOCKCHAIN_URL, a gdy nie jest ustawione — domyślnie Ganache na localhost
@@ -31,39 +33,17 @@ if not accounts:
 deployer = accounts[0]
 print(f"Using deployer account: {deployer}")
 
-# 3) Ensure Solidity compiler is available
-SOLC_VERSION = "0.8.0"
-install_solc(SOLC_VERSION)
-
-# 4) Compile all contracts in 'contracts' directory
-contracts_dir = Path(__file__).parent.parent / "contracts"
-sources = {}
-for sol_file in contracts_dir.glob("*.sol"):
-    sources[str(sol_file)] = {"content": sol_file.read_text()}
-compiled = compile_standard(
-    {
-        "language": "Solidity",
-        "sources": sources,
-        "settings": {"outputSelection": {"*": {"*": ["abi","evm.bytecode.object"]}}}
-    },
-    solc_version=SOLC_VERSION
-)
-# 5) Write build artifacts
-build_dir = Path(__file__).parent.parent / "build"
-build_dir.mkdir(exist_ok=True)
-for file_path, contracts in compiled["contracts"].items():
-    for contract_name, data in contracts.items():
-        artifact = {
-            "abi": data["abi"],
-            "bytecode": data["evm"]["bytecode"]["object"]
-        }
-        out_file = build_dir / f"{contract_name}.json"
-        out_file.write_text(json.dumps(artifact, indent=2))
-        print(f"Compiled {contract_name} → {out_file}")
+# 3-5) Compile all contracts in 'contracts' directory and write versioned
+# build artifacts (<Contract>-<source hash>.json, see core.contracts)
+artifacts = {}
+for sol_file in sorted(CONTRACTS_DIR.glob("*.sol")):
+    artifact = compile_contract(sol_file.stem)
+    artifacts[artifact.name] = artifact
+    print(f"Compiled {artifact.name} → {artifact_path(artifact.name, artifact.source_hash)}")
 
 # 6) Deploy MedicalRecord contract using transact
-medical_artifact = json.loads((build_dir / "MedicalRecord.json").read_text())
-Medical = w3.eth.contract(abi=medical_artifact["abi"], bytecode=medical_artifact["bytecode"])
+medical_artifact = artifacts["MedicalRecord"]
+Medical = w3.eth.contract(abi=medical_artifact.abi, bytecode=medical_artifact.bytecode)
 print("Deploying MedicalRecord...")
 medical_tx = Medical.constructor().transact({'from': deployer})
 receipt = w3.eth.wait_for_transaction_receipt(medical_tx)
@@ -72,20 +52,41 @@ print(f"MedicalRecord deployed at: {med_address}")
 # Save frontend artifact for MedicalRecord
 frontend_abi_dir = Path(__file__).parent.parent / "vetclinic_gui" / "abi"
 frontend_abi_dir.mkdir(parents=True, exist_ok=True)
-frontend_artifact = {"address": med_address, "abi": medical_artifact["abi"]}
+frontend_artifact = {"address": med_address, "abi": medical_artifact.abi}
 (frontend_abi_dir / "MedicalRecord.json").write_text(json.dumps(frontend_artifact, indent=2))
 print("Frontend MedicalRecord artifact updated.")
+deployed = {"MedicalRecord": med_address}
+
+# 6b) Deploy MerkleAnchor (batch anchoring, ANCHOR_MODE=merkle) if present
+if "MerkleAnchor" in artifacts:
+    merkle_artifact = artifacts["MerkleAnchor"]
+    Merkle = w3.eth.contract(abi=merkle_artifact.abi, bytecode=merkle_artifact.bytecode)
+    print("Deploying MerkleAnchor...")
+    merkle_tx = Merkle.constructor().transact({'from': deployer})
+    deployed["MerkleAnchor"] = w3.eth.wait_for_transaction_receipt(merkle_tx).contractAddress
+    print(f"MerkleAnchor deployed at: {deployed['MerkleAnchor']}")
 
 # 7) Optionally deploy AddressRegistry if present
-if (build_dir / "AddressRegistry.json").exists():
-    addr_artifact = json.loads((build_dir / "AddressRegistry.json").read_text())
-    Registry = w3.eth.contract(abi=addr_artifact["abi"], bytecode=addr_artifact["bytecode"])
+if "AddressRegistry" in artifacts:
+    addr_artifact = artifacts["AddressRegistry"]
+    Registry = w3.eth.contract(abi=addr_artifact.abi, bytecode=addr_artifact.bytecode)
     print("Deploying AddressRegistry...")
     reg_tx = Registry.constructor().transact({'from': deployer})
     reg_receipt = w3.eth.wait_for_transaction_receipt(reg_tx)
     reg_address = reg_receipt.contractAddress
     print(f"AddressRegistry deployed at: {reg_address}")
     # Save frontend artifact for AddressRegistry
-    frontend_artifact = {"address": reg_address, "abi": addr_artifact["abi"]}
+    frontend_artifact = {"address": reg_address, "abi": addr_artifact.abi}
     (frontend_abi_dir / "AddressRegistry.json").write_text(json.dumps(frontend_artifact, indent=2))
     print("Frontend AddressRegistry artifact updated.")
+    # Register deployed contracts so API/GUI processes can resolve them
+    # (ADDRESS_REGISTRY_ADDRESS=<reg_address>, see core.contract_registry)
+    registry = w3.eth.contract(address=reg_address, abi=addr_artifact.abi)
+    for name, address in deployed.items():
+        set_tx = registry.functions.setAddress(registry_key(name), address).transact({'from': deployer})
+        w3.eth.wait_for_transaction_receipt(set_tx)
+        print(f"{name} registered in AddressRegistry.")
+
+# 8) Cache the addresses locally for this chain
+for name, address in deployed.items():
+    save_cached_address(w3.eth.chain_id, name, address)
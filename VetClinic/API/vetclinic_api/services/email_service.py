@@ -1,19 +1,204 @@
+"""
+Wysyłka e-maili przez outbox.
+
+Rejestracja (create_client/create_doctor/create_consultant) nie rozmawia
+już z serwerem SMTP: EmailService.queue_temporary_password dodaje wiersz
+email_outbox w tej samej transakcji co nowe konto i żądanie od razu się
+kończy. Wiadomości wysyła w tle OutboxSender (lifespan API albo
+python -m vetclinic_api.services.email_service):
+- jedno długo żyjące połączenie SMTP (SMTPConnection) na wiele wiadomości,
+- partie po EMAIL_BATCH_SIZE, rezerwowane na EMAIL_LEASE_SECONDS, z ponowieniami
+  (EMAIL_RETRY_BASE, EMAIL_RETRY_MAX, EMAIL_MAX_ATTEMPTS) – wspólna pętla
+  services.leased_queue.LeasedQueueWorker,
+- treść wiadomości (tymczasowe hasło) usuwamy z wiersza, gdy ma już status
+  "sent" albo "failed" – w bazie i kopiach zapasowych nie zostają hasła.
+"""
+
+import asyncio
+import datetime
+import logging
 import smtplib
+import time
 from email.mime.text import MIMEText
-from vetclinic_api.core.config import SMTP_HOST, SMTP_PORT, SMTP_USER, SMTP_PASS, SMTP_FROM
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from vetclinic_api.core.config import (
+    EMAIL_BATCH_SIZE, EMAIL_LEASE_SECONDS, EMAIL_MAX_ATTEMPTS, EMAIL_OUTBOX_POLL_INTERVAL,
+    EMAIL_RETRY_BASE, EMAIL_RETRY_MAX, SMTP_FROM, SMTP_HOST, SMTP_IDLE_TIMEOUT, SMTP_PASS,
+    SMTP_PORT, SMTP_SECURITY, SMTP_TIMEOUT, SMTP_USER,
+)
+from vetclinic_api.core.database import SessionLocal
+from vetclinic_api.models.email_outbox import EmailOutbox
+from vetclinic_api.services.leased_queue import LeasedQueueWorker
+
+logger = logging.getLogger(__name__)
+
+TEMPORARY_PASSWORD_SUBJECT = "VetClinic – dane dostępu"
+# Treść wiadomości po wysłaniu albo ostatecznej porażce (kolumna body jest NOT NULL)
+REDACTED_BODY = "[treść usunięta]"
+
+
+def _temporary_password_body(raw_password: str) -> str:
+    return f"Twoje tymczasowe hasło:\n\n{raw_password}"
+
+
+def build_message(to_address: str, subject: str, body: str) -> MIMEText:
+    msg = MIMEText(body)
+    msg["Subject"] = subject
+    msg["From"]    = SMTP_FROM
+    msg["To"]      = to_address
+    return msg
+
+
+class SMTPConnection:
+    """
+    Jedno połączenie SMTP używane dla wielu wiadomości. Łączy się przy
+    pierwszej wysyłce, po SMTP_IDLE_TIMEOUT bezczynności sprawdza je NOOP,
+    a zerwane nawiązuje ponownie (raz na wiadomość).
+    """
+
+    def __init__(self, host: Optional[str] = SMTP_HOST, port: int = SMTP_PORT,
+                 security: str = SMTP_SECURITY, user: Optional[str] = SMTP_USER,
+                 password: Optional[str] = SMTP_PASS, timeout: float = SMTP_TIMEOUT,
+                 idle_timeout: float = SMTP_IDLE_TIMEOUT):
+        self.host, self.port, self.security = host, port, security
+        self.user, self.password = user, password
+        self.timeout, self.idle_timeout = timeout, idle_timeout
+        self._smtp = None
+        self._last_used = 0.0
+        self.connects = 0
+
+    def _connect(self):
+        if self.security == "ssl":
+            smtp = smtplib.SMTP_SSL(self.host, self.port, timeout=self.timeout)
+        else:
+            smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+            if self.security == "starttls":
+                smtp.starttls()
+        if self.user:
+            smtp.login(self.user, self.password)
+        self.connects += 1
+        return smtp
+
+    def _alive(self) -> bool:
+        if time.monotonic() - self._last_used < self.idle_timeout:
+            return True
+        try:
+            return self._smtp.noop()[0] == 250
+        except smtplib.SMTPException:
+            return False
+        except OSError:
+            return False
+
+    def send(self, msg: MIMEText) -> None:
+        if self._smtp is not None and not self._alive():
+            self.close()
+        for attempt in (1, 2):
+            if self._smtp is None:
+                self._smtp = self._connect()
+            try:
+                self._smtp.send_message(msg)
+                self._last_used = time.monotonic()
+                return
+            except smtplib.SMTPServerDisconnected:
+                # serwer zamknął stare połączenie – jedno ponowne połączenie
+                self.close()
+                if attempt == 2:
+                    raise
+
+    def close_if_idle(self) -> None:
+        if self._smtp is not None and time.monotonic() - self._last_used >= self.idle_timeout:
+            self.close()
+
+    def close(self) -> None:
+        smtp, self._smtp = self._smtp, None
+        if smtp is not None:
+            try:
+                smtp.quit()
+            except (smtplib.SMTPException, OSError):
+                smtp.close()
+
+
+class OutboxSender(LeasedQueueWorker):
+    """Wysyła wiadomości z email_outbox partiami, z ponowieniami."""
+
+    error_message = "Błąd nadawcy outbox e-maili"
+    poll_interval = EMAIL_OUTBOX_POLL_INTERVAL
+
+    def __init__(self, session_factory=SessionLocal, connection: Optional[SMTPConnection] = None,
+                 batch_size: int = EMAIL_BATCH_SIZE, max_attempts: int = EMAIL_MAX_ATTEMPTS,
+                 retry_base: float = EMAIL_RETRY_BASE, retry_max: float = EMAIL_RETRY_MAX,
+                 lease: float = EMAIL_LEASE_SECONDS):
+        super().__init__(session_factory, batch_size, max_attempts, retry_base, retry_max, lease)
+        self.connection = connection or SMTPConnection()
+
+    def _claim(self, db: Session, now: datetime.datetime) -> list[EmailOutbox]:
+        due = (EmailOutbox.status == "pending") & (EmailOutbox.next_attempt_at <= now)
+        ids = db.scalars(
+            select(EmailOutbox.id).where(due).order_by(EmailOutbox.id).limit(self.batch_size)
+        ).all()
+        return self._lease(db, EmailOutbox, ids, due, now)
+
+    def process_batch(self) -> int:
+        """Jedna partia: rezerwacja, wysyłka, jeden commit wyników. Zwraca liczbę pobranych."""
+        with self.session_factory() as db:
+            now = datetime.datetime.utcnow()
+            batch = self._claim(db, now)
+            for item in batch:
+                try:
+                    self.connection.send(build_message(item.to_address, item.subject, item.body))
+                except (smtplib.SMTPException, OSError) as exc:
+                    if self._retry_or_fail(item, f"{type(exc).__name__}: {exc}", now):
+                        logger.error("E-mail %s do %s nie został wysłany: %s",
+                                     item.id, item.to_address, item.last_error)
+                else:
+                    item.status = "sent"
+                    item.attempts += 1
+                    item.sent_at = datetime.datetime.utcnow()
+                    item.locked_by = None
+                if item.status != "pending":
+                    item.body = REDACTED_BODY
+            if batch:
+                db.commit()
+            return len(batch)
+
+    def after_drain(self) -> None:
+        self.connection.close_if_idle()
+
+    def close(self) -> None:
+        # wywoływane dopiero po zakończeniu bieżącej partii (LeasedQueueWorker.run)
+        self.connection.close()
+
 
 class EmailService:
+    @staticmethod
+    def queue(db: Session, to_address: str, subject: str, body: str) -> EmailOutbox:
+        """Dodaje wiadomość do outbox; zapisze ją commit wywołującego."""
+        item = EmailOutbox(to_address=to_address, subject=subject, body=body,
+                           status="pending", attempts=0, next_attempt_at=datetime.datetime.utcnow())
+        db.add(item)
+        return item
+
+    @staticmethod
+    def queue_temporary_password(db: Session, to_address: str, raw_password: str) -> EmailOutbox:
+        return EmailService.queue(db, to_address, TEMPORARY_PASSWORD_SUBJECT,
+                                  _temporary_password_body(raw_password))
+
     @staticmethod
     def send_temporary_password(to_address: str, raw_password: str):
-        msg = MIMEText(f"Twoje tymczasowe hasło:\n\n{raw_password}")
-        msg["Subject"] = "VetClinic – dane dostępu"
-        msg["From"]    = SMTP_FROM
-        msg["To"]      = to_address
-
-        # Debug: wypisz co próbujesz połączyć
-        print(f"[DEBUG SMTP] host={SMTP_HOST!r} port={SMTP_PORT!r}")
-
-        with smtplib.SMTP_SSL(SMTP_HOST, SMTP_PORT) as smtp:
-            smtp.set_debuglevel(1)    # w konsoli zobaczysz SMTP dialog
-            smtp.login(SMTP_USER, SMTP_PASS)
-            smtp.send_message(msg)
+        """Wysyłka natychmiastowa (z pominięciem outbox), np. ze skryptów."""
+        msg = build_message(to_address, TEMPORARY_PASSWORD_SUBJECT, _temporary_password_body(raw_password))
+        connection = SMTPConnection()
+        try:
+            connection.send(msg)
+        finally:
+            connection.close()
+
+
+if __name__ == "__main__":
+    # Samodzielny nadawca, np. gdy konta zakłada tylko GUI (bez procesu API)
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(OutboxSender().run())
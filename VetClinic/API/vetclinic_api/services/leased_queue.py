@@ -0,0 +1,123 @@
+"""
+Wspólna pętla workerów kolejek w bazie (email_outbox, anchor_queue, anchor_batch).
+
+Wiersz kolejki ma kolumny status ("pending" / końcowy), attempts,
+next_attempt_at, locked_by i last_error. LeasedQueueWorker zapewnia:
+- rezerwację (dzierżawę) wierszy na `lease` sekund – kilka procesów nie
+  weźmie tego samego wiersza, a po awarii dzierżawa wygasa i wiersz przejmie
+  inny worker,
+- ponowienia z opóźnieniem retry_base * 2^(próba-1) (do retry_max); po
+  max_attempts próbach wiersz dostaje status "failed",
+- drain(): kolejne partie, dopóki są pełne,
+- run(): pętlę w tle (lifespan API albo osobny proces); anulowanie czeka na
+  bieżącą partię, bo wątku z drain nie da się przerwać.
+Podklasy implementują process_batch().
+"""
+
+import asyncio
+import datetime
+import logging
+import uuid
+from typing import Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+
+class LeasedQueueWorker:
+    """Baza workerów kolejek: dzierżawa partii, ponowienia, drain i run."""
+
+    # komunikat logowany przy błędzie przebiegu w run()
+    error_message = "Błąd workera kolejki"
+    # domyślny odstęp między przebiegami run() (sekundy)
+    poll_interval = 1.0
+
+    def __init__(self, session_factory, batch_size: int, max_attempts: int,
+                 retry_base: float, retry_max: float, lease: float):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self.lease = lease
+        self.worker_id = str(uuid.uuid4())
+        # ustawiane przy anulowaniu run(): drain kończy po bieżącej partii
+        self._stopping = False
+
+    def backoff(self, attempts: int) -> float:
+        return min(self.retry_max, self.retry_base * 2 ** (attempts - 1))
+
+    def _lease(self, db: Session, model, ids: list[int], due, now: datetime.datetime) -> list:
+        """Rezerwuje wiersze ids (nadal spełniające due) na self.lease sekund (commit)."""
+        if not ids:
+            return []
+        # warunek "due" powtórzony w UPDATE: inny worker mógł zarezerwować część
+        db.execute(
+            update(model)
+            .where(model.id.in_(ids), due)
+            .values(locked_by=self.worker_id,
+                    next_attempt_at=now + datetime.timedelta(seconds=self.lease))
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        return db.scalars(
+            select(model).where(model.id.in_(ids), model.locked_by == self.worker_id).order_by(model.id)
+        ).all()
+
+    def _retry_or_fail(self, item, error: str, now: datetime.datetime) -> bool:
+        """
+        Zapisuje nieudaną próbę i zwalnia dzierżawę. Zwraca True, gdy to była
+        ostatnia próba (status "failed"); inaczej wyznacza termin ponowienia.
+        """
+        item.attempts += 1
+        item.last_error = error
+        item.locked_by = None
+        if item.attempts >= self.max_attempts:
+            item.status = "failed"
+            return True
+        item.next_attempt_at = now + datetime.timedelta(seconds=self.backoff(item.attempts))
+        return False
+
+    def process_batch(self) -> int:
+        """Jedna partia; zwraca liczbę pobranych wierszy."""
+        raise NotImplementedError
+
+    def drain(self) -> int:
+        """Przetwarza partie, dopóki są wiersze do obsłużenia teraz."""
+        total = 0
+        while True:
+            n = self.process_batch()
+            total += n
+            if n < self.batch_size or self._stopping:
+                return total
+
+    def after_drain(self) -> None:
+        """Wywoływane po każdym udanym drain() w run()."""
+
+    def close(self) -> None:
+        """Zwalnia zasoby workera po zakończeniu run()."""
+
+    async def run(self, interval: Optional[float] = None) -> None:
+        """
+        Pętla workera w tle; kończy się anulowaniem zadania. Anulowanie nie
+        przerywa wątku z drain – czekamy, aż skończy bieżącą partię, i dopiero
+        wtedy wywołujemy close() (np. zamknięcie połączenia używanego w wątku).
+        """
+        interval = self.poll_interval if interval is None else interval
+        try:
+            while True:
+                batch = asyncio.ensure_future(asyncio.to_thread(self.drain))
+                try:
+                    await asyncio.shield(batch)
+                    self.after_drain()
+                except asyncio.CancelledError:
+                    self._stopping = True
+                    await asyncio.gather(batch, return_exceptions=True)
+                    raise
+                except Exception:
+                    logger.exception(self.error_message)
+                await asyncio.sleep(interval)
+        finally:
+            self.close()
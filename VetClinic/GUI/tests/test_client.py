@@ -11,9 +11,8 @@ def app():
 
 @patch("vetclinic_gui.windows.Client.dashboard.AnimalService")
 @patch("vetclinic_gui.windows.Client.dashboard.AppointmentService")
-@patch("vetclinic_gui.windows.Client.dashboard.MedicalRecordService")
 @patch("vetclinic_gui.windows.Client.dashboard.BlockchainService")
-def test_dashboard_load_and_switch_animal(mock_blockchain, mock_med, mock_appt, mock_animal, app):
+def test_dashboard_load_and_switch_animal(mock_blockchain, mock_appt, mock_animal, app):
     from vetclinic_gui.windows.Client.dashboard import DashboardWindow
 
     # Przygotuj dane mockowane
@@ -34,6 +33,7 @@ def test_dashboard_load_and_switch_animal(mock_blockchain, mock_med, mock_appt,
             self.notes = notes
             self.priority = priority
             self.doctor = doctor
+            self.medical_records = [MagicMock(description="Opis testowy")]
 
     class DummyDoctor:
         def __init__(self):
@@ -46,8 +46,7 @@ def test_dashboard_load_and_switch_animal(mock_blockchain, mock_med, mock_appt,
         DummyAppt(10, 1, now, "Kontrola", "Brak", "Wysoki", DummyDoctor()),
         DummyAppt(11, 1, now, "Szczepienie", "Notatka", "Niski", DummyDoctor()),
     ]
-    mock_appt.list_by_owner.return_value = appts
-    mock_med.list_by_appointment.return_value = [MagicMock(description="Opis testowy")]
+    mock_appt.list.return_value = appts
 
     # Mock blockchain
     mock_blockchain.return_value.get_medical_history.return_value = [
@@ -59,6 +58,9 @@ def test_dashboard_load_and_switch_animal(mock_blockchain, mock_med, mock_appt,
     assert dashboard.med_table.rowCount() == 2
     assert dashboard.med_table.item(0, 0).text() == "Opis testowy"
     assert dashboard.med_table.item(1, 0).text() == "Opis testowy"
+    mock_appt.list.assert_called_with(
+        owner_id=1, animal_id=1, include=("doctor", "medical_records")
+    )
 
     # Test zmiany zwierzaka
     dashboard.combo_animal.setCurrentIndex(1)
@@ -66,13 +68,11 @@ def test_dashboard_load_and_switch_animal(mock_blockchain, mock_med, mock_appt,
 
 @patch("vetclinic_gui.windows.Client.dashboard.AnimalService")
 @patch("vetclinic_gui.windows.Client.dashboard.AppointmentService")
-@patch("vetclinic_gui.windows.Client.dashboard.MedicalRecordService")
 @patch("vetclinic_gui.windows.Client.dashboard.BlockchainService")
-def test_dashboard_empty_and_blockchain_error(mock_blockchain, mock_med, mock_appt, mock_animal, app):
+def test_dashboard_empty_and_blockchain_error(mock_blockchain, mock_appt, mock_animal, app):
     from vetclinic_gui.windows.Client.dashboard import DashboardWindow
     mock_animal.list_by_owner.return_value = []
-    mock_appt.list_by_owner.return_value = []
-    mock_med.list_by_appointment.return_value = []
+    mock_appt.list.return_value = []
     mock_blockchain.return_value.get_medical_history.side_effect = ConnectionError("no chain")
     dashboard = DashboardWindow(client_id=1)
     # Tabela nie powinna mieć wierszy
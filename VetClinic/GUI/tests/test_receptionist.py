@@ -170,11 +170,7 @@ def test_appointment_booking_missing_fields(mock_client, mock_animal, mock_fac,
 # ===================== DASHBOARD =====================
 
 @patch("vetclinic_gui.windows.Receptionist.dashboard.AppointmentService")
-@patch("vetclinic_gui.windows.Receptionist.dashboard.DoctorService")
-@patch("vetclinic_gui.windows.Receptionist.dashboard.ClientService")
-@patch("vetclinic_gui.windows.Receptionist.dashboard.AnimalService")
-@patch("vetclinic_gui.windows.Receptionist.dashboard.FacilityService")
-def test_receptionist_dashboard_load(mock_fac, mock_animal, mock_client, mock_doc, mock_appt, app):
+def test_receptionist_dashboard_load(mock_appt, app):
     from vetclinic_gui.windows.Receptionist.dashboard import ReceptionistDashboardPage
     import datetime
 
@@ -191,6 +187,10 @@ def test_receptionist_dashboard_load(mock_fac, mock_animal, mock_client, mock_do
             self.owner_id = 10
             self.animal_id = 15
             self.facility_id = 7
+            self.doctor = DummyDoctor()
+            self.owner = DummyClient()
+            self.animal = DummyAnimal()
+            self.facility = DummyFacility()
             self.notes = "Info"
 
     visits = [
@@ -200,15 +200,15 @@ def test_receptionist_dashboard_load(mock_fac, mock_animal, mock_client, mock_do
         DummyVisit(now.replace(day=now.day+1, hour=8, minute=30)),
     ]
     mock_appt.list.return_value = visits
-    mock_doc.list.return_value = [DummyDoctor()]
-    mock_client.list.return_value = [DummyClient()]
-    mock_animal.list.return_value = [DummyAnimal()]
-    mock_fac.list.return_value = [DummyFacility()]
     page = ReceptionistDashboardPage()
+    # Relacje ładowane razem z wizytami, bez osobnych list słownikowych
+    mock_appt.list.assert_called_once_with(include=("doctor", "owner", "animal", "facility"))
     # Sprawdź tabele
     assert page.past_table.rowCount() > 0
     assert page.today_table.rowCount() > 0
     assert page.upcoming_table.rowCount() > 0
+    assert page.today_table.item(0, 2).text() == "Jan Lek"
+    assert page.today_table.item(0, 4).text() == "Azor"
 
 @patch("vetclinic_gui.windows.Receptionist.dashboard.AppointmentService")
 def test_receptionist_dashboard_error(mock_appt, app):
@@ -130,12 +130,14 @@ def test_facility_delete(mock_del):
 def test_invoice_list_by_client(mock_list_invoices, mock_Session):
     class DummyInv:
         def __init__(self, id, client_id): self.id = id; self.client_id = client_id
-    mock_list_invoices.return_value = [DummyInv(1, 4), DummyInv(2, 9)]
+    mock_list_invoices.return_value = [DummyInv(2, 9)]
     db = MagicMock()
     mock_Session.return_value = db
     from vetclinic_gui.services.invoice_service import InvoiceService
     out = InvoiceService.list_by_client(9)
     assert out and out[0].client_id == 9
+    # filtr wykonuje SQL, a nie Python
+    mock_list_invoices.assert_called_once_with(db, limit=None, client_id=9)
 
 # ===================== medical_records_service.py =====================
 @patch("vetclinic_gui.services.medical_records_service.SessionLocal")
@@ -185,6 +187,7 @@ def test_weight_log_list_by_animal(mock_list, mock_Session):
     from vetclinic_gui.services.weight_logs_service import WeightLogService
     out = WeightLogService.list_by_animal(2)
     assert out and out[0].animal_id == 2
+    mock_list.assert_called_once_with(db, skip=0, limit=100, animal_id=2)
 
 
 import pytest
@@ -329,14 +332,18 @@ def test_animalservice_list(mock_list, mock_session):
     out = AnimalService.list()
     assert out
 
-def test_animalservice_list_by_owner():
+@patch("vetclinic_gui.services.animals_service.SessionLocal")
+@patch("vetclinic_gui.services.animals_service.get_animals")
+def test_animalservice_list_by_owner(mock_list, mock_session):
     from vetclinic_gui.services.animals_service import AnimalService
     class Dummy:
         def __init__(self, owner_id): self.owner_id = owner_id
-    # patchuje .list
-    AnimalService.list = staticmethod(lambda: [Dummy(5), Dummy(7), Dummy(5)])
+    db = MagicMock()
+    mock_session.return_value = db
+    mock_list.return_value = [Dummy(5), Dummy(5)]
     out = AnimalService.list_by_owner(5)
     assert all([x.owner_id == 5 for x in out])
+    mock_list.assert_called_once_with(db, limit=None, owner_id=5)
 
 @patch("vetclinic_gui.services.animals_service.SessionLocal")
 @patch("vetclinic_gui.services.animals_service.get_animal")
@@ -404,11 +411,13 @@ def test_appointments_get(mock_session):
 @patch("vetclinic_gui.services.appointments_service.SessionLocal")
 def test_appointments_list_by_owner(mock_session):
     db = MagicMock()
-    db.query().options().filter().all.return_value = [{"id": 5, "owner_id": 1}]
+    db.scalars.return_value.all.return_value = [{"id": 5, "owner_id": 1}]
     mock_session.return_value = db
     from vetclinic_gui.services.appointments_service import AppointmentService
     out = AppointmentService.list_by_owner(1)
     assert out[0]["owner_id"] == 1
+    # jedno zapytanie z warunkiem owner_id po stronie SQL
+    assert "appointments.owner_id = " in str(db.scalars.call_args[0][0])
 
 @patch("vetclinic_gui.services.appointments_service.SessionLocal")
 def test_appointments_get_free_slots(mock_session):
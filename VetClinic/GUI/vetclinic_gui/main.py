@@ -2,10 +2,18 @@ import sys
 from PyQt5.QtWidgets import QApplication, QInputDialog, QMessageBox
 from vetclinic_gui.windows.main_window import MainWindow
 from vetclinic_gui.services.clients_service import ClientService
+from vetclinic_gui.services.db import verify_database
 
 def main():
     app = QApplication(sys.argv)
 
+    # 0) Schemat bazy musi być aktualny (jedno zapytanie, bez DDL)
+    try:
+        verify_database()
+    except Exception as e:
+        QMessageBox.critical(None, "Błąd bazy danych", str(e))
+        sys.exit(1)
+
     # 1) Wybór roli
     roles = ["Administrator", "Recepcjonista", "Lekarz", "Klient"]
     role_name, ok = QInputDialog.getItem(
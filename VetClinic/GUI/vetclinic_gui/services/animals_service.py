@@ -14,11 +14,14 @@ class AnimalService:
     @staticmethod
     def list_by_owner(owner_id: int):
         """
-        Zwraca tylko te zwierzęta, których owner_id == podane owner_id.
+        Zwraca tylko te zwierzęta, których owner_id == podane owner_id
+        (filtr w SQL, bez limitu strony).
         """
-        # pobierz wszystkie i przepuść przez filtr
-        all_animals = AnimalService.list() or []
-        return [a for a in all_animals if getattr(a, "owner_id", None) == owner_id]
+        db = SessionLocal()
+        try:
+            return get_animals(db, limit=None, owner_id=owner_id)
+        finally:
+            db.close()
 
     @staticmethod
     def get(aid: int):
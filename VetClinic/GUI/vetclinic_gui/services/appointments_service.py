@@ -7,24 +7,22 @@ from sqlalchemy.orm import Session, selectinload
 
 from vetclinic_gui.services.db import SessionLocal
 from vetclinic_api.models.appointments import Appointment as AppointmentModel
+from vetclinic_api.crud.appointments_crud import appointments_stmt, get_doctor_visit_times
 
 
 class AppointmentService:
     @staticmethod
-    def list() -> List[AppointmentModel]:
+    def list(include=("doctor", "owner"), **filters) -> List[AppointmentModel]:
         """
-        Zwraca wszystkie wizyty wraz z załadowanym doktorem i właścicielem.
+        Zwraca wizyty (posortowane po dacie) wraz z relacjami z include
+        (domyślnie doktor i właściciel), ładowanymi jednym zapytaniem na relację.
+        Opcjonalne filtry jak w appointments_stmt: doctor_id, facility_id, owner_id,
+        animal_id, date_from, date_to, priority – wykonywane w jednym zapytaniu SQL.
         """
         db: Session = SessionLocal()
         try:
-            return (
-                db.query(AppointmentModel)
-                  .options(
-                      selectinload(AppointmentModel.doctor),
-                      selectinload(AppointmentModel.owner),
-                  )
-                  .all()
-            )
+            stmt = appointments_stmt(limit=None, include=include, **filters)
+            return db.scalars(stmt).all()
         finally:
             db.close()
 
@@ -95,19 +93,7 @@ class AppointmentService:
         """
         Zwraca wszystkie wizyty klienta wraz z obiektami doctor i owner.
         """
-        db: Session = SessionLocal()
-        try:
-            return (
-                db.query(AppointmentModel)
-                  .options(
-                      selectinload(AppointmentModel.doctor),
-                      selectinload(AppointmentModel.owner),
-                  )
-                  .filter(AppointmentModel.owner_id == owner_id)
-                  .all()
-            )
-        finally:
-            db.close()
+        return AppointmentService.list(owner_id=owner_id)
 
     @staticmethod
     def get_free_slots(doctor_id: int, date_str: str) -> List[str]:
@@ -126,20 +112,8 @@ class AppointmentService:
 
         db: Session = SessionLocal()
         try:
-            start_of_day = datetime.combine(target_date, time(0, 0))
-            end_of_day   = datetime.combine(target_date, time(23, 59, 59))
-
-            apps = (
-                db.query(AppointmentModel)
-                  .filter(
-                      AppointmentModel.doctor_id == doctor_id,
-                      AppointmentModel.visit_datetime >= start_of_day,
-                      AppointmentModel.visit_datetime <= end_of_day,
-                  )
-                  .all()
-            )
-
-            busy_slots = {app.visit_datetime.strftime("%H:%M") for app in apps}
+            visit_times = get_doctor_visit_times(db, doctor_id, target_date)
+            busy_slots = {visit.strftime("%H:%M") for visit in visit_times}
 
             free_slots: List[str] = []
             current_dt = datetime.combine(target_date, time(8, 0))
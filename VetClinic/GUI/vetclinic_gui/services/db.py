@@ -1 +1,12 @@
 from vetclinic_api.core.database import engine, SessionLocal, Base
+from vetclinic_api.core.config import SCHEMA_CHECK
+
+
+def verify_database() -> None:
+    """
+    Jednorazowe sprawdzenie rewizji schematu przy starcie GUI (bez DDL).
+    Rzuca SchemaMismatchError, jeśli baza wymaga bootstrapu/migracji.
+    """
+    if SCHEMA_CHECK == "verify":
+        from vetclinic_api.core.schema import verify_schema
+        verify_schema(engine)
@@ -6,8 +6,8 @@ class InvoiceService:
     def list_by_client(client_id: int):
         db = SessionLocal()
         try:
-            # pobieramy wszystkie faktury i filtrujemy po client_id
-            return [inv for inv in list_invoices(db) if inv.client_id == client_id]
+            # filtr po client_id w SQL (indeks client_id, status), bez limitu strony
+            return list_invoices(db, limit=None, client_id=client_id)
         finally:
             db.close()
             
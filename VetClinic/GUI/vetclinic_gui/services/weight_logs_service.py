@@ -9,9 +9,8 @@ class WeightLogService:
     def list_by_animal(animal_id: int, skip: int = 0, limit: int = 100) -> List:
         db = SessionLocal()
         try:
-            # pobieramy wszystkie logi, a następnie filtrujemy po animal_id
-            logs = list_weight_logs(db, skip=skip, limit=limit)
-            return [wl for wl in logs if getattr(wl, "animal_id", None) == animal_id]
+            # filtr po animal_id w SQL – limit dotyczy już tylko logów tego zwierzęcia
+            return list_weight_logs(db, skip=skip, limit=limit, animal_id=animal_id)
         finally:
             db.close()
 
@@ -19,7 +19,6 @@ from PyQt5.QtChart import (
     QDateTimeAxis, QValueAxis
 )
 
-from vetclinic_gui.services.medical_records_service import MedicalRecordService
 from vetclinic_gui.services.appointments_service    import AppointmentService
 from vetclinic_gui.services.animals_service         import AnimalService
 from vetclinic_gui.services.blockchain_service import BlockchainService
@@ -188,15 +187,19 @@ class DashboardWindow(QMainWindow):
     def refresh_data(self):
         """Pobiera i wyświetla historię wizyt + opisy medyczne dla self.animal_id."""
 
-        # 1) Pobierz wszystkie wizyty tego klienta
+        # 1) Pobierz wizyty klienta dla wybranego zwierzaka razem z rekordami medycznymi
         try:
-            all_appts = AppointmentService.list_by_owner(self.client_id) or []
+            appts = AppointmentService.list(
+                owner_id=self.client_id,
+                animal_id=self.animal_id,
+                include=("doctor", "medical_records"),
+            ) or []
         except Exception as e:
             QToolTip.showText(QCursor.pos(), f"Błąd pobierania wizyt: {e}")
-            all_appts = []
+            appts = []
 
-        # 2) Filtrujemy tylko wizyty dla wybranego zwierzaka
-        appts = [a for a in all_appts if a.animal_id == self.animal_id]
+        # 2) Najnowsze wizyty na górze
+        appts = list(appts)
         appts.sort(key=lambda a: a.visit_datetime, reverse=True)
         self.current_appointments = appts
 
@@ -205,8 +208,8 @@ class DashboardWindow(QMainWindow):
 
         # 4) Wypełnij każdy wiersz
         for row, appt in enumerate(appts):
-            # pobierz rekordy medyczne dla tej wizyty
-            recs = MedicalRecordService.list_by_appointment(appt.id) or []
+            # rekordy medyczne wizyty są już załadowane (include)
+            recs = appt.medical_records or []
 
             # wybierz opis: najpierw z medical_records, w przeciwnym razie z appointment.reason
             if recs:
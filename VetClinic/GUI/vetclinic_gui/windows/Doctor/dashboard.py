@@ -1,4 +1,5 @@
 import sys
+from datetime import datetime, time, timedelta
 
 from PyQt5.QtWidgets import (
     QWidget, QHBoxLayout, QVBoxLayout, 
@@ -24,10 +25,18 @@ from vetclinic_gui.services.appointments_service import AppointmentService
 
 
 class DashboardPage(QWidget):
-    def __init__(self):
+    def __init__(self, doctor_id: int = None):
         super().__init__()
+        # None = wizyty wszystkich lekarzy
+        self.doctor_id = doctor_id
         self._setup_ui()
 
+    @staticmethod
+    def _day_start(days: int = 0) -> datetime:
+        """Północ dnia dzisiaj + days (granica filtrów from/to)."""
+        today = QDate.currentDate().toPyDate()
+        return datetime.combine(today + timedelta(days=days), time.min)
+
     def _setup_ui(self):
         # główny layout strony (tylko content, bez sidebaru)
         layout = QVBoxLayout(self)
@@ -136,9 +145,11 @@ class DashboardPage(QWidget):
             }
         """)
 
-        # 1) Pobranie wizyt z API
+        # 1) Pobranie wizyt lekarza od dzisiaj (filtr i sortowanie rosnące w SQL)
         try:
-            all_visits = AppointmentService.list()
+            upcoming_visits = AppointmentService.list(
+                doctor_id=self.doctor_id, date_from=self._day_start()
+            )
         except Exception as e:
             QToolTip.showText(QCursor.pos(), f"Błąd pobierania wizyt: {e}")
             layout.addWidget(table)
@@ -146,15 +157,6 @@ class DashboardPage(QWidget):
 
         # 2) Przygotuj słownik id_zwierzaka -> nazwa
         animals = {a.id: a.name for a in AnimalService.list() or []}
-        today_date = QDate.currentDate().toPyDate()
-
-        # 3) Filtrowanie: tylko wizyty, których data >= dzisiaj
-        upcoming_visits = [
-            v for v in all_visits
-            if hasattr(v, "visit_datetime") and v.visit_datetime.date() >= today_date
-        ]
-        # 4) Sortowanie rosnąco po dacie/godzinie
-        upcoming_visits.sort(key=lambda v: v.visit_datetime)
 
         # 5) Wypełnianie tabeli
         for visit in upcoming_visits:
@@ -252,9 +254,11 @@ class DashboardPage(QWidget):
             }
         """)
 
-        # 1) Pobranie wizyt z API
+        # 1) Pobranie wizyt lekarza sprzed dzisiaj (filtr w SQL)
         try:
-            all_visits = AppointmentService.list()
+            visits = AppointmentService.list(
+                doctor_id=self.doctor_id, date_to=self._day_start()
+            )
         except Exception as e:
             QToolTip.showText(QCursor.pos(), f"Błąd pobierania wizyt: {e}")
             layout.addWidget(table)
@@ -262,15 +266,9 @@ class DashboardPage(QWidget):
 
         # 2) Przygotuj słownik id_zwierzaka -> nazwa
         animals = {a.id: a.name for a in AnimalService.list() or []}
-        today_date = QDate.currentDate().toPyDate()
 
-        # 3) Filtrowanie: tylko wizyty sprzed dzisiaj
-        previous_visits = [
-            v for v in all_visits
-            if hasattr(v, "visit_datetime") and v.visit_datetime.date() < today_date
-        ]
-        # 4) Sortowanie malejąco (najpierw najnowsze)
-        previous_visits.sort(key=lambda v: v.visit_datetime, reverse=True)
+        # 3) Najpierw najnowsze (SQL zwraca rosnąco)
+        previous_visits = list(reversed(visits))
 
         # 5) Wypełnianie tabeli
         for visit in previous_visits:
@@ -352,9 +350,13 @@ class DashboardPage(QWidget):
         header.addWidget(menu_btn)
         layout.addLayout(header)
 
-        # 1) Pobierz wszystkie wizyty z API
+        # 1) Pobierz wizyty lekarza tylko z ostatnich 10 dni (filtr w SQL)
         try:
-            all_visits = AppointmentService.list()
+            all_visits = AppointmentService.list(
+                doctor_id=self.doctor_id,
+                date_from=self._day_start(-9),
+                date_to=self._day_start(1),
+            )
         except Exception as e:
             QToolTip.showText(QCursor.pos(), f"Błąd pobierania wizyt: {e}")
             return group
@@ -441,13 +441,9 @@ class VisitsWindow(QWidget):
         self._load_previous_visits()
 
     def _load_previous_visits(self):
-        # Pobierz wszystkie wizyty z serwisu i odfiltruj po zwierzęciu i lekarzu
-        all_visits = AppointmentService.list()
+        # Wizyty wybranego zwierzęcia u tego lekarza (filtr w SQL)
         aid = self.animal_cb.currentData()
-        visits = [
-            v for v in all_visits
-            if v.animal_id == aid and v.doctor_id == self.doctor_id
-        ]
+        visits = AppointmentService.list(animal_id=aid, doctor_id=self.doctor_id) if aid is not None else []
 
         self.prev_table.setRowCount(0)
 
@@ -5,10 +5,6 @@ from PyQt5.QtWidgets import (
 from PyQt5.QtCore import Qt
 from datetime import date
 
-from vetclinic_gui.services.clients_service    import ClientService
-from vetclinic_gui.services.animals_service    import AnimalService
-from vetclinic_gui.services.facility_service   import FacilityService
-from vetclinic_gui.services.doctors_service    import DoctorService
 from vetclinic_gui.services.appointments_service import AppointmentService
 
 
@@ -82,18 +78,15 @@ class ReceptionistDashboardPage(QWidget):
 
     def _load_visits(self):
         try:
-            all_visits = AppointmentService.list()
+            all_visits = AppointmentService.list(
+                include=("doctor", "owner", "animal", "facility")
+            )
         except Exception as e:
             QMessageBox.critical(self, "Błąd", f"Nie można pobrać wizyt: {e}")
             return
 
         today_date = date.today()
 
-        doctors     = {d.id: f"{d.first_name} {d.last_name}" for d in DoctorService.list() or []}
-        clients     = {c.id: f"{c.first_name} {c.last_name}" for c in ClientService.list() or []}
-        animals     = {a.id: a.name                              for a in AnimalService.list() or []}
-        facilities  = {f.id: f.name                              for f in FacilityService.list() or []}
-
         for tbl in (self.past_table, self.today_table, self.upcoming_table):
             tbl.setRowCount(0)
 
@@ -116,10 +109,10 @@ class ReceptionistDashboardPage(QWidget):
             # Przygotuj wartości:
             date_str     = dt.date().isoformat()       # np. "2025-06-10"
             time_str     = dt.strftime("%H:%M")        # np. "09:15"
-            doctor_name  = doctors.get(v.doctor_id, "")
-            owner_name   = clients.get(v.owner_id, "")
-            animal_name  = animals.get(v.animal_id, "")
-            facility_name= facilities.get(v.facility_id, "")
+            doctor_name  = f"{v.doctor.first_name} {v.doctor.last_name}" if v.doctor else ""
+            owner_name   = f"{v.owner.first_name} {v.owner.last_name}" if v.owner else ""
+            animal_name  = v.animal.name if v.animal else ""
+            facility_name= v.facility.name if v.facility else ""
             notes        = v.notes or ""
 
             values = [
@@ -100,7 +100,7 @@ class MainWindow(QMainWindow):
             sidebar.layout().addWidget(btn)
 
             # instancjonowanie strony z odpowiednimi parametrami
-            if page_factory is VisitsWindow:
+            if page_factory in (VisitsWindow, DashboardPage):
                 page = page_factory(self.doctor_id)
             elif page_factory in (ReceptionistDashboardPage, RegistrationPage):
                 page = page_factory(self.receptionist_id)